@@ -20,7 +20,7 @@ Usage:
 """
 import os
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import yaml
 
 
@@ -186,6 +186,14 @@ class Config:
             return int(env_val)
         return self._get_yaml_value('app', 'port', default=5000)
 
+    @property
+    def WORKER_PROCESSES(self) -> int:
+        """Worker processes serving the app (WEB_CONCURRENCY, as set for gunicorn)."""
+        env_val = os.getenv('WEB_CONCURRENCY')
+        if env_val:
+            return max(1, int(env_val))
+        return max(1, int(self._get_yaml_value('app', 'workers', default=1)))
+
     @property
     def APP_NAME(self) -> str:
         """Application name."""
@@ -196,6 +204,14 @@ class Config:
         """Application version."""
         return self._get_yaml_value('app', 'version', default='1.0.0')
 
+    @property
+    def STARTUP_BUDGET_SECONDS(self) -> float:
+        """Boot time above which a warning with the per-phase breakdown is logged."""
+        env_val = os.getenv('STARTUP_BUDGET_SECONDS')
+        if env_val:
+            return float(env_val)
+        return self._get_yaml_value('app', 'startup_budget_seconds', default=5)
+
     # ==========================================================================
     # Security Settings
     # ==========================================================================
@@ -224,6 +240,45 @@ class Config:
         """JWT algorithm (default: HS256)."""
         return os.getenv('JWT_ALGORITHM') or self._get_yaml_value('security', 'jwt', 'algorithm', default='HS256')
 
+    @property
+    def JWT_KEYS_DIR(self) -> Optional[str]:
+        """Directory of PEM keys (<kid>.pem / <kid>.pub.pem) for RS*/ES* algorithms (see security.signing_keys)."""
+        return os.getenv('JWT_KEYS_DIR') or self._get_yaml_value('security', 'jwt', 'keys_dir')
+
+    @property
+    def JWT_ACTIVE_KID(self) -> Optional[str]:
+        """Key id that signs new tokens (default: the greatest kid with a private key)."""
+        return os.getenv('JWT_ACTIVE_KID') or self._get_yaml_value('security', 'jwt', 'active_kid')
+
+    @property
+    def JWT_JWKS_URL(self) -> Optional[str]:
+        """JWKS document with the verification keys, for processes that only verify tokens."""
+        return os.getenv('JWT_JWKS_URL') or self._get_yaml_value('security', 'jwt', 'jwks_url')
+
+    @property
+    def JWT_KEYS_RELOAD_SECONDS(self) -> int:
+        """How often JWT_KEYS_DIR is re-read for rotated keys."""
+        env_val = os.getenv('JWT_KEYS_RELOAD_SECONDS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('security', 'jwt', 'keys_reload_seconds', default=60)
+
+    @property
+    def JWT_JWKS_CACHE_SECONDS(self) -> int:
+        """How long keys fetched from JWT_JWKS_URL are used before refetching."""
+        env_val = os.getenv('JWT_JWKS_CACHE_SECONDS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('security', 'jwt', 'jwks_cache_seconds', default=300)
+
+    @property
+    def JWT_ACCEPT_HS256(self) -> bool:
+        """With an RS*/ES* algorithm, still accept HS256 tokens signed with JWT_SECRET (migration)."""
+        env_val = os.getenv('JWT_ACCEPT_HS256', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('security', 'jwt', 'accept_hs256', default=False)
+
     @property
     def ACCESS_TOKEN_EXPIRE_MINUTES(self) -> int:
         """Access token expiry in minutes."""
@@ -248,6 +303,30 @@ class Config:
             return int(env_val)
         return self._get_yaml_value('security', 'bcrypt_rounds', default=12)
 
+    @property
+    def TOKEN_CACHE_ENABLED(self) -> bool:
+        """Whether verified access tokens are cached per process (see security.token_cache)."""
+        env_val = os.getenv('TOKEN_CACHE_ENABLED', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('security', 'token_cache', 'enabled', default=True)
+
+    @property
+    def TOKEN_CACHE_MAX_ENTRIES(self) -> int:
+        """Maximum number of verified tokens cached per process."""
+        env_val = os.getenv('TOKEN_CACHE_MAX_ENTRIES')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('security', 'token_cache', 'max_entries', default=10000)
+
+    @property
+    def REFRESH_TOKEN_MAX_SESSIONS(self) -> int:
+        """Live refresh tokens (devices) kept per user; the oldest is revoked beyond this."""
+        env_val = os.getenv('REFRESH_TOKEN_MAX_SESSIONS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('security', 'refresh_tokens', 'max_sessions', default=5)
+
     # ==========================================================================
     # Database Settings
     # ==========================================================================
@@ -282,6 +361,122 @@ class Config:
         """Analytics database name."""
         return os.getenv('ANALYTICS_DB_NAME') or self._get_yaml_value('database', 'databases', 'analytics', default='analytics_db')
 
+    @property
+    def MONGO_SERVER_SELECTION_TIMEOUT_MS(self) -> int:
+        """How long to wait for a suitable server before failing an operation."""
+        env_val = os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'timeouts', 'server_selection_ms', default=10000)
+
+    @property
+    def MONGO_CONNECT_TIMEOUT_MS(self) -> int:
+        """Socket connect timeout for new pool connections."""
+        env_val = os.getenv('MONGO_CONNECT_TIMEOUT_MS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'timeouts', 'connect_ms', default=10000)
+
+    @property
+    def MONGO_SOCKET_TIMEOUT_MS(self) -> int:
+        """Socket read/write timeout for a single operation."""
+        env_val = os.getenv('MONGO_SOCKET_TIMEOUT_MS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'timeouts', 'socket_ms', default=30000)
+
+    @property
+    def MONGO_MAX_POOL_SIZE(self) -> int:
+        """Maximum connections per server in the client pool."""
+        env_val = os.getenv('MONGO_MAX_POOL_SIZE')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'pool', 'max_size', default=100)
+
+    @property
+    def MONGO_MIN_POOL_SIZE(self) -> int:
+        """Connections per server kept open even when idle."""
+        env_val = os.getenv('MONGO_MIN_POOL_SIZE')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'pool', 'min_size', default=0)
+
+    @property
+    def MONGO_MAX_IDLE_TIME_MS(self) -> Optional[int]:
+        """Close pool connections idle for longer than this (None = never)."""
+        env_val = os.getenv('MONGO_MAX_IDLE_TIME_MS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'pool', 'max_idle_time_ms', default=None)
+
+    @property
+    def MONGO_WAIT_QUEUE_TIMEOUT_MS(self) -> Optional[int]:
+        """Fail an operation that waits longer than this for a pool connection (None = wait)."""
+        env_val = os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'pool', 'wait_queue_timeout_ms', default=None)
+
+    @property
+    def MONGO_POOL_BUDGET(self) -> Optional[int]:
+        """Connections per server across all worker processes (None = MONGO_MAX_POOL_SIZE each)."""
+        env_val = os.getenv('MONGO_POOL_BUDGET')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'pool', 'budget', default=None)
+
+    @property
+    def MONGO_WORKER_POOL_SIZE(self) -> int:
+        """maxPoolSize of each worker's client: the pool budget split across WORKER_PROCESSES."""
+        budget = self.MONGO_POOL_BUDGET
+        if budget:
+            return max(1, budget // self.WORKER_PROCESSES)
+        return self.MONGO_MAX_POOL_SIZE
+
+    @property
+    def MONGO_COMPRESSORS(self) -> List[str]:
+        """Wire compressors to offer, in preference order (zstd, snappy, zlib)."""
+        env_val = os.getenv('MONGO_COMPRESSORS')
+        if env_val is not None:
+            return [c.strip() for c in env_val.split(',') if c.strip()]
+        return self._get_yaml_value('database', 'compressors', default=[])
+
+    @property
+    def BULK_WRITE_BATCH_SIZE(self) -> int:
+        """Operations sent per bulk_write by BulkWriter."""
+        env_val = os.getenv('BULK_WRITE_BATCH_SIZE')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'bulk_write_batch_size', default=1000)
+
+    @property
+    def IDENTITY_MAP_ENABLED(self) -> bool:
+        """Whether repository find_one by key is cached per request (see repository.identity_map)."""
+        env_val = os.getenv('IDENTITY_MAP_ENABLED', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('database', 'identity_map_enabled', default=True)
+
+    @property
+    def MONGO_READ_PROFILES(self) -> Dict[str, Dict[str, Any]]:
+        """Named read profiles used by repositories (see fin_server.repository.read_profiles).
+
+        `MONGO_READ_PROFILE_<NAME>` overrides a profile's read preference.
+        """
+        profiles = {
+            'primary': {'read_preference': 'primary'},
+            'ledger': {'read_preference': 'primary'},
+            'analytics': {'read_preference': 'secondaryPreferred'},
+            'dashboard': {'read_preference': 'secondaryPreferred'},
+        }
+        for name, settings in (self._get_yaml_value('database', 'read_profiles', default={}) or {}).items():
+            profiles[name] = dict(profiles.get(name, {}), **(settings or {}))
+        for name in profiles:
+            env_val = os.getenv(f'MONGO_READ_PROFILE_{name.upper()}')
+            if env_val:
+                profiles[name] = dict(profiles[name], read_preference=env_val)
+        return profiles
+
     # ==========================================================================
     # CORS Settings
     # ==========================================================================
@@ -474,6 +669,161 @@ class Config:
         """Requests per minute limit."""
         return self._get_yaml_value('rate_limit', 'requests_per_minute', default=60)
 
+    # ==========================================================================
+    # Indexes
+    # ==========================================================================
+
+    @property
+    def INDEX_RECONCILE_ON_STARTUP(self) -> bool:
+        """Whether the migration step (collections + declared indexes) also runs in the background at boot.
+
+        Off by default: provisioning is run explicitly with scripts/migrate.py.
+        """
+        env_val = os.getenv('INDEX_RECONCILE_ON_STARTUP', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('database', 'reconcile_indexes_on_startup', default=False)
+
+    @property
+    def INDEX_EXPLAIN_CHECK(self) -> bool:
+        """Whether declared query shapes are explained at startup to flag collection scans."""
+        env_val = os.getenv('INDEX_EXPLAIN_CHECK', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('database', 'explain_query_shapes', default=self.IS_DEV)
+
+    # ==========================================================================
+    # Query Profiler
+    # ==========================================================================
+
+    @property
+    def QUERY_PROFILER_ENABLED(self) -> bool:
+        """Whether Mongo commands are profiled per query shape (exposed on /metrics)."""
+        env_val = os.getenv('QUERY_PROFILER_ENABLED', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('database', 'query_profiler', 'enabled', default=True)
+
+    @property
+    def QUERY_PROFILER_EXPLAIN(self) -> bool:
+        """Whether each new read shape is explained once to detect collection scans."""
+        env_val = os.getenv('QUERY_PROFILER_EXPLAIN', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('database', 'query_profiler', 'explain', default=True)
+
+    @property
+    def QUERY_PROFILER_EXAMINED_RATIO(self) -> float:
+        """Docs examined per doc returned at which a query shape is flagged."""
+        env_val = os.getenv('QUERY_PROFILER_EXAMINED_RATIO')
+        if env_val:
+            return float(env_val)
+        return self._get_yaml_value('database', 'query_profiler', 'examined_ratio_threshold', default=10)
+
+    @property
+    def QUERY_PROFILER_MAX_SHAPES(self) -> int:
+        """Maximum number of distinct query shapes tracked."""
+        env_val = os.getenv('QUERY_PROFILER_MAX_SHAPES')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('database', 'query_profiler', 'max_shapes', default=500)
+
+    # ==========================================================================
+    # Dashboard
+    # ==========================================================================
+
+    @property
+    def DASHBOARD_SNAPSHOT_MAX_AGE(self) -> int:
+        """Seconds before a dashboard snapshot is fully recomputed."""
+        env_val = os.getenv('DASHBOARD_SNAPSHOT_MAX_AGE')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('dashboard', 'snapshot_max_age_seconds', default=300)
+
+    @property
+    def DASHBOARD_QUERY_TIMEOUT(self) -> float:
+        """Per-card query timeout in seconds when computing the dashboard."""
+        env_val = os.getenv('DASHBOARD_QUERY_TIMEOUT')
+        if env_val:
+            return float(env_val)
+        return self._get_yaml_value('dashboard', 'query_timeout_seconds', default=5)
+
+    # ==========================================================================
+    # Reference Data Cache
+    # ==========================================================================
+
+    @property
+    def CACHE_ENABLED(self) -> bool:
+        """Whether hot reference data is read through the shared cache (see repository.cache)."""
+        env_val = os.getenv('CACHE_ENABLED', '').lower()
+        if env_val:
+            return env_val in ('1', 'true', 'yes')
+        return self._get_yaml_value('cache', 'enabled', default=False)
+
+    @property
+    def CACHE_TYPE(self) -> str:
+        """'memory' (per-process LRU) or 'redis' (LRU in front of a Redis-compatible server)."""
+        return os.getenv('CACHE_TYPE') or self._get_yaml_value('cache', 'type', default='memory')
+
+    @property
+    def CACHE_TTL_SECONDS(self) -> int:
+        """Default lifetime of a cached entry."""
+        env_val = os.getenv('CACHE_TTL_SECONDS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('cache', 'ttl_seconds', default=300)
+
+    @property
+    def CACHE_MAX_ENTRIES(self) -> int:
+        """Entries kept in the per-process LRU tier."""
+        env_val = os.getenv('CACHE_MAX_ENTRIES')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('cache', 'max_entries', default=4096)
+
+    @property
+    def CACHE_PERMISSIONS_TTL_SECONDS(self) -> int:
+        """Lifetime of cached effective permissions (see PermissionRepository.get_effective_permissions)."""
+        env_val = os.getenv('CACHE_PERMISSIONS_TTL_SECONDS')
+        if env_val:
+            return int(env_val)
+        return self._get_yaml_value('cache', 'permissions_ttl_seconds', default=60)
+
+    @property
+    def CACHE_REDIS_URL(self) -> Optional[str]:
+        """Redis-compatible server used when CACHE_TYPE is 'redis'."""
+        return os.getenv('CACHE_REDIS_URL') or self._get_yaml_value('cache', 'redis_url', default=None)
+
+    @property
+    def CACHE_INVALIDATION_POLL_SECONDS(self) -> float:
+        """How often the memory tier polls invalidations published by other workers (0 disables)."""
+        env_val = os.getenv('CACHE_INVALIDATION_POLL_SECONDS')
+        if env_val:
+            return float(env_val)
+        return self._get_yaml_value('cache', 'invalidation_poll_seconds', default=2)
+
+    # ==========================================================================
+    # Change Events
+    # ==========================================================================
+
+    @property
+    def EVENT_BUS_MODE(self) -> str:
+        """'auto' (change streams, polling on standalone servers), 'change_stream' or 'poll'."""
+        return os.getenv('EVENT_BUS_MODE') or self._get_yaml_value('events', 'mode', default='auto')
+
+    @property
+    def EVENT_BUS_POLL_SECONDS(self) -> float:
+        """Polling interval used when change streams are unavailable."""
+        env_val = os.getenv('EVENT_BUS_POLL_SECONDS')
+        if env_val:
+            return float(env_val)
+        return self._get_yaml_value('events', 'poll_seconds', default=2)
+
+    @property
+    def EVENT_BUS_CONSUMER(self) -> str:
+        """Name under which resume tokens are stored in user_db.change_stream_tokens."""
+        return os.getenv('EVENT_BUS_CONSUMER') or self._get_yaml_value('events', 'consumer', default='default')
+
     # ==========================================================================
     # Upload Settings
     # ==========================================================================
@@ -546,8 +896,10 @@ class Config:
         errors = []
 
         if self.IS_PROD:
-            if not self.JWT_SECRET:
+            if self.JWT_ALGORITHM.startswith('HS') and not self.JWT_SECRET:
                 errors.append('JWT_SECRET environment variable is required in production')
+            if not self.JWT_ALGORITHM.startswith('HS') and not (self.JWT_KEYS_DIR or self.JWT_JWKS_URL):
+                errors.append(f'JWT_KEYS_DIR or JWT_JWKS_URL is required for {self.JWT_ALGORITHM} in production')
             if not self.MASTER_ADMIN_PASSWORD:
                 errors.append('MASTER_ADMIN_PASSWORD environment variable is required in production')
             if not self.MONGO_URI or self.MONGO_URI == 'mongodb://localhost:27017':
@@ -596,6 +948,8 @@ class Config:
                 'refresh_token_expire_days': self.REFRESH_TOKEN_EXPIRE_DAYS,
                 'bcrypt_rounds': self.BCRYPT_ROUNDS,
                 'jwt_secret_set': bool(self.JWT_SECRET),
+                'jwt_keys_dir_set': bool(self.JWT_KEYS_DIR),
+                'jwt_jwks_url': self.JWT_JWKS_URL,
                 'master_password_set': bool(self.MASTER_ADMIN_PASSWORD),
             },
             'database': {
@@ -26,8 +26,8 @@ class UserDTO:
 
         # Authorities are special permissions beyond the role
         self.authorities = authorities if isinstance(authorities, list) else []
-        self._refresh_tokens = refresh_tokens or []
-        self._refresh_token_cache = set(self._refresh_tokens)
+        # Refresh tokens live in the refresh_tokens collection; a legacy
+        # `refresh_tokens` array on the document is ignored and not written back
         self.settings = settings or {}
         self.subscription = subscription or {}
         self.password = password
@@ -45,23 +45,6 @@ class UserDTO:
         # update last_activity to current epoch seconds
         self._last_activity = int(time.time())
 
-    def add_refresh_token(self, token):
-        self._refresh_tokens.append(token)
-        self._refresh_token_cache.add(token)
-        if len(self._refresh_tokens) > 5:
-            self._refresh_tokens = self._refresh_tokens[-5:]
-            self._refresh_token_cache = set(self._refresh_tokens)
-        self.touch()
-
-    def has_refresh_token(self, token):
-        self.touch()
-        return token in self._refresh_token_cache
-
-    @property
-    def refresh_tokens(self):
-        self.touch()
-        return self._refresh_tokens
-
     @property
     def last_active(self):
         return int(self._last_activity)
@@ -74,7 +57,6 @@ class UserDTO:
             'user_key': self.user_key,
             'role': self.role,
             'authorities': self.authorities,
-            'refresh_tokens': self._refresh_tokens,
             'last_update': int(self._last_activity),
             'last_active': int(self._last_activity),
             'settings': self.settings,
@@ -99,7 +81,7 @@ class UserDTO:
         raise AttributeError(f"'UserDTO' object has no attribute '{item}'")
 
     def __setattr__(self, key, value):
-        if key in {'user_id', 'account_key', 'user_key', 'role', 'authorities', '_refresh_tokens', '_refresh_token_cache', '_extra_fields', '_last_activity', 'settings', 'subscription', 'password'}:
+        if key in {'user_id', 'account_key', 'user_key', 'role', 'authorities', '_extra_fields', '_last_activity', 'settings', 'subscription', 'password'}:
             super().__setattr__(key, value)
         else:
             self._extra_fields[key] = value
@@ -16,6 +16,11 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Fields never returned to tools
+USER_HIDDEN_FIELDS = {'password': 0, 'refresh_tokens': 0}
+# Fields read by _get_expenses
+EXPENSE_FIELDS = ('category', 'amount', 'description', 'date', 'pond_id')
+
 
 class MCPTools:
     """MCP Tools for data access and manipulation."""
@@ -247,19 +252,15 @@ class MCPTools:
             return {"error": "Users repository not available"}
 
         if user_key:
-            user = repo.find_one({'user_key': user_key})
+            user = repo.find_one({'user_key': user_key}, fields=USER_HIDDEN_FIELDS)
             if user:
-                user.pop('password', None)
-                user.pop('refresh_tokens', None)
                 user['_id'] = str(user.get('_id', ''))
                 return {"user": user}
             return {"error": "User not found"}
 
         if account_key:
-            users = list(repo.find({'account_key': account_key}))
+            users = list(repo.find({'account_key': account_key}, fields=USER_HIDDEN_FIELDS))
             for u in users:
-                u.pop('password', None)
-                u.pop('refresh_tokens', None)
                 u['_id'] = str(u.get('_id', ''))
             return {"users": users, "count": len(users)}
 
@@ -351,7 +352,19 @@ class MCPTools:
         if not pond_repo:
             return {"error": "Pond repository not available"}
 
-        ponds = list(pond_repo.find({'account_key': account_key}))
+        from fin_server.repository.fish.pond_aggregations import species_by_pond
+
+        # project the listed fields only; current_stock arrays can be large
+        ponds = pond_repo.find({'account_key': account_key},
+                               fields=('pond_id', 'name', 'size', 'location', 'status', 'created_at'))
+
+        species = {}
+        if include_fish and pond_event_repo:
+            try:
+                species = species_by_pond(pond_event_repo, account_key,
+                                          [p.get('pond_id') or str(p.get('_id', '')) for p in ponds])
+            except Exception:
+                pass
 
         result = []
         for pond in ponds:
@@ -365,15 +378,7 @@ class MCPTools:
             }
 
             if include_fish and pond_event_repo:
-                try:
-                    events = list(pond_event_repo.find({
-                        'account_key': account_key,
-                        'pond_id': pond_data['pond_id']
-                    }))
-                    species = list(set(e.get('species_code') for e in events if e.get('species_code')))
-                    pond_data['fish_species'] = species
-                except Exception:
-                    pass
+                pond_data['fish_species'] = species.get(pond_data['pond_id'], [])
 
             result.append(pond_data)
 
@@ -465,9 +470,9 @@ class MCPTools:
             query['date'] = date_query
 
         try:
-            expenses = list(repo.find(query).sort('date', -1).limit(limit))
+            expenses = list(repo.iter_expenses(query, limit=limit, fields=EXPENSE_FIELDS).sort('date', -1))
         except Exception:
-            expenses = list(repo.find(query))[:limit]
+            expenses = repo.find_expenses(query, limit=limit, fields=EXPENSE_FIELDS)
 
         result = []
         for e in expenses:
@@ -506,7 +511,7 @@ class MCPTools:
             query['date'] = date_query
 
         try:
-            expenses = list(repo.find(query))
+            expenses = repo.find_expenses(query, limit=0, fields=('category', 'amount'))
         except Exception:
             expenses = []
 
@@ -637,34 +642,59 @@ class MCPTools:
         return {"search_results": results, "query": query}
 
     def _get_dashboard_summary(self, account_key: str) -> Dict[str, Any]:
-        """Get complete dashboard summary."""
+        """Get complete dashboard summary.
+
+        The sections are independent, so they are fetched concurrently; a section
+        that fails or times out is left at its default and listed under `errors`.
+        """
+        from fin_server.repository.fish import pond_aggregations
+        from fin_server.utils.threading_util import ConcurrentQueries
+
         summary = {
             "account_key": account_key,
             "generated_at": datetime.now().isoformat(),
         }
 
+        # initialize repositories before fanning out so workers don't race on it
+        self._get_repos()
+        queries = ConcurrentQueries(timeout=config.DASHBOARD_QUERY_TIMEOUT)
+        queries.submit('company', self._get_company_info, account_key, default={})
+        queries.submit('fish', self._list_fish_species, account_key, include_analytics=False, default={})
+        pond_repo = self._repos.get('pond')
+        if pond_repo:
+            queries.submit('ponds_by_status', pond_aggregations.pond_counts_by_status, pond_repo, account_key, default={})
+            queries.submit('stock_by_species', pond_aggregations.stock_by_species, pond_repo, account_key, default={})
+            queries.submit('stock_by_pond_type', pond_aggregations.fish_counts_by_pond_type, pond_repo, account_key, default={})
+        queries.submit('expenses', self._get_financial_summary, account_key, default={})
+        queries.submit('feeding', self._get_feeding_records, account_key, limit=100, default={})
+        results, errors = queries.gather()
+
         # Company info
-        company_result = self._get_company_info(account_key)
+        company_result = results['company']
         if 'company' in company_result:
             summary['company_name'] = company_result['company'].get('company_name')
             summary['employee_count'] = company_result['company'].get('employee_count', 0)
 
         # Fish count
-        fish_result = self._list_fish_species(account_key, include_analytics=False)
-        summary['fish_species_count'] = fish_result.get('count', 0)
+        summary['fish_species_count'] = results['fish'].get('count', 0)
 
-        # Pond count
-        pond_result = self._list_ponds(account_key, include_fish=False)
-        summary['pond_count'] = pond_result.get('count', 0)
+        # Pond count and stock rollups
+        summary['ponds_by_status'] = results.get('ponds_by_status', {})
+        summary['pond_count'] = sum(summary['ponds_by_status'].values())
+        summary['stock_by_species'] = results.get('stock_by_species', {})
+        summary['stock_by_pond_type'] = results.get('stock_by_pond_type', {})
+        summary['total_stock'] = sum(summary['stock_by_pond_type'].values())
 
         # Recent expenses
-        expense_result = self._get_financial_summary(account_key)
+        expense_result = results['expenses']
         summary['total_expenses'] = expense_result.get('total_expenses', 0)
         summary['expense_categories'] = expense_result.get('by_category', {})
 
         # Recent feeding count
-        feeding_result = self._get_feeding_records(account_key, limit=100)
-        summary['recent_feeding_count'] = feeding_result.get('count', 0)
+        summary['recent_feeding_count'] = results['feeding'].get('count', 0)
+
+        if errors:
+            summary['errors'] = errors
 
         return summary
 
@@ -13,6 +13,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from bson import ObjectId
 
+from fin_server.repository.bulk import BulkWriter
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.messaging.models import (
     Message, Conversation, MessageReceipt, UserPresence,
@@ -670,15 +671,16 @@ class MessagingRepository:
             'conversation_id': conversation_id,
             'sender_key': {'$ne': user_key},
             'deleted_at': None
-        })
+        }, {'message_id': 1})
 
-        count = 0
-        for msg in messages:
-            msg_id = msg.get('message_id') or str(msg.get('_id'))
-            self.mark_read(msg_id, user_key)
-            count += 1
+        # One bulk upsert per batch instead of one round trip per message
+        with BulkWriter(self.message_receipts) as writer:
+            for msg in messages:
+                msg_id = msg.get('message_id') or str(msg.get('_id'))
+                receipt = MessageReceipt(message_id=msg_id, user_key=user_key, status=MessageStatus.READ)
+                writer.upsert_one({'message_id': msg_id, 'user_key': user_key}, {'$set': receipt.to_db_doc()})
 
-        return count
+        return len(writer)
 
     def get_message_receipts(self, message_id: str) -> List[Dict]:
         """Get all receipts for a message."""
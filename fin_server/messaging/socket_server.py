@@ -13,7 +13,6 @@ Features:
 """
 import logging
 from datetime import datetime
-from threading import Thread
 from typing import Optional, Dict, Any
 
 from flask import request
@@ -53,7 +52,7 @@ user_repo = get_collection('users')
 def authenticate_socket(token: str) -> Optional[Dict]:
     """Authenticate socket connection using JWT token."""
     try:
-        payload = AuthSecurity.decode_token(token)
+        payload = AuthSecurity.verify_token(token)
         return payload
     except Exception as e:
         logger.warning(f"Socket authentication failed: {e}")
@@ -493,26 +492,37 @@ def send_pending_messages(user_key: str):
         notification_queue_repo.mark_sent(n['_id'])
 
 
-# Background worker for offline delivery
-def notification_worker():
-    """Background worker to deliver pending notifications."""
-    import time
-    while True:
-        try:
-            pending = notification_queue_repo.get_pending()
-            for n in pending:
-                user_key = n.get('user_key')
-                if user_key and user_key in user_sockets:
-                    emit_to_user(user_key, 'notification', n)
-                    notification_queue_repo.mark_sent(n['_id'])
-        except Exception as e:
-            logger.exception(f"Notification worker error: {e}")
-        time.sleep(10)
+# Offline delivery: queued notifications reach users as soon as they are queued
+# (change events) or when they connect (hub calls deliver_pending_notifications)
+def _deliver_notification(notification) -> bool:
+    from fin_server.utils.helpers import normalize_doc
+    from fin_server.websocket.event_emitter import EventEmitter
 
+    user_key = notification.get('user_key')
+    if not user_key or not EventEmitter.is_user_online(user_key):
+        return False
+    if not EventEmitter.emit_to_user(user_key, 'notification', normalize_doc(notification)):
+        return False
+    notification_queue_repo.mark_sent(notification['_id'])
+    return True
+
+
+def on_notification_queued(event):
+    """Change-event handler: deliver a newly queued notification if its user is online."""
+    if event.get('status') == 'pending':
+        _deliver_notification(event.document)
 
-def start_notification_worker():
-    """Start the background notification worker."""
-    t = Thread(target=notification_worker, daemon=True)
-    t.start()
-    logger.debug("Notification worker started")
 
+def deliver_pending_notifications(user_key: str) -> int:
+    """Deliver the user's queued notifications (called when the user connects)."""
+    delivered = 0
+    for n in notification_queue_repo.get_pending(user_key=user_key):
+        delivered += _deliver_notification(n)
+    return delivered
+
+
+def start_notification_worker():
+    """Deliver queued notifications from change events on notification_queue."""
+    from fin_server.repository.change_events import subscribe
+    if subscribe('notification_queue', on_notification_queued, operations=('insert',)):
+        logger.debug("Notification worker subscribed to notification_queue")
@@ -6,37 +6,87 @@ from .worker import NotificationWorker
 from fin_server.repository.media.task_repository import TaskRepository
 import logging
 
+from ..repository.change_events import get_event_bus
 from ..repository.mongo_helper import get_collection
 
 
+def _parse_reminder(reminder_time_str):
+    """Seconds since midnight for HH:MM or HH:MM:SS, else None."""
+    parts = [int(p) for p in str(reminder_time_str).split(':')]
+    if len(parts) == 2:
+        return parts[0] * 3600 + parts[1] * 60
+    if len(parts) == 3:
+        return parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return None
+
+
+def _now_seconds():
+    now = datetime.now()
+    return now.hour * 3600 + now.minute * 60 + now.second
+
+
 class TaskScheduler:
+    """Enqueue task reminders at their reminder_time and overdue notices once a day.
+
+    Today's candidate tasks are loaded with one query at start and at each day
+    rollover. Task inserts, updates and deletes arrive from the change-event bus
+    and adjust the schedule, so the loop sleeps until the next reminder instead
+    of querying every interval. While task changes are not streamed (polling
+    fallback, which only sees inserts, or the bus not running) the schedule is
+    reloaded every `interval_seconds`.
+    """
+
     def __init__(self, interval_seconds=60):
         self.interval = interval_seconds
         self.worker = NotificationWorker()
         self.thread = threading.Thread(target=self.run, daemon=True)
         self.running = False
         self.task_repository = get_collection('task')
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        # str(_id) -> (reminder seconds, task)
+        self._due = {}
+        # (str(_id), reminder seconds | 'overdue') already enqueued today
+        self._sent = set()
+        self._day = None
+        self._loaded_at = 0.0
+        # reminders at or before this second of today have been handled
+        self._checked_until = -1
 
     def start(self):
         self.running = True
+        get_event_bus().subscribe('task', self.on_task_change)
         self.thread.start()
 
     def stop(self):
         self.running = False
+        self._wake.set()
         self.thread.join()
 
     def run(self):
         while self.running:
-            self.check_and_notify()
-            time.sleep(self.interval)
+            try:
+                self.notify_due()
+                today_str = get_time_date(include_time=False)
+                streamed = get_event_bus().is_streaming('task')
+                if today_str != self._day or (not streamed and time.monotonic() - self._loaded_at >= self.interval):
+                    self.load_schedule(today_str)
+            except Exception as e:
+                logging.error(f"[Scheduler] Error checking reminders: {e}")
+            self._wake.wait(self._seconds_to_next())
+            self._wake.clear()
 
-    def check_and_notify(self):
-        now = datetime.now()
-        now_seconds = now.hour * 3600 + now.minute * 60 + now.second
-        next_seconds = now_seconds + self.interval
+    def _seconds_to_next(self):
+        # wake for the next reminder, and at least every interval to notice the day rollover
+        with self._lock:
+            next_at = min((at for at, _ in self._due.values()), default=None)
+        if next_at is None:
+            return self.interval
+        return max(0, min(self.interval, next_at - _now_seconds()))
+
+    def load_schedule(self, today_str):
+        """Rebuild today's schedule with one query."""
         # Use IST date string for matching end_date stored in tasks
-        today_str = get_time_date(include_time=False)
-        # Find tasks with reminders due in the next interval (seconds), or overdue
         tasks = self.task_repository.collection.find({
             '$or': [
                 {
@@ -50,26 +100,68 @@ class TaskScheduler:
                 }
             ]
         })
+        with self._lock:
+            if today_str != self._day:
+                self._sent.clear()
+                # on the first load, reminders already past are skipped; after a rollover none are
+                self._checked_until = _now_seconds() - 1 if self._day is None else -1
+            self._day = today_str
+            self._due = {}
+            self._loaded_at = time.monotonic()
         for task in tasks:
-            reminder_time_str = task.get('reminder_time')
-            if reminder_time_str:
-                try:
-                    # Accept HH:MM:SS or HH:MM
-                    parts = [int(p) for p in reminder_time_str.split(':')]
-                    if len(parts) == 2:
-                        reminder_seconds = parts[0] * 3600 + parts[1] * 60
-                    elif len(parts) == 3:
-                        reminder_seconds = parts[0] * 3600 + parts[1] * 60 + parts[2]
-                    else:
-                        continue
-                    logging.info(f"[Scheduler] Checking task '{task.get('title')}' at {reminder_time_str} ({reminder_seconds}s), now={now_seconds}s, next={next_seconds}s")
-                    if now_seconds <= reminder_seconds < next_seconds:
-                        logging.info(f"[Scheduler] Enqueueing notification for task '{task.get('title')}'")
-                        self.worker.enqueue_notification(task)
-                except Exception as e:
-                    logging.error(f"[Scheduler] Error parsing reminder_time: {reminder_time_str} - {e}")
-                    continue
-            # Overdue tasks
-            elif task.get('status', '').lower() != 'completed' and task.get('end_date') == today_str:
-                logging.info(f"[Scheduler] Enqueueing overdue notification for task '{task.get('title')}'")
-                self.worker.enqueue_notification(task)
+            self._schedule(str(task['_id']), task, today_str)
+
+    def on_task_change(self, event):
+        """Change-event handler: reschedule (or drop) the changed task."""
+        key = str(event.id)
+        with self._lock:
+            self._due.pop(key, None)
+            today_str = self._day
+        if today_str and event.document is not None and self._matches(event.document, today_str):
+            self._schedule(key, event.document, today_str)
+        self._wake.set()
+
+    @staticmethod
+    def _matches(task, today_str):
+        """Same condition as the `load_schedule` query, for one document."""
+        end_date = task.get('end_date')
+        if task.get('reminder') is True and 'reminder_time' in task and end_date == today_str:
+            return True
+        return task.get('status') != 'completed' and isinstance(end_date, str) and end_date <= today_str
+
+    def _schedule(self, key, task, today_str):
+        reminder_time_str = task.get('reminder_time')
+        if reminder_time_str:
+            try:
+                # Accept HH:MM:SS or HH:MM
+                reminder_seconds = _parse_reminder(reminder_time_str)
+            except Exception as e:
+                logging.error(f"[Scheduler] Error parsing reminder_time: {reminder_time_str} - {e}")
+                return
+            if reminder_seconds is None:
+                return
+            with self._lock:
+                if reminder_seconds > self._checked_until and (key, reminder_seconds) not in self._sent:
+                    logging.debug(f"[Scheduler] Scheduling task '{task.get('title')}' at {reminder_time_str} ({reminder_seconds}s)")
+                    self._due[key] = (reminder_seconds, task)
+        # Overdue tasks
+        elif str(task.get('status', '')).lower() != 'completed' and task.get('end_date') == today_str:
+            with self._lock:
+                if (key, 'overdue') in self._sent:
+                    return
+                self._sent.add((key, 'overdue'))
+            logging.info(f"[Scheduler] Enqueueing overdue notification for task '{task.get('title')}'")
+            self.worker.enqueue_notification(task)
+
+    def notify_due(self):
+        """Enqueue the reminders whose time has come."""
+        now_seconds = _now_seconds()
+        with self._lock:
+            self._checked_until = max(self._checked_until, now_seconds)
+            due = [(key, at, task) for key, (at, task) in self._due.items() if at <= now_seconds]
+            for key, at, _ in due:
+                del self._due[key]
+                self._sent.add((key, at))
+        for key, at, task in due:
+            logging.info(f"[Scheduler] Enqueueing notification for task '{task.get('title')}'")
+            self.worker.enqueue_notification(task)
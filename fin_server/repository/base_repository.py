@@ -1,4 +1,132 @@
-from typing import Any, Dict, Optional
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+
+from fin_server.repository.cache import read_through, register_collection
+from fin_server.repository.client_manager import client_manager
+from fin_server.repository.identity_map import cached_find_one
+from fin_server.repository.projection import projection
+from fin_server.repository.read_profiles import PRIMARY, apply_read_profile
+
+
+# --- Keyset (cursor) pagination ---
+
+# Largest page find_page returns; a page is read into memory to find its cursor
+MAX_PAGE_LIMIT = 1000
+
+
+def _page_order(sort) -> List[Tuple[str, int]]:
+    """Normalize `sort` and append `_id` as the tie-breaker (same direction as the last key)."""
+    if isinstance(sort, str):
+        sort = [(sort, -1)]
+    order = [(f, d) for f, d in (sort or []) if f != '_id']
+    id_dir = next((d for f, d in (sort or []) if f == '_id'), order[-1][1] if order else -1)
+    return order + [('_id', id_dir)]
+
+
+def _get_path(doc: Dict[str, Any], field: str):
+    cur = doc
+    for part in field.split('.'):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
+
+
+def encode_cursor(doc: Dict[str, Any], order: List[Tuple[str, int]]) -> str:
+    """Return an opaque token holding `doc`'s values for each key of `order`."""
+    raw = json_util.dumps([_get_path(doc, field) for field, _ in order])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, order: List[Tuple[str, int]]) -> List[Any]:
+    """Decode a token produced by `encode_cursor`; raises ValueError if malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(order):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def _beyond(field: str, value: Any, direction: int):
+    """Filter for documents strictly after `value` in `direction` order.
+
+    MongoDB sorts null/missing first ascending and last descending.
+    """
+    if direction < 0:
+        if value is None:
+            return None
+        return {'$or': [{field: {'$lt': value}}, {field: None}]}
+    if value is None:
+        return {field: {'$ne': None}}
+    return {field: {'$gt': value}}
+
+
+def _keyset_filter(order: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    """Build the `$or` of (equal prefix, strictly-after key) clauses for a cursor."""
+    clauses = []
+    for i, (field, direction) in enumerate(order):
+        after = _beyond(field, values[i], direction)
+        if after is None:
+            continue
+        prefix = {order[j][0]: values[j] for j in range(i)}
+        clauses.append({'$and': [prefix, after]} if prefix else after)
+    if not clauses:
+        # cursor points at the last possible position
+        return {'_id': {'$exists': False}}
+    return clauses[0] if len(clauses) == 1 else {'$or': clauses}
+
+
+def _page_projection(fields, order: List[Tuple[str, int]]) -> Optional[Dict[str, Any]]:
+    """Projection for `fields` that keeps the sort keys the cursor is built from."""
+    proj = projection(fields)
+    if not proj:
+        return proj
+    inclusive = any(value not in (0, False) for field, value in proj.items() if field != '_id')
+    for field, _ in order:
+        if inclusive:
+            proj[field] = 1
+        else:
+            proj.pop(field, None)
+    return proj
+
+
+def find_page(collection, query: Optional[Dict[str, Any]] = None, sort: Optional[Any] = None,
+              after: Optional[str] = None, limit: int = 50, skip: int = 0, fields=None):
+    """Keyset-paginate `query` on a pymongo collection.
+
+    `sort` is a field name or a list of (field, direction) pairs (default: `_id`
+    descending); `_id` is always appended as the tie-breaker so page boundaries
+    are stable. Pass the returned cursor back as `after` to fetch the next page;
+    it is None when there are no more results. Unlike skip/limit, the cost of a
+    page does not grow with its depth. `fields` limits the returned fields (see
+    `fin_server.repository.projection`); the sort keys are always included.
+    `limit` is clamped to 1..MAX_PAGE_LIMIT.
+
+    Returns (docs, next_cursor).
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_LIMIT))
+    order = _page_order(sort)
+    query = dict(query or {})
+    if after:
+        keyset = _keyset_filter(order, decode_cursor(after, order))
+        query = {'$and': [query, keyset]} if query else keyset
+
+    cursor = collection.find(query, _page_projection(fields, order)).sort(order)
+    if skip:
+        cursor = cursor.skip(skip)
+    docs = list(cursor.limit(limit + 1))
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], order)
+    return docs, next_cursor
+
 
 class BaseRepository:
     """Lightweight repository base that proxies common operations to an underlying
@@ -6,13 +134,65 @@ class BaseRepository:
     and `collection_name` to the constructor.
 
     Subclasses may override any method where custom behaviour is required.
+
+    Indexes are declared, not created ad hoc: subclasses list the indexes their
+    queries need in `INDEXES` and representative filters in `QUERY_SHAPES`; the
+    registry in `fin_server.repository.indexes` reconciles them.
+
+    Reads accept `fields=` to fetch only the listed fields (see
+    `fin_server.repository.projection`).
+
+    Reads go through the named `READ_PROFILE` (see
+    `fin_server.repository.read_profiles`); writes always go to the primary.
+
+    `find_one` by `_id` or one of `IDENTITY_KEYS` is cached for the current
+    request (see `fin_server.repository.identity_map`); lookups by `CACHE_KEY`
+    are also read through the shared cache (see `fin_server.repository.cache`).
     """
 
+    # pymongo IndexModel list for `self.collection`
+    INDEXES: List[Any] = []
+    # {'name', 'filter', 'sort'} dicts explained by the dev-mode COLLSCAN check
+    QUERY_SHAPES: List[Dict[str, Any]] = []
+    # Read profile name for `self.collection`
+    READ_PROFILE: str = PRIMARY
+    # Unique key fields whose find_one lookups use the request identity map
+    IDENTITY_KEYS: Tuple[str, ...] = ()
+    # '_id' or one of IDENTITY_KEYS: find_one by it is read through the shared cache
+    CACHE_KEY: Optional[str] = None
+    CACHE_TTL: Optional[int] = None
+
     def __init__(self, db: Optional[Any] = None, collection_name: Optional[str] = None):
         self.db = db
         self.collection = None
+        # rebinds self.db / self.collection to the worker's client after a fork
+        client_manager.track(self)
         if db is not None and collection_name is not None:
-            self.collection = db[collection_name]
+            self.collection = apply_read_profile(db[collection_name], self.READ_PROFILE)
+            if self.CACHE_KEY:
+                register_collection(self.collection.full_name, self.CACHE_KEY)
+
+    def bulk_writer(self, batch_size: Optional[int] = None, ordered: bool = False, session=None):
+        """Return a BulkWriter that batches writes to `self.collection` (see repository.bulk)."""
+        from fin_server.repository.bulk import BulkWriter
+        if self.collection is None:
+            raise NotImplementedError('bulk_writer() requires collection to be set')
+        return BulkWriter(self.collection, batch_size=batch_size, ordered=ordered, session=session)
+
+    def _record_dashboard_change(self, account_key: Optional[str], inc: Optional[Dict[str, Any]] = None,
+                                 stale=()):
+        """Apply a write to the account's dashboard snapshot (see services.dashboard_service)."""
+        from fin_server.services.dashboard_service import record_dashboard_change
+        record_dashboard_change(account_key, inc=inc, stale=stale)
+
+    def index_specs(self) -> List[Tuple[Any, List[Any], List[Dict[str, Any]]]]:
+        """Return (collection, INDEXES, QUERY_SHAPES) tuples for the index registry.
+
+        Override when the repository owns more than one collection.
+        """
+        if self.collection is None:
+            return []
+        return [(self.collection, self.INDEXES, self.QUERY_SHAPES)]
 
     # --- Create / Read / Update / Delete helpers ---
     def create(self, data: Dict[str, Any]):
@@ -22,17 +202,20 @@ class BaseRepository:
         res = self.collection.insert_one(data)
         return getattr(res, 'inserted_id', None)
 
-    def find(self, query: Optional[Dict[str, Any]] = None, *args, **kwargs):
+    def find(self, query: Optional[Dict[str, Any]] = None, *args, fields=None, **kwargs):
         """Return a pymongo Cursor for the given query so callers can chain sort/limit."""
         if self.collection is None:
             raise NotImplementedError('find() requires collection to be set')
         if query is None:
             query = {}
+        if fields is not None:
+            kwargs['projection'] = projection(fields)
         return self.collection.find(query, *args, **kwargs)
 
-    def find_many(self, query: Optional[Dict[str, Any]] = None, limit: int = 0, skip: int = 0, sort: Optional[Any] = None):
+    def find_many(self, query: Optional[Dict[str, Any]] = None, limit: int = 0, skip: int = 0, sort: Optional[Any] = None,
+                  fields=None):
         """Return a list of documents for the query (convenience wrapper)."""
-        cursor = self.find(query)
+        cursor = self.find(query, fields=fields)
         if sort:
             cursor = cursor.sort(sort)
         if skip:
@@ -41,9 +224,27 @@ class BaseRepository:
             cursor = cursor.limit(limit)
         return list(cursor)
 
-    def find_one(self, query: Dict[str, Any]):
+    def find_page(self, query: Optional[Dict[str, Any]] = None, sort: Optional[Any] = None,
+                  after: Optional[str] = None, limit: int = 50, skip: int = 0, fields=None):
+        """Return (docs, next_cursor) using keyset pagination (see `find_page`)."""
+        if self.collection is None:
+            raise NotImplementedError('find_page() requires collection to be set')
+        return find_page(self.collection, query, sort=sort, after=after, limit=limit, skip=skip, fields=fields)
+
+    def find_one(self, query: Dict[str, Any], *args, fields=None, **kwargs):
         if self.collection is None:
             raise NotImplementedError('find_one() requires collection to be set')
+        if (self.IDENTITY_KEYS or self.CACHE_KEY) and not args and not kwargs:
+            return cached_find_one(self.collection, query, ('_id',) + tuple(self.IDENTITY_KEYS),
+                                   loader=self._load_one if self.CACHE_KEY else None, fields=fields)
+        if fields is not None:
+            kwargs['projection'] = projection(fields)
+        return self.collection.find_one(query, *args, **kwargs)
+
+    def _load_one(self, query: Dict[str, Any]):
+        if self.CACHE_KEY and list(query) == [self.CACHE_KEY]:
+            return read_through(self.collection.full_name, query[self.CACHE_KEY],
+                                lambda: self.collection.find_one(query), ttl=self.CACHE_TTL)
         return self.collection.find_one(query)
 
     def update(self, query: Dict[str, Any], update_fields: Dict[str, Any], multi: bool = False):
@@ -0,0 +1,168 @@
+"""Buffered bulk writes.
+
+`BulkWriter` collects InsertOne / UpdateOne / upsert operations for one
+collection and sends them with `bulk_write` in batches of
+`config.BULK_WRITE_BATCH_SIZE`, so a loop of N writes costs N / batch_size round
+trips instead of N.
+
+Error policy:
+- unordered (default): every operation is attempted; failures are reported
+  per operation in `result.errors` and do not stop the other operations;
+- ordered: execution stops at the first failure; the operations that were not
+  attempted (rest of that batch and every later batch) are counted in
+  `result.unprocessed`.
+
+Error indexes are positions in the order operations were added to the writer,
+not positions within a batch.
+
+Usage:
+    with repo.bulk_writer() as writer:
+        for line in lines:
+            writer.insert_one(line)
+    report = writer.result
+
+API:
+- BulkWriter(collection, batch_size=None, ordered=False, session=None)
+- insert_one(doc) / update_one(filter, update, upsert=False) / upsert_one(filter, update)
+- flush() -> BulkWriteReport; close() flushes the remainder
+- BaseRepository.bulk_writer(...) -> BulkWriter on the repository collection
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class BulkWriteReport:
+    """Cumulative outcome of the batches flushed by a BulkWriter."""
+
+    def __init__(self):
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.upserted_count = 0
+        # operation index -> upserted _id
+        self.upserted_ids: Dict[int, Any] = {}
+        # [{'index', 'code', 'message'}] with indexes in submission order
+        self.errors: List[Dict[str, Any]] = []
+        self.unprocessed = 0
+        self.batches = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.unprocessed
+
+    def _merge(self, raw: Dict[str, Any], offset: int):
+        self.inserted_count += raw.get('nInserted', 0)
+        self.matched_count += raw.get('nMatched', 0)
+        self.modified_count += raw.get('nModified', 0)
+        self.upserted_count += raw.get('nUpserted', 0)
+        for upsert in raw.get('upserted', []):
+            self.upserted_ids[offset + upsert['index']] = upsert['_id']
+        for error in raw.get('writeErrors', []):
+            self.errors.append({'index': offset + error['index'], 'code': error.get('code'),
+                                'message': error.get('errmsg')})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'inserted': self.inserted_count,
+            'matched': self.matched_count,
+            'modified': self.modified_count,
+            'upserted': self.upserted_count,
+            'errors': list(self.errors),
+            'unprocessed': self.unprocessed,
+            'batches': self.batches,
+        }
+
+
+class BulkWriter:
+    """Buffer write operations for one collection and flush them in batches."""
+
+    def __init__(self, collection, batch_size: Optional[int] = None, ordered: bool = False, session=None):
+        """
+        Args:
+            collection: pymongo collection to write to
+            batch_size: Operations per bulk_write (default config.BULK_WRITE_BATCH_SIZE)
+            ordered: Stop at the first failing operation (see module docstring)
+            session: Optional ClientSession passed to every bulk_write
+        """
+        if collection is None:
+            raise ValueError('BulkWriter requires a collection')
+        self.collection = collection
+        self.batch_size = max(1, int(batch_size or config.BULK_WRITE_BATCH_SIZE))
+        self.ordered = ordered
+        self.session = session
+        self.result = BulkWriteReport()
+        self._ops: List[Any] = []
+        self._offset = 0    # submission index of self._ops[0]
+        self._stopped = False
+
+    def __len__(self):
+        return self._offset + len(self._ops)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # flush on a clean exit only; an exception leaves the pending operations unsent
+        if exc_type is None:
+            self.close()
+        return False
+
+    # --- queueing ------------------------------------------------------------
+
+    def _add(self, op) -> int:
+        index = len(self)
+        self._ops.append(op)
+        if len(self._ops) >= self.batch_size:
+            self.flush()
+        return index
+
+    def insert_one(self, document: Dict[str, Any]) -> int:
+        """Queue an insert; returns the operation index. `_id` is assigned on flush if missing."""
+        return self._add(InsertOne(document))
+
+    def update_one(self, filter: Dict[str, Any], update: Any, upsert: bool = False, array_filters=None) -> int:
+        """Queue an update of the first matching document; returns the operation index."""
+        return self._add(UpdateOne(filter, update, upsert=upsert, array_filters=array_filters))
+
+    def upsert_one(self, filter: Dict[str, Any], update: Any) -> int:
+        """Queue an update that inserts when nothing matches; returns the operation index."""
+        return self.update_one(filter, update, upsert=True)
+
+    # --- sending -------------------------------------------------------------
+
+    def flush(self) -> BulkWriteReport:
+        """Send the pending operations now."""
+        ops, offset = self._ops, self._offset
+        self._ops = []
+        self._offset += len(ops)
+        if not ops:
+            return self.result
+        if self._stopped:
+            self.result.unprocessed += len(ops)
+            return self.result
+
+        self.result.batches += 1
+        try:
+            res = self.collection.bulk_write(ops, ordered=self.ordered, session=self.session)
+            self.result._merge(res.bulk_api_result, offset)
+        except BulkWriteError as e:
+            details = e.details or {}
+            self.result._merge(details, offset)
+            if self.ordered:
+                failed_at = min((err['index'] for err in details.get('writeErrors', [])), default=len(ops) - 1)
+                self.result.unprocessed += len(ops) - failed_at - 1
+                self._stopped = True
+            logger.warning(f"Bulk write to {getattr(self.collection, 'name', self.collection)}: "
+                           f"{len(details.get('writeErrors', []))} of {len(ops)} operations failed")
+        return self.result
+
+    def close(self) -> BulkWriteReport:
+        """Flush the remaining operations and return the cumulative report."""
+        return self.flush()
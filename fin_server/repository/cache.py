@@ -0,0 +1,461 @@
+"""Shared read-through cache for hot reference data.
+
+User profiles, companies, role definitions, the fish species catalog and
+fish_mapping entries are read on nearly every request but change rarely.
+Repositories read them through `read_through()`:
+
+    L1  per-process LRU with TTL (always)
+    L2  Redis-compatible server (`cache.type: redis`; needs the `redis` package)
+
+Invalidation:
+- `CacheInvalidationListener` is registered on the MongoClient and watches the
+  collections registered with `register_collection`. When a write to one of
+  them completes, the affected keys (equalities on the collection's key field
+  in the write filter or inserted documents) or else the whole namespace are
+  dropped and the invalidation is published to the other workers;
+- with Redis, invalidations go over pub/sub; with the memory type they are
+  written to `user_db.cache_invalidations` (TTL-indexed) and every worker
+  polls it each `cache.invalidation_poll_seconds`;
+- entries also expire after `cache.ttl_seconds`, which bounds staleness if an
+  invalidation is lost.
+
+Values are copied in and out, so callers may mutate what they get back.
+Hit/miss counters per namespace are exposed on GET /metrics under `cache`.
+
+API:
+- read_through(namespace, key, loader, ttl=None) -> cached or loaded value
+- register_collection(namespace, key_field=None)
+- get_shared_cache() -> SharedCache or None when `cache.enabled` is off
+- SharedCache.invalidate(namespace, key=None)
+"""
+import copy
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from bson import ObjectId, json_util
+from pymongo import monitoring
+
+from config import config
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+WRITE_COMMANDS = ('insert', 'update', 'delete', 'findAndModify')
+INVALIDATIONS_COLLECTION = 'cache_invalidations'
+REDIS_KEY_PREFIX = 'fin:cache:'
+REDIS_CHANNEL = 'fin:cache:invalidate'
+# Overlap between invalidation polls, absorbs clock skew between workers
+POLL_OVERLAP_SECONDS = 5
+
+_MISSING = object()
+_SCALARS = (str, int, ObjectId)
+
+# namespace ('db.collection') -> key field (None: invalidate the whole namespace on any write)
+_registered: Dict[str, Optional[str]] = {}
+
+
+def register_collection(namespace: str, key_field: Optional[str] = None):
+    """Invalidate `namespace` entries when the collection is written to."""
+    _registered[namespace] = key_field
+
+
+def _scalar(value) -> bool:
+    return isinstance(value, _SCALARS) and not isinstance(value, bool)
+
+
+def _cache_key(key: Any) -> str:
+    """Type-preserving cache key: 1, '1' and ObjectId('1...') stay distinct, as they are to MongoDB."""
+    if isinstance(key, int) and not isinstance(key, bool):
+        key = int(key)  # Int64 matches the same documents as int
+    return json_util.dumps(key)
+
+
+class LRUTTLCache:
+    """Bounded per-process cache of (namespace, key) -> value with expiry."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._lock = Lock()
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return _MISSING
+            if entry[0] < time.monotonic():
+                del self._entries[(namespace, key)]
+                return _MISSING
+            self._entries.move_to_end((namespace, key))
+            return entry[1]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, namespace: str, key: Optional[str] = None):
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisTier:
+    """Second tier shared by every worker, on a Redis-compatible server."""
+
+    def __init__(self, client):
+        self._client = client
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> str:
+        return f'{REDIS_KEY_PREFIX}{namespace}:{key}'
+
+    def get(self, namespace: str, key: str):
+        raw = self._client.get(self._key(namespace, key))
+        return _MISSING if raw is None else json_util.loads(raw)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float):
+        self._client.set(self._key(namespace, key), json_util.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, namespace: str, key: Optional[str] = None):
+        if key is not None:
+            self._client.delete(self._key(namespace, key))
+            return
+        keys = list(self._client.scan_iter(match=f'{REDIS_KEY_PREFIX}{namespace}:*', count=500))
+        if keys:
+            self._client.delete(*keys)
+
+
+class _RedisBus:
+    """Invalidations over Redis pub/sub."""
+
+    def __init__(self, client, on_message: Callable[[Dict[str, Any]], None]):
+        self._client = client
+        self._on_message = on_message
+        threading.Thread(target=self._listen, name='cache-invalidations', daemon=True).start()
+
+    def publish(self, payload: Dict[str, Any]):
+        self._client.publish(REDIS_CHANNEL, json.dumps(payload))
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REDIS_CHANNEL)
+                for message in pubsub.listen():
+                    self._on_message(json.loads(message['data']))
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost ({e}); retrying")
+                time.sleep(1)
+
+
+class _MongoBus:
+    """Invalidations through a TTL-indexed collection polled by every worker."""
+
+    def __init__(self, collection, interval: float, on_message: Callable[[Dict[str, Any]], None]):
+        self._collection = collection
+        self._interval = interval
+        self._on_message = on_message
+        self._since = datetime.now(timezone.utc)
+        self._seen: Dict[Any, datetime] = {}
+        threading.Thread(target=self._poll, name='cache-invalidations', daemon=True).start()
+
+    def publish(self, payload: Dict[str, Any]):
+        self._collection.insert_one({**payload, 'at': datetime.now(timezone.utc)})
+
+    def _poll(self):
+        while True:
+            time.sleep(self._interval)
+            started = datetime.now(timezone.utc)
+            try:
+                cursor = self._collection.find({'at': {'$gte': self._since}}).sort('at', 1)
+                for doc in cursor:
+                    if doc['_id'] not in self._seen:
+                        self._seen[doc['_id']] = started
+                        self._on_message(doc)
+            except Exception as e:
+                logger.debug(f"Cache invalidation poll failed: {e}")
+                continue
+            # re-read a short overlap next time; forget ids that fell out of it
+            self._since = started - timedelta(seconds=POLL_OVERLAP_SECONDS)
+            self._seen = {key: at for key, at in self._seen.items() if at >= self._since}
+
+
+class SharedCache:
+    """Two-tier read-through cache with cross-worker invalidation."""
+
+    def __init__(self, cache_type: str = 'memory', ttl: float = 300, max_entries: int = 4096,
+                 redis_url: Optional[str] = None, poll_seconds: float = 2.0):
+        self.cache_type = cache_type
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.poll_seconds = poll_seconds
+        self.local = LRUTTLCache(max_entries)
+        self.remote: Optional[RedisTier] = None
+        self.origin = None
+        self._bus = None
+        self._pid = None
+        self._start_lock = Lock()
+        self._stats_lock = Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._invalidations = {'local': 0, 'published': 0, 'received': 0}
+        # namespace -> generation; loads started before an invalidation are not stored
+        self._generations: Dict[str, int] = {}
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def _ensure_started(self):
+        """Connect the tiers once per process (again after a fork)."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.local.clear()
+            self.origin = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+            self.remote, self._bus = None, None
+            client = self._redis_client() if self.cache_type == 'redis' else None
+            if client is not None:
+                self.remote = RedisTier(client)
+                self._bus = _RedisBus(client, self._on_remote_invalidation)
+            elif self.poll_seconds and self.poll_seconds > 0:
+                collection = _invalidations_collection()
+                if collection is not None:
+                    self._bus = _MongoBus(collection, self.poll_seconds, self._on_remote_invalidation)
+            self._pid = os.getpid()
+
+    def _redis_client(self):
+        try:
+            import redis
+        except ImportError:
+            logger.warning("cache.type is 'redis' but the redis package is not installed; using the memory tier")
+            return None
+        if not self.redis_url:
+            logger.warning("cache.type is 'redis' but cache.redis_url is not set; using the memory tier")
+            return None
+        return redis.Redis.from_url(self.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+    # --- reads ---------------------------------------------------------------
+
+    def _count(self, namespace: str, name: str):
+        with self._stats_lock:
+            counters = self._stats.setdefault(namespace, {'hits': 0, 'remote_hits': 0, 'misses': 0})
+            counters[name] += 1
+
+    def get_or_load(self, namespace: str, key: Any, loader: Callable[[], Any], ttl: Optional[float] = None):
+        """Return the cached value for (namespace, key), calling `loader` on a miss.
+
+        `None` results are cached too; exceptions from `loader` are not.
+        """
+        self._ensure_started()
+        key = _cache_key(key)
+        value = self.local.get(namespace, key)
+        if value is not _MISSING:
+            self._count(namespace, 'hits')
+            return copy.deepcopy(value)
+
+        ttl = ttl or self.ttl
+        if self.remote is not None:
+            try:
+                value = self.remote.get(namespace, key)
+            except Exception as e:
+                logger.debug(f"Cache tier read failed for {namespace}:{key}: {e}")
+                value = _MISSING
+            if value is not _MISSING:
+                self._count(namespace, 'remote_hits')
+                self.local.set(namespace, key, copy.deepcopy(value), ttl)
+                return value
+
+        self._count(namespace, 'misses')
+        generation = self._generations.get(namespace, 0)
+        value = loader()
+        if self._generations.get(namespace, 0) == generation:
+            self.local.set(namespace, key, copy.deepcopy(value), ttl)
+            if self.remote is not None:
+                try:
+                    self.remote.set(namespace, key, value, ttl)
+                except Exception as e:
+                    logger.debug(f"Cache tier write failed for {namespace}:{key}: {e}")
+        return value
+
+    # --- invalidation --------------------------------------------------------
+
+    def _drop(self, namespace: str, key: Optional[str]):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        self.local.delete(namespace, key)
+
+    def invalidate(self, namespace: str, key: Any = None, publish: bool = True):
+        """Drop `key` (or the whole namespace) here, in the shared tier and in the other workers."""
+        self._ensure_started()
+        key = None if key is None else _cache_key(key)
+        self._drop(namespace, key)
+        with self._stats_lock:
+            self._invalidations['local'] += 1
+        if self.remote is not None:
+            try:
+                self.remote.delete(namespace, key)
+            except Exception as e:
+                logger.warning(f"Cache tier invalidation failed for {namespace}:{key}: {e}")
+        if publish and self._bus is not None:
+            payload = {'origin': self.origin, 'namespace': namespace, 'key': key}
+            from fin_server.utils.threading_util import submit_task
+            try:
+                submit_task(self._publish, payload)
+            except RuntimeError:
+                self._publish(payload)
+
+    def _publish(self, payload: Dict[str, Any]):
+        try:
+            self._bus.publish(payload)
+            with self._stats_lock:
+                self._invalidations['published'] += 1
+        except Exception as e:
+            logger.warning(f"Could not publish cache invalidation {payload}: {e}")
+
+    def _on_remote_invalidation(self, payload: Dict[str, Any]):
+        if payload.get('origin') == self.origin or not payload.get('namespace'):
+            return
+        self._drop(payload['namespace'], payload.get('key'))
+        with self._stats_lock:
+            self._invalidations['received'] += 1
+
+    # --- reporting -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            namespaces = {}
+            for namespace, counters in self._stats.items():
+                lookups = counters['hits'] + counters['remote_hits'] + counters['misses']
+                namespaces[namespace] = dict(counters, hit_rate=round(
+                    (counters['hits'] + counters['remote_hits']) / lookups, 4) if lookups else 0.0)
+            invalidations = dict(self._invalidations)
+        return {
+            'type': 'redis' if self.remote is not None else 'memory',
+            'size': len(self.local),
+            'max_entries': self.local.max_entries,
+            'evictions': self.local.evictions,
+            'invalidations': invalidations,
+            'namespaces': namespaces,
+        }
+
+
+def _invalidations_collection():
+    from fin_server.repository.mongo_helper import MongoRepo
+    db = getattr(MongoRepo.get_instance(), 'user_db', None)
+    return db[INVALIDATIONS_COLLECTION] if db is not None else None
+
+
+_cache: Optional[SharedCache] = None
+_cache_lock = Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Return the process-wide cache (registered under `cache` in /metrics), or None when disabled."""
+    global _cache
+    if not config.CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SharedCache(cache_type=config.CACHE_TYPE, ttl=config.CACHE_TTL_SECONDS,
+                                     max_entries=config.CACHE_MAX_ENTRIES, redis_url=config.CACHE_REDIS_URL,
+                                     poll_seconds=config.CACHE_INVALIDATION_POLL_SECONDS)
+                metrics_collector.register_provider('cache', _cache.stats)
+    return _cache
+
+
+def read_through(namespace: str, key: Any, loader: Callable[[], Any], ttl: Optional[float] = None):
+    """`loader()` read through the shared cache (called directly when the cache is disabled)."""
+    cache = get_shared_cache()
+    if cache is None:
+        return loader()
+    return cache.get_or_load(namespace, key, loader, ttl=ttl)
+
+
+# --- write detection ---------------------------------------------------------
+
+def _written_keys(command_name: str, command: Dict[str, Any], key_field: Optional[str]):
+    """Keys of `key_field` touched by a write command, or None when it cannot be narrowed."""
+    if key_field is None:
+        return None
+    if command_name == 'insert':
+        values = [doc.get(key_field) for doc in command.get('documents') or []]
+    elif command_name == 'findAndModify':
+        values = [(command.get('query') or {}).get(key_field)]
+        update = command.get('update')
+        if isinstance(update, dict):
+            values.append((update.get('$set') or update).get(key_field, values[0]))
+    else:
+        statements = command.get('updates' if command_name == 'update' else 'deletes') or []
+        values = []
+        for statement in statements:
+            values.append((statement.get('q') or {}).get(key_field))
+            update = statement.get('u')
+            if isinstance(update, dict):
+                # a write that changes the key also invalidates the new value (it may be cached as missing)
+                values.append((update.get('$set') or update).get(key_field, values[-1]))
+    if not values or not all(_scalar(value) for value in values):
+        return None
+    return list({_cache_key(value): value for value in values}.values())
+
+
+class CacheInvalidationListener(monitoring.CommandListener):
+    """Invalidate cached entries of registered collections after writes to them."""
+
+    def __init__(self):
+        self._pending: Dict[int, tuple] = {}
+
+    def started(self, event):
+        if event.command_name not in WRITE_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        namespace = f'{event.database_name}.{collection}'
+        if not isinstance(collection, str) or namespace not in _registered:
+            return
+        keys = _written_keys(event.command_name, event.command, _registered[namespace])
+        self._pending[event.request_id] = (namespace, keys)
+
+    def succeeded(self, event):
+        self._invalidate(event)
+
+    def failed(self, event):
+        # a failed multi-document write may still have applied part of it
+        self._invalidate(event)
+
+    def _invalidate(self, event):
+        pending = self._pending.pop(event.request_id, None)
+        cache = get_shared_cache() if pending is not None else None
+        if cache is None:
+            return
+        namespace, keys = pending
+        try:
+            if keys is None:
+                cache.invalidate(namespace)
+            else:
+                for key in keys:
+                    cache.invalidate(namespace, key)
+        except Exception as e:
+            logger.warning(f"Cache invalidation for {namespace} failed: {e}")
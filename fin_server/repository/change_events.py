@@ -0,0 +1,444 @@
+"""In-process event bus fed by MongoDB change streams.
+
+Background workers subscribe to the collections they care about instead of
+re-querying them on a timer:
+
+    from fin_server.repository.change_events import subscribe
+    subscribe('notification_queue', on_queued, operations=('insert',))
+
+Sources (`events.mode`):
+- change_stream: one change stream per database, filtered to the subscribed
+  collections, with `full_document='updateLookup'` so inserts, updates and
+  replaces carry the current document;
+- poll: each subscribed collection is queried every `events.poll_seconds` for
+  documents whose ObjectId `_id` is newer than the last poll. Only inserts are
+  seen this way; subscribers that also need updates or deletes must tolerate
+  that (see TaskScheduler);
+- auto (default): change streams, falling back to polling when the server does
+  not support them (standalone mongod, mongomock).
+
+Resume tokens (and the poll position) are stored per database in
+`user_db.change_stream_tokens` under `events.consumer`, at most once per
+`CHECKPOINT_SECONDS` and after every stream restart, so a restarted worker
+resumes where it stopped. Delivery is at least once: events after the last
+checkpoint are replayed after a crash, so handlers must be idempotent. When the
+server no longer has the resume point in its oplog the loss is logged and the
+stream restarts from now.
+
+Handlers run on the watcher thread of their database, in event order; they
+should be quick and hand slow work to the shared pool. Exceptions are logged
+and do not stop the stream. Counters are exposed on GET /metrics under
+`event_bus`.
+
+The bus only runs once `start()` is called (server.py does); subscriptions
+made before are attached then.
+
+API:
+- get_event_bus() -> ChangeEventBus
+- subscribe(name, handler, operations=None) -> bool
+- ChangeEventBus.start() / stop() / is_streaming(name)
+- ChangeEvent(operation, database, collection, document_key, document, updated_fields, removed_fields)
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure, PyMongoError
+
+from config import config
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+TOKENS_COLLECTION = 'change_stream_tokens'
+OPERATIONS = ('insert', 'update', 'replace', 'delete')
+STREAMING, POLLING = 'change_stream', 'poll'
+# Seconds between resume token writes while events keep arriving
+CHECKPOINT_SECONDS = 1.0
+# Longest a stream waits for an event before checking for stop / new subscriptions
+MAX_AWAIT_MS = 1000
+# Overlap between polls, absorbs clock skew between the writers' ObjectIds
+POLL_OVERLAP_SECONDS = 5
+RETRY_SECONDS = (1, 2, 5, 10, 30)
+
+# Server errors meaning change streams are not available (standalone server, old version)
+UNSUPPORTED_CODES = {40573, 40324, 115}
+# Server errors meaning the resume point is no longer in the oplog
+HISTORY_LOST_CODES = {260, 280, 286}
+
+
+class ChangeEvent:
+    """One insert / update / replace / delete on a subscribed collection."""
+
+    __slots__ = ('operation', 'database', 'collection', 'document_key', 'document',
+                 'updated_fields', 'removed_fields')
+
+    def __init__(self, operation: str, database: str, collection: str, document_key: Dict[str, Any],
+                 document: Optional[Dict[str, Any]] = None, updated_fields: Optional[Dict[str, Any]] = None,
+                 removed_fields: Optional[List[str]] = None):
+        self.operation = operation
+        self.database = database
+        self.collection = collection
+        self.document_key = document_key or {}
+        # current document; None for deletes and for updates of since-deleted documents
+        self.document = document
+        self.updated_fields = updated_fields or {}
+        self.removed_fields = removed_fields or []
+
+    @property
+    def id(self):
+        return self.document_key.get('_id')
+
+    def get(self, field: str, default=None):
+        """Field of the current document (default when there is none)."""
+        return (self.document or {}).get(field, default)
+
+    @classmethod
+    def from_change(cls, change: Dict[str, Any]) -> 'ChangeEvent':
+        ns = change.get('ns') or {}
+        description = change.get('updateDescription') or {}
+        return cls(change.get('operationType'), ns.get('db'), ns.get('coll'), change.get('documentKey'),
+                   document=change.get('fullDocument'),
+                   updated_fields=description.get('updatedFields'),
+                   removed_fields=description.get('removedFields'))
+
+    def __repr__(self):
+        return f'ChangeEvent({self.operation} {self.database}.{self.collection} {self.id!r})'
+
+
+class _Unsupported(Exception):
+    """Change streams are not available on this server."""
+
+
+class _TokenStore:
+    """Resume tokens / poll positions, one document per consumer and database."""
+
+    def __init__(self, collection, consumer: str):
+        self._collection = collection
+        self._consumer = consumer
+
+    def _key(self, database: str) -> str:
+        return f'{self._consumer}:{database}'
+
+    def load(self, database: str) -> Dict[str, Any]:
+        if self._collection is None:
+            return {}
+        try:
+            return self._collection.find_one({'_id': self._key(database)}) or {}
+        except PyMongoError as e:
+            logger.warning(f"Could not load change stream position for {database}: {e}")
+            return {}
+
+    def save(self, database: str, fields: Dict[str, Any]):
+        if self._collection is None:
+            return
+        try:
+            self._collection.update_one(
+                {'_id': self._key(database)},
+                {'$set': dict(fields, updated_at=datetime.now(timezone.utc))},
+                upsert=True)
+        except PyMongoError as e:
+            logger.warning(f"Could not store change stream position for {database}: {e}")
+
+
+class _DatabaseWatcher:
+    """Thread feeding the events of one database to the bus."""
+
+    def __init__(self, bus: 'ChangeEventBus', database):
+        self.bus = bus
+        self.database = database
+        self.name = database.name
+        self.mode = POLLING if bus.mode == POLLING else STREAMING
+        # a change stream is open right now
+        self.live = False
+        self.thread = threading.Thread(target=self._run, name=f'change-events-{self.name}', daemon=True)
+
+    @property
+    def streaming(self) -> bool:
+        return self.mode == STREAMING and self.live and self.thread.is_alive()
+
+    def _run(self):
+        failures = 0
+        while not self.bus._stop.is_set():
+            generation, collections = self.bus._generation, self.bus._collections(self.name)
+            try:
+                if self.mode == STREAMING:
+                    self._watch(collections, generation)
+                else:
+                    self._poll(collections, generation)
+                failures = 0
+            except _Unsupported as e:
+                if self.bus.mode == STREAMING:
+                    failures += 1
+                    self._backoff(failures, e)
+                    continue
+                logger.info(f"Change streams unavailable on {self.name} ({e}); polling every "
+                            f"{self.bus.poll_seconds}s instead")
+                self.mode = POLLING
+            except OperationFailure as e:
+                if e.code in HISTORY_LOST_CODES:
+                    logger.error(f"Change stream for {self.name} cannot resume (oplog rolled over); "
+                                 f"events since the last checkpoint are lost, restarting from now")
+                    self.bus._tokens.save(self.name, {'token': None})
+                    self.bus._count('history_lost')
+                    continue
+                failures += 1
+                self._backoff(failures, e)
+            except Exception as e:
+                failures += 1
+                self._backoff(failures, e)
+
+    def _backoff(self, failures: int, error: Exception):
+        delay = RETRY_SECONDS[min(failures, len(RETRY_SECONDS)) - 1]
+        logger.warning(f"Change events for {self.name} interrupted ({error}); retrying in {delay}s")
+        self.bus._count('restarts')
+        self.bus._stop.wait(delay)
+
+    def _current(self, generation: int) -> bool:
+        return not self.bus._stop.is_set() and self.bus._generation == generation
+
+    # --- change streams ------------------------------------------------------
+
+    def _watch(self, collections: Dict[str, Collection], generation: int):
+        if not collections:
+            self.bus._stop.wait(MAX_AWAIT_MS / 1000)
+            return
+        pipeline = [{'$match': {'ns.coll': {'$in': sorted(collections)}, 'operationType': {'$in': list(OPERATIONS)}}}]
+        token = self.bus._tokens.load(self.name).get('token')
+        # looked up on the class: attribute access on a database returns a collection
+        if not callable(getattr(type(self.database), 'watch', None)):
+            raise _Unsupported('driver has no change streams')
+        try:
+            stream = self.database.watch(pipeline, full_document='updateLookup', resume_after=token,
+                                         max_await_time_ms=MAX_AWAIT_MS)
+        except NotImplementedError as e:
+            raise _Unsupported(e)
+        except OperationFailure as e:
+            if e.code in UNSUPPORTED_CODES:
+                raise _Unsupported(e)
+            raise
+
+        self.live = True
+        try:
+            self._consume(stream, generation, token)
+        finally:
+            self.live = False
+
+    def _consume(self, stream, generation: int, saved):
+        saved_at = time.monotonic()
+        with stream:
+            while stream.alive and self._current(generation):
+                change = stream.try_next()
+                if change is not None:
+                    self.bus._dispatch(ChangeEvent.from_change(change))
+                token = stream.resume_token
+                if token is not None and token != saved and time.monotonic() - saved_at >= CHECKPOINT_SECONDS:
+                    self.bus._tokens.save(self.name, {'token': token})
+                    saved, saved_at = token, time.monotonic()
+            token = stream.resume_token
+            if token is not None and token != saved:
+                self.bus._tokens.save(self.name, {'token': token})
+
+    # --- polling fallback ----------------------------------------------------
+
+    def _poll(self, collections: Dict[str, Collection], generation: int):
+        stored = self.bus._tokens.load(self.name).get('poll') or {}
+        now = datetime.now(timezone.utc)
+        since = {}
+        for name in collections:
+            at = stored.get(name)
+            if isinstance(at, datetime):
+                at = at if at.tzinfo else at.replace(tzinfo=timezone.utc)
+            since[name] = at or now
+        seen: Dict[Any, datetime] = {}
+        while self._current(generation):
+            started = datetime.now(timezone.utc)
+            for name, collection in collections.items():
+                cursor = collection.find({'_id': {'$gte': ObjectId.from_datetime(since[name])}}).sort('_id', 1)
+                for doc in cursor:
+                    if doc['_id'] in seen:
+                        continue
+                    seen[doc['_id']] = started
+                    self.bus._dispatch(ChangeEvent('insert', self.name, name, {'_id': doc['_id']}, document=doc))
+                # re-read a short overlap next time; forget ids that fell out of it
+                since[name] = started - timedelta(seconds=POLL_OVERLAP_SECONDS)
+            horizon = min(since.values(), default=started)
+            seen = {key: at for key, at in seen.items() if at >= horizon}
+            self.bus._tokens.save(self.name, {'poll': dict(since)})
+            self.bus._stop.wait(self.bus.poll_seconds)
+
+
+class ChangeEventBus:
+    """Dispatch collection changes to subscribed handlers."""
+
+    def __init__(self, mode: str = 'auto', poll_seconds: float = 2.0, consumer: str = 'default'):
+        self.mode = mode if mode in (STREAMING, POLLING) else 'auto'
+        self.poll_seconds = max(0.1, float(poll_seconds or 2.0))
+        self.consumer = consumer
+        self._lock = Lock()
+        # (repository name, handler, operations) in subscription order
+        self._subscriptions: List[Tuple[str, Callable[[ChangeEvent], Any], Optional[frozenset]]] = []
+        # (database, collection) -> [(handler, operations)]
+        self._handlers: Dict[Tuple[str, str], List[Tuple[Callable[[ChangeEvent], Any], Optional[frozenset]]]] = {}
+        # database -> {collection name: Collection}
+        self._watched: Dict[str, Dict[str, Collection]] = {}
+        self._databases: Dict[str, Any] = {}
+        self._watchers: Dict[str, _DatabaseWatcher] = {}
+        self._generation = 0
+        self._started = False
+        self._pid = None
+        self._stop = threading.Event()
+        self._tokens = _TokenStore(None, consumer)
+        self._stats_lock = Lock()
+        self._stats = {'events': 0, 'handler_errors': 0, 'restarts': 0, 'history_lost': 0}
+
+    # --- subscriptions -------------------------------------------------------
+
+    def subscribe(self, name: str, handler: Callable[[ChangeEvent], Any],
+                  operations: Optional[Iterable[str]] = None) -> bool:
+        """Call `handler(event)` for changes to the collection behind repository `name`.
+
+        Before `start()` the subscription is only recorded, so importing
+        subscribers does not create repositories.
+
+        Args:
+            name: Repository name as accepted by `get_collection` ('task', 'pond', ...)
+            handler: Callable receiving a ChangeEvent
+            operations: Subset of insert / update / replace / delete (default all)
+
+        Returns:
+            False when the bus is running and the repository has no collection.
+        """
+        ops = frozenset(operations) if operations else None
+        with self._lock:
+            self._subscriptions.append((name, handler, ops))
+            if not (self._started and self._pid == os.getpid()):
+                return True
+        return self._attach(name, handler, ops)
+
+    def _attach(self, name: str, handler, ops) -> bool:
+        collection = _resolve(name)
+        if collection is None:
+            logger.warning(f"Cannot subscribe to change events of '{name}': no such collection")
+            return False
+        database = collection.database
+        with self._lock:
+            self._handlers.setdefault((database.name, collection.name), []).append((handler, ops))
+            self._watched.setdefault(database.name, {})[collection.name] = collection
+            self._databases[database.name] = database
+            self._generation += 1
+            if self._started:
+                self._ensure_watchers()
+        return True
+
+    def _collections(self, database: str) -> Dict[str, Collection]:
+        with self._lock:
+            return dict(self._watched.get(database, {}))
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def start(self):
+        """Start one watcher per subscribed database (again after a fork)."""
+        with self._lock:
+            if self._started and self._pid == os.getpid():
+                return
+            self._started = True
+            self._pid = os.getpid()
+            self._handlers, self._watched, self._databases, self._watchers = {}, {}, {}, {}
+            self._stop.clear()
+            subscriptions = list(self._subscriptions)
+        self._tokens = _TokenStore(_tokens_collection(), self.consumer)
+        for name, handler, ops in subscriptions:
+            self._attach(name, handler, ops)
+
+    def _ensure_watchers(self):
+        for name, database in self._databases.items():
+            if name not in self._watchers:
+                watcher = self._watchers[name] = _DatabaseWatcher(self, database)
+                watcher.thread.start()
+                logger.debug(f"Change events: watching {name} ({', '.join(sorted(self._watched[name]))})")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        with self._lock:
+            watchers, self._watchers, self._started = list(self._watchers.values()), {}, False
+        for watcher in watchers:
+            watcher.thread.join(timeout)
+
+    def is_streaming(self, name: str) -> bool:
+        """True when changes to repository `name` currently arrive from a change stream (not polling)."""
+        collection = _resolve(name)
+        if collection is None or self._pid != os.getpid():
+            return False
+        watcher = self._watchers.get(collection.database.name)
+        return watcher is not None and watcher.streaming and collection.name in self._collections(watcher.name)
+
+    # --- dispatch ------------------------------------------------------------
+
+    def _dispatch(self, event: ChangeEvent):
+        self._count('events')
+        with self._lock:
+            handlers = list(self._handlers.get((event.database, event.collection), ()))
+        for handler, operations in handlers:
+            if operations is not None and event.operation not in operations:
+                continue
+            try:
+                handler(event)
+            except Exception:
+                self._count('handler_errors')
+                logger.exception(f"Change event handler {getattr(handler, '__qualname__', handler)} failed for {event!r}")
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        with self._lock:
+            stats['databases'] = {name: watcher.mode for name, watcher in self._watchers.items()}
+            stats['subscriptions'] = sum(len(handlers) for handlers in self._handlers.values())
+        stats['running'] = self._started and self._pid == os.getpid()
+        return stats
+
+
+def _resolve(name: str) -> Optional[Collection]:
+    from fin_server.repository.mongo_helper import get_collection
+    repo = get_collection(name)
+    collection = repo if isinstance(repo, Collection) else getattr(repo, 'collection', None)
+    return collection if collection is not None and hasattr(collection, 'database') else None
+
+
+def _tokens_collection():
+    from fin_server.repository.mongo_helper import MongoRepo
+    db = getattr(MongoRepo.get_instance(), 'user_db', None)
+    return db[TOKENS_COLLECTION] if db is not None else None
+
+
+_bus: Optional[ChangeEventBus] = None
+_bus_lock = Lock()
+
+
+def get_event_bus() -> ChangeEventBus:
+    """Return the process-wide bus (registered under `event_bus` in /metrics)."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = ChangeEventBus(mode=config.EVENT_BUS_MODE, poll_seconds=config.EVENT_BUS_POLL_SECONDS,
+                                      consumer=config.EVENT_BUS_CONSUMER)
+    return _bus
+
+
+def subscribe(name: str, handler: Callable[[ChangeEvent], Any], operations: Optional[Iterable[str]] = None) -> bool:
+    """Subscribe `handler` on the process-wide bus (see ChangeEventBus.subscribe)."""
+    return get_event_bus().subscribe(name, handler, operations=operations)
+
+
+metrics_collector.register_provider('event_bus', lambda: get_event_bus().stats())
@@ -0,0 +1,244 @@
+"""Per-process MongoClient management.
+
+A MongoClient must not be shared across `os.fork()` (gunicorn prefork with
+--preload, multiprocessing): its pools, monitor threads and sessions belong to
+the process that opened them. `client_manager` gives every process its own
+client:
+
+- `get_client()` creates the process's client on first use, with
+  `connect=False`, so a pre-fork master that never queries opens no sockets or
+  monitor threads;
+- after a fork the child drops the parent's client (without closing it, which
+  would end the parent's server sessions), creates its own and rebinds the
+  MongoClient / Database / Collection attributes of every tracked holder
+  (MongoRepo, repositories and the objects they reference), keeping their read
+  preference, read/write concern and codec options. Module-level references to
+  repositories therefore stay valid in the child;
+- each worker's pool is sized `database.pool.budget / WEB_CONCURRENCY` when a
+  budget is set (else `database.pool.max_size`), so N workers do not open N
+  times the intended connections.
+
+Pool counters for the current process (pid, forks, per server: open / in-use
+connections, checkouts, failures, wait time) are exposed on GET /metrics under
+`mongo_pool`.
+
+API:
+- client_manager.get_client() -> MongoClient or None when it cannot be created
+- client_manager.track(holder)
+- PoolStatsListener (registered by `create_mongo_client`)
+"""
+import logging
+import os
+import threading
+import weakref
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from pymongo import MongoClient, monitoring
+from pymongo.collection import Collection
+from pymongo.database import Database
+
+from config import config
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# Objects defined in these packages are followed when rebinding after a fork
+_REBIND_PACKAGES = ('fin_server.',)
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters per server address for the current process."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._servers: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self):
+        with self._lock:
+            self._servers = {}
+
+    def _server(self, address) -> Dict[str, Any]:
+        key = '%s:%s' % address if isinstance(address, tuple) else str(address)
+        server = self._servers.get(key)
+        if server is None:
+            server = self._servers[key] = {'open': 0, 'in_use': 0, 'created': 0, 'closed': 0, 'checkouts': 0,
+                                           'checkout_failed': 0, 'cleared': 0, 'wait_ms_total': 0.0}
+        return server
+
+    def _update(self, event, **deltas):
+        with self._lock:
+            server = self._server(event.address)
+            for name, delta in deltas.items():
+                server[name] += delta
+
+    def pool_created(self, event):
+        with self._lock:
+            self._server(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event, open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event, open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._update(event, checkout_failed=1)
+
+    def connection_checked_out(self, event):
+        # `duration` (seconds spent waiting) is reported by pymongo >= 4.7
+        self._update(event, in_use=1, checkouts=1, wait_ms_total=(getattr(event, 'duration', 0) or 0) * 1000)
+
+    def connection_checked_in(self, event):
+        self._update(event, in_use=-1)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            servers = {key: dict(values) for key, values in self._servers.items()}
+        for values in servers.values():
+            checkouts = values['checkouts']
+            values['avg_wait_ms'] = round(values.pop('wait_ms_total') / checkouts, 3) if checkouts else 0.0
+        return servers
+
+
+class MongoClientManager:
+    """Owns the MongoClient of the current process."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._client: Optional[MongoClient] = None
+        self._pid: Optional[int] = None
+        # the parent's client after a fork; kept referenced, never used or closed
+        self._inherited: Optional[MongoClient] = None
+        self._holders = weakref.WeakSet()
+        self._strong_holders = []
+        self.pool_listener = PoolStatsListener()
+        self.forks = 0
+        self.clients_created = 0
+
+    def get_client(self) -> Optional[MongoClient]:
+        """Return this process's client, creating it on first use."""
+        if self._client is not None and self._pid == os.getpid():
+            return self._client
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                from fin_server.repository.mongo_helper import create_mongo_client
+                try:
+                    self._client = create_mongo_client(config.MONGO_URI, verify=False, connect=False)
+                except Exception as e:
+                    logger.error(f"Failed to initialize MongoDB client: {e}")
+                    self._client = None
+                self._pid = os.getpid()
+                if self._client is not None:
+                    self.clients_created += 1
+            return self._client
+
+    def track(self, holder):
+        """Rebind `holder`'s client / database / collection attributes after a fork.
+
+        Classes are kept strongly (their attributes are process-wide state);
+        instances are held weakly.
+        """
+        with self._lock:
+            if isinstance(holder, type):
+                if holder not in self._strong_holders:
+                    self._strong_holders.append(holder)
+            else:
+                self._holders.add(holder)
+
+    # --- fork handling -------------------------------------------------------
+
+    def _after_fork_in_child(self):
+        inherited, self._client, self._pid = self._client, None, None
+        self._lock = threading.RLock()
+        self.pool_listener.reset()
+        if inherited is None:
+            return
+        self.forks += 1
+        self._inherited = inherited
+        client = self.get_client()
+        if client is None:
+            return
+        seen = set()
+        for holder in list(self._strong_holders) + list(self._holders):
+            self._rebind_holder(holder, inherited, client, seen)
+
+    def _rebind_holder(self, holder, old: MongoClient, new: MongoClient, seen: set):
+        if id(holder) in seen:
+            return
+        seen.add(id(holder))
+        try:
+            attributes = list(vars(holder).items())
+        except TypeError:
+            return
+        for name, value in attributes:
+            rebound = self._rebind_value(value, old, new, seen)
+            if rebound is not value:
+                setattr(holder, name, rebound)
+
+    def _rebind_value(self, value, old: MongoClient, new: MongoClient, seen: set):
+        if isinstance(value, MongoClient):
+            return new if value is old else value
+        if isinstance(value, Database):
+            return _database(new, value) if value.client is old else value
+        if isinstance(value, Collection):
+            return _collection(new, value) if value.database.client is old else value
+        if isinstance(value, dict):
+            for key, item in list(value.items()):
+                rebound = self._rebind_value(item, old, new, seen)
+                if rebound is not item:
+                    value[key] = rebound
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                rebound = self._rebind_value(item, old, new, seen)
+                if rebound is not item:
+                    value[index] = rebound
+        elif not isinstance(value, type) and type(value).__module__.startswith(_REBIND_PACKAGES):
+            self._rebind_holder(value, old, new, seen)
+        return value
+
+    # --- metrics -------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'forks': self.forks,
+            'clients_created': self.clients_created,
+            'connected': self._client is not None and self._pid == os.getpid(),
+            'max_pool_size': config.MONGO_WORKER_POOL_SIZE,
+            'servers': self.pool_listener.snapshot(),
+        }
+
+
+def _database(client: MongoClient, db: Database) -> Database:
+    return client.get_database(db.name, codec_options=db.codec_options, read_preference=db.read_preference,
+                               write_concern=db.write_concern, read_concern=db.read_concern)
+
+
+def _collection(client: MongoClient, coll: Collection) -> Collection:
+    return client[coll.database.name].get_collection(
+        coll.name, codec_options=coll.codec_options, read_preference=coll.read_preference,
+        write_concern=coll.write_concern, read_concern=coll.read_concern)
+
+
+client_manager = MongoClientManager()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=client_manager._after_fork_in_child)
+
+metrics_collector.register_provider('mongo_pool', client_manager.stats)
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
 from pymongo.synchronous.database import Database
 
 from fin_server.repository.base_repository import BaseRepository
@@ -7,6 +8,11 @@ from fin_server.repository.base_repository import BaseRepository
 
 class ApprovalsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
+
+    INDEXES = [
+        IndexModel([('ref_type', 1), ('ref_id', 1)], name='approvals_ref', background=True),
+    ]
 
     def __new__(cls, db, collection_name="approvals"):
         if cls._instance is None:
@@ -19,10 +25,6 @@ class ApprovalsRepository(BaseRepository):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
             self.coll = self.collection
-            try:
-                self.collection.create_index([('ref_type', 1), ('ref_id', 1)], name='approvals_ref')
-            except Exception:
-                pass
             self._initialized = True
 
     def create(self, doc):
@@ -1,10 +1,18 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class BankAccountsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
+
+    INDEXES = [
+        IndexModel([('external_id', 1)], name='bank_ext', background=True),
+    ]
 
     def __new__(cls, db, collection_name="bank_accounts"):
         if cls._instance is None:
@@ -17,10 +25,6 @@ class BankAccountsRepository(BaseRepository):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
             self.coll = self.collection
-            try:
-                self.collection.create_index([('external_id', 1)], unique=False, name='bank_ext')
-            except Exception:
-                pass
             print(f"Initializing {self.collection_name} collection")
             self._initialized = True
 
@@ -29,8 +33,8 @@ class BankAccountsRepository(BaseRepository):
         doc.setdefault('created_at', datetime.now(timezone.utc))
         return self.collection.insert_one(doc)
 
-    def find_one(self, q):
-        return self.collection.find_one(q)
+    def find_one(self, q, fields=None):
+        return self.collection.find_one(q, projection(fields))
 
     def get_by_account_key(self, account_key: str):
         try:
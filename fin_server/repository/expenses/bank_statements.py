@@ -1,10 +1,15 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
+from fin_server.repository.bulk import BulkWriter
 
 
 class BankStatementsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
 
     def __new__(cls, db, collection_name="bank_statements"):
         if cls._instance is None:
@@ -24,30 +29,40 @@ class BankStatementsRepository(BaseRepository):
         doc.setdefault('imported_at', datetime.now(timezone.utc))
         return self.collection.insert_one(doc)
 
-    def find_one(self, q):
-        return self.collection.find_one(q)
+    def find_one(self, q, fields=None):
+        return self.collection.find_one(q, projection(fields))
 
 
 class StatementLinesRepository:
+    INDEXES = [
+        IndexModel([('bank_account_id', 1), ('created_at', 1)], name='stmt_bank_date', background=True),
+    ]
+
     def __init__(self, db):
         # Keep a reference to the DB and coll so we can update bank_accounts too
         self.db = db
         self.coll = db['statement_lines']
-        try:
-            self.coll.create_index([('bank_account_id', 1), ('created_at', 1)], name='stmt_bank_date')
-        except Exception:
-            pass
 
-    def insert_many(self, lines):
+    def index_specs(self):
+        return [(self.coll, self.INDEXES, [])]
+
+    def insert_many(self, lines, ordered=False):
+        """Insert statement lines in bulk batches.
+
+        Unordered by default, so one bad line does not stop the others; returns
+        the BulkWriteReport (per-line errors in `.errors`).
+        """
         if not lines:
             return None
         now = datetime.now(timezone.utc)
-        for l in lines:
-            l.setdefault('created_at', now)
-        return self.coll.insert_many(lines)
-
-    def find(self, q=None, limit=100):
-        return list(self.coll.find(q or {}).limit(limit))
+        with BulkWriter(self.coll, ordered=ordered) as writer:
+            for l in lines:
+                l.setdefault('created_at', now)
+                writer.insert_one(l)
+        return writer.result
+
+    def find(self, q=None, limit=100, fields=None):
+        return list(self.coll.find(q or {}, projection(fields)).limit(limit))
 
     def append_line(self, bank_account_id, amount: float, currency: str = 'INR', direction: str = 'out', reference: dict = None, transaction_id: any = None, created_at=None):
         """Append a statement line (passbook entry) for the given bank account.
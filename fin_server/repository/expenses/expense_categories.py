@@ -13,6 +13,8 @@ import json
 import os
 from functools import lru_cache
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
 
 
@@ -137,6 +139,11 @@ class ExpenseCategoryRepository(BaseRepository):
     """
     _instance = None
 
+    INDEXES = [
+        IndexModel([('account_key', 1), ('path', 1)], name='category_account_path', unique=True, background=True),
+        IndexModel([('account_key', 1), ('name', 1)], name='category_account_name', background=True),
+    ]
+
     def __new__(cls, db=None, collection_name="expense_categories"):
         if cls._instance is None:
             cls._instance = super(ExpenseCategoryRepository, cls).__new__(cls)
@@ -148,11 +155,6 @@ class ExpenseCategoryRepository(BaseRepository):
             if db is not None:
                 super().__init__(db=db, collection_name=collection_name)
                 self.collection_name = collection_name
-                try:
-                    self.collection.create_index([('account_key', 1), ('path', 1)], name='category_account_path', unique=True)
-                    self.collection.create_index([('account_key', 1), ('name', 1)], name='category_account_name')
-                except Exception:
-                    pass
             self._initialized = True
 
     def get_catalog(self) -> Dict[str, Any]:
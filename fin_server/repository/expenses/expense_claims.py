@@ -1,10 +1,17 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
 
 
 class ExpenseClaimsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
+
+    INDEXES = [
+        IndexModel([('claimant_id', 1), ('status', 1)], name='claims_claimant_status', background=True),
+    ]
 
     def __new__(cls, db, collection_name="expense_claims"):
         if cls._instance is None:
@@ -17,10 +24,6 @@ class ExpenseClaimsRepository(BaseRepository):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
             self.coll = self.collection
-            try:
-                self.collection.create_index([('claimant_id', 1), ('status', 1)], name='claims_claimant_status')
-            except Exception:
-                pass
             self._initialized = True
 
     def create(self, doc):
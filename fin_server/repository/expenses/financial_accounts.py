@@ -1,10 +1,18 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class FinancialAccountsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
+
+    INDEXES = [
+        IndexModel([('code', 1)], unique=True, name='fa_code', background=True),
+    ]
 
     def __new__(cls, db, collection_name="financial_accounts"):
         if cls._instance is None:
@@ -17,11 +25,6 @@ class FinancialAccountsRepository(BaseRepository):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
             self.coll = self.collection
-            # ensure indexes
-            try:
-                self.collection.create_index([('code', 1)], unique=True, name='fa_code')
-            except Exception:
-                pass
             print(f"Initializing {self.collection_name} collection")
             self._initialized = True
 
@@ -30,8 +33,8 @@ class FinancialAccountsRepository(BaseRepository):
         doc.setdefault('created_at', datetime.now(timezone.utc))
         return self.collection.insert_one(doc)
 
-    def find(self, q=None, limit=100):
-        return list(self.collection.find(q or {}).limit(limit))
+    def find(self, q=None, limit=100, fields=None):
+        return list(self.collection.find(q or {}, projection(fields)).limit(limit))
 
-    def find_one(self, q):
-        return self.collection.find_one(q)
+    def find_one(self, q, fields=None):
+        return self.collection.find_one(q, projection(fields))
@@ -1,10 +1,18 @@
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class PaymentsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
+
+    INDEXES = [
+        IndexModel([('payment_ref', 1)], name='payments_ref', background=True),
+    ]
 
     def __new__(cls, db, collection_name="payments"):
         if cls._instance is None:
@@ -17,10 +25,6 @@ class PaymentsRepository(BaseRepository):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
             self.coll = self.collection
-            try:
-                self.collection.create_index([('payment_ref', 1)], unique=False, name='payments_ref')
-            except Exception:
-                pass
             self._initialized = True
 
     def create_payment(self, payment_doc):
@@ -32,5 +36,5 @@ class PaymentsRepository(BaseRepository):
     def update(self, q, updates):
         return self.collection.update_one(q, {'$set': updates})
 
-    def find_one(self, q):
-        return self.collection.find_one(q)
+    def find_one(self, q, fields=None):
+        return self.collection.find_one(q, projection(fields))
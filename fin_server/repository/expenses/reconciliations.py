@@ -5,6 +5,7 @@ from fin_server.repository.base_repository import BaseRepository
 
 class ReconciliationsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
 
     def __new__(cls, db, collection_name="reconciliations"):
         if cls._instance is None:
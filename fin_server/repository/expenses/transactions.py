@@ -2,10 +2,12 @@ from bson.decimal128 import Decimal128
 from datetime import datetime, timezone
 
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class TransactionsRepository(BaseRepository):
     _instance = None
+    READ_PROFILE = 'ledger'
 
     def __new__(cls, db, collection_name="transactions"):
         if cls._instance is None:
@@ -56,8 +58,8 @@ class TransactionsRepository(BaseRepository):
         res = self.collection.insert_one(tx_doc)
         return res.inserted_id
 
-    def find(self, q=None, limit=100):
-        return list(self.collection.find(q or {}).limit(limit))
+    def find(self, q=None, limit=100, fields=None):
+        return list(self.collection.find(q or {}, projection(fields)).limit(limit))
 
-    def find_one(self, q):
-        return self.collection.find_one(q)
+    def find_one(self, q, fields=None):
+        return self.collection.find_one(q, projection(fields))
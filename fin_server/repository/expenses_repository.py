@@ -4,7 +4,8 @@ This file provides a class `ExpensesRepository` that wraps the lower-level colle
 repositories implemented in `repository/expenses/__init__.py` and offers domain
 operations such as create_expense, post_payment, create_transaction_for_payment, etc.
 """
-from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.base_repository import BaseRepository, find_page
+from fin_server.repository.projection import projection
 from fin_server.repository.expenses import (
     FinancialAccountsRepository, BankAccountsRepository, PaymentMethodsRepository,
     TransactionsRepository, PaymentsRepository, BankStatementsRepository, StatementLinesRepository,
@@ -13,8 +14,18 @@ from fin_server.repository.expenses import (
 )
 from datetime import datetime, timezone
 
+from pymongo import IndexModel
+
 
 class ExpensesRepository(BaseRepository):
+    # indexes on the `expenses` collection (this repository has no bound collection)
+    INDEXES = [
+        IndexModel([('account_key', 1), ('created_at', 1), ('category', 1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'expense_report', 'filter': {'account_key': 'A', 'created_at': {'$gte': 0}}},
+    ]
+
     def __init__(self, db):
         super().__init__(db)
         self.fin_accounts = FinancialAccountsRepository(db)
@@ -31,6 +42,14 @@ class ExpensesRepository(BaseRepository):
         self.audit_logs = AuditLogsRepository(db)
         self.db = db
 
+    def index_specs(self):
+        specs = [(self.db['expenses'], self.INDEXES, self.QUERY_SHAPES)]
+        for repo in (self.fin_accounts, self.bank_accounts, self.payment_methods, self.transactions,
+                     self.payments, self.bank_statements, self.statement_lines, self.reconciliations,
+                     self.expense_claims, self.approvals, self.settlement_batches, self.audit_logs):
+            specs.extend(repo.index_specs())
+        return specs
+
     # Expense CRUD: store flexible schema in `expenses` collection
     def create_expense(self, expense_doc):
         coll = self.db['expenses']
@@ -40,13 +59,21 @@ class ExpensesRepository(BaseRepository):
         res = coll.insert_one(doc)
         return res.inserted_id
 
-    def find_expenses(self, query=None, limit=100):
+    def find_expenses(self, query=None, limit=100, fields=None):
+        return list(self.iter_expenses(query, limit=limit, fields=fields))
+
+    def iter_expenses(self, query=None, limit=100, fields=None):
+        """Return a lazy cursor over expenses (for streaming responses)."""
         coll = self.db['expenses']
-        return list(coll.find(query or {}).limit(limit))
+        return coll.find(query or {}, projection(fields)).limit(limit)
+
+    def find_expenses_page(self, query=None, sort=None, after=None, limit=100, fields=None):
+        """Keyset-paginated expenses: returns (docs, next_cursor)."""
+        return find_page(self.db['expenses'], query, sort=sort, after=after, limit=limit, fields=fields)
 
-    def find_expense(self, q):
+    def find_expense(self, q, fields=None):
         coll = self.db['expenses']
-        return coll.find_one(q)
+        return coll.find_one(q, projection(fields))
 
     def update_expense(self, q, sets):
         coll = self.db['expenses']
@@ -1,9 +1,18 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.utils.time_utils import get_time_date_dt
 
 class FeedingRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('account_key', 1), ('created_at', -1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'dashboard_feed', 'filter': {'account_key': 'A', 'created_at': {'$gte': 0}}},
+    ]
+
     def __new__(cls, db, collection_name="feeding"):
         if cls._instance is None:
             cls._instance = super(FeedingRepository, cls).__new__(cls)
@@ -21,13 +30,20 @@ class FeedingRepository(BaseRepository):
     def create(self, data):
         data = dict(data)
         data['created_at'] = get_time_date_dt(include_time=True)
-        return self.collection.insert_one(data)
+        res = self.collection.insert_one(data)
+        self._record_dashboard_change(data.get('account_key'), stale=('feed',))
+        return res
+
+    def insert_one(self, doc, **kwargs):
+        res = self.collection.insert_one(doc, **kwargs)
+        self._record_dashboard_change(doc.get('account_key'), stale=('feed',))
+        return res
 
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def delete(self, query):
         return self.collection.delete_one(query)
@@ -1,10 +1,20 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.time_utils import get_time_date_dt
 
 class FishActivityRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('pond_id', 1), ('created_at', -1)], background=True),
+        IndexModel([('pond_id', 1), ('fish_id', 1), ('created_at', -1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'pond_activity', 'filter': {'pond_id': 'P', 'account_key': 'A'}, 'sort': [('created_at', -1)]},
+    ]
+
     def __new__(cls, db=None, collection_name="fish_activity"):
         if cls._instance is None:
             cls._instance = super(FishActivityRepository, cls).__new__(cls)
@@ -23,11 +33,11 @@ class FishActivityRepository(BaseRepository):
         data['created_at'] = get_time_date_dt(include_time=True)
         return self.collection.insert_one(data)
 
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def update(self, query, update_fields):
         update_fields['updated_at'] = get_time_date_dt(include_time=True)
@@ -1,11 +1,46 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.time_utils import get_time_date_dt
 import logging
 
+ROLLUP_COLLECTION = 'fish_analytics_rollup'
+ROLLUP_MARKER_ID = '__rollups_built__'
+
+
+def _rollup_key(batch):
+    return {'account_key': batch.get('account_key'), 'species_id': batch.get('species_id'), 'pond_id': batch.get('pond_id')}
+
+
+def _weight_key(w):
+    """Rollup field name for a rounded weight ('.' is a path separator in updates)."""
+    if w is None or w != w or w in (float('inf'), float('-inf')):
+        return None
+    return f'{w:.2f}'.replace('.', '_')
+
+
+def _age_bucket(added_idx, age_at_add):
+    """Rollup (field, key) for a batch's age: by birth month, or `fixed` when it has no date_added."""
+    if added_idx is None:
+        return 'fixed', str(age_at_add)
+    return 'born', str(added_idx - age_at_add)
+
+
 class FishAnalyticsRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('expected_harvest_date', 1), ('account_key', 1)], background=True),
+        IndexModel([('account_key', 1), ('species_id', 1), ('date_added', -1)], background=True),
+    ]
+    ROLLUP_INDEXES = [
+        # one rollup document per (account, species, pond)
+        IndexModel([('account_key', 1), ('species_id', 1), ('pond_id', 1)], unique=True, background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'species_analytics', 'filter': {'account_key': 'A', 'species_id': 'S'}},
+    ]
+
     def __new__(cls, db=None, collection_name="fish_analytics"):
         if cls._instance is None:
             cls._instance = super(FishAnalyticsRepository, cls).__new__(cls)
@@ -22,6 +57,9 @@ class FishAnalyticsRepository(BaseRepository):
             else:
                 super().__init__(db=db, collection_name=collection_name)
             self.coll = getattr(self, 'collection', None)
+            # Per (account, species, pond) rollups live next to the batches
+            self.rollups = db[ROLLUP_COLLECTION] if db is not None else None
+            self._rollups_ready = None
             self._initialized = True
 
     def add_batch(self, species_id, count, fish_age_in_month, date_added=None, account_key=None, event_id=None, fish_weight=None, pond_id=None):
@@ -40,7 +78,31 @@ class FishAnalyticsRepository(BaseRepository):
         # Optionally store the originating pond_id to allow pond-scoped analytics
         if pond_id is not None:
             batch['pond_id'] = pond_id
-        self.collection.insert_one(batch)
+        self.insert_one(batch)
+
+    # --- Batch writes keep the rollups in step ---
+    def insert_one(self, doc, **kwargs):
+        res = super().insert_one(doc, **kwargs)
+        self._update_rollup(doc, 1, session=kwargs.get('session'))
+        return res
+
+    def delete_one(self, query, **kwargs):
+        doc = self.collection.find_one(query, session=kwargs.get('session'))
+        res = super().delete_one(query, **kwargs)
+        if doc is not None and getattr(res, 'deleted_count', 0):
+            self._update_rollup(doc, -1, session=kwargs.get('session'))
+        return res
+
+    def delete_many(self, query, **kwargs):
+        docs = list(self.collection.find(query, session=kwargs.get('session')))
+        res = super().delete_many(query, **kwargs)
+        for doc in docs:
+            self._update_rollup(doc, -1, session=kwargs.get('session'))
+        return res
+
+    def delete(self, query, multi=False):
+        res = self.delete_many(query) if multi else self.delete_one(query)
+        return getattr(res, 'deleted_count', None)
 
     def get_batches(self, species_id, account_key=None):
         query = {'species_id': species_id}
@@ -48,66 +110,321 @@ class FishAnalyticsRepository(BaseRepository):
             query['account_key'] = account_key
         return list(self.collection.find(query))
 
-    def get_analytics(self, species_id, account_key=None, min_age=None, max_age=None, avg_n=None, min_weight=None, max_weight=None):
+    def get_analytics(self, species_id, account_key=None, min_age=None, max_age=None, avg_n=None, min_weight=None, max_weight=None,
+                      include_batches=False):
         """
         Compute analytics for given species_id.
         Optional filters:
           - min_age, max_age: filter age groups included in analytics (inclusive)
           - avg_n: integer; compute additional averages over the last N age groups (based on age ordering descending)
           - min_weight, max_weight: filter weight groups included in weight analytics
+          - include_batches: also return the raw batch documents (one extra query)
         Returns a dict with:
           - total_fish
           - age_analytics: { age_in_months: count }
           - age_summary: { min: {age, count, avg_age}, max: {...}, avg_age_all }
           - weight_analytics (if weight data present): { weight: count }
           - weight_summary (if weight data present): { min: {...}, max: {...}, avg_all }
-          - last_updated, batches
+          - last_updated, batches (if include_batches)
+        """
+        return self.get_analytics_many(
+            [species_id], account_key=account_key, min_age=min_age, max_age=max_age, avg_n=avg_n,
+            min_weight=min_weight, max_weight=max_weight, include_batches=include_batches,
+        )[species_id]
+
+    def get_analytics_many(self, species_ids, account_key=None, min_age=None, max_age=None, avg_n=None, min_weight=None, max_weight=None,
+                           include_batches=False):
         """
-        batches = self.get_batches(species_id, account_key=account_key)
+        Bulk get_analytics: returns { species_id: analytics } with the same dict
+        shape as get_analytics (species without batches get the empty analytics).
+
+        Served from the rollup documents (one query) once they have been built;
+        until then the buckets are aggregated from the raw batches.
+        """
+        species_ids = list(dict.fromkeys(species_ids or []))
         now = get_time_date_dt(include_time=True)
-        age_counts = {}
-        weight_counts = {}
-        total_fish = 0
-
-        # Build raw analytics from batches
-        for batch in batches:
-            count = int(batch.get('count', 0) or 0)
-            age_at_add = batch.get('fish_age_in_month', 0) or 0
-            date_added = batch.get('date_added', now)
-            if isinstance(date_added, str):
-                try:
-                    # parse ISO string into a datetime (naive, local)
-                    from datetime import datetime as _dt
-                    date_added = _dt.fromisoformat(date_added)
-                except Exception:
-                    date_added = now
-            elif isinstance(date_added, (int, float)):
+        if self.rollups_ready():
+            raw = self._read_rollups(species_ids, account_key, now)
+        else:
+            raw = self._aggregate_batches(species_ids, account_key, now)
+
+        if include_batches and species_ids:
+            query = {'species_id': {'$in': species_ids}}
+            if account_key:
+                query['account_key'] = account_key
+            for batch in self.collection.find(query):
+                raw[batch['species_id']][2].append(batch)
+
+        out = {}
+        for sid, (age_counts, weight_counts, batches, total) in raw.items():
+            analytics = self._build_analytics(now, batches, age_counts, weight_counts, total[0],
+                                              min_age, max_age, avg_n, min_weight, max_weight)
+            if not include_batches:
+                analytics.pop('batches', None)
+            out[sid] = analytics
+        return out
+
+    def _aggregate_batches(self, species_ids, account_key, now):
+        """Raw buckets per species from one aggregation over the batches.
+
+        Batches are grouped on the server by (species, current age, raw weight) and
+        each group's fish count is summed there; current age is computed from
+        date_added and fish_age_in_month against `now`. Batches whose fields are
+        not plain BSON dates/integers/numbers (ISO strings, epoch numbers, string
+        counts, ...) land in a separate group per species; only those documents
+        are returned to be bucketed here by _count_batch.
+        """
+        raw = {sid: ({}, {}, [], [0]) for sid in species_ids}  # age_counts, weight_counts, batches, total
+        if not species_ids:
+            return raw
+        match = {'species_id': {'$in': species_ids}}
+        if account_key:
+            match['account_key'] = account_key
+        for group in self.collection.aggregate([
+            {'$match': match},
+            {'$set': {'_bucket': self._bucket_expr(now)}},
+            {'$group': {
+                '_id': {'species_id': '$species_id', 'bucket': '$_bucket'},
+                'count': {'$sum': {'$ifNull': ['$count', 0]}},
+                'batches': {'$push': {'$cond': [{'$eq': ['$_bucket', None]}, '$$ROOT', '$$REMOVE']}},
+            }},
+        ]):
+            key = group['_id']
+            age_counts, weight_counts, _, total = raw[key['species_id']]
+            bucket = key.get('bucket')
+            if bucket is None:
+                for batch in group['batches']:
+                    total[0] += self._count_batch(batch, now, age_counts, weight_counts)
+                continue
+            count = int(group['count'])
+            age = int(bucket['age'])
+            age_counts[age] = age_counts.get(age, 0) + count
+            if bucket.get('weight') is not None:
+                w_rounded = round(float(bucket['weight']), 2)
+                weight_counts[w_rounded] = weight_counts.get(w_rounded, 0) + count
+            total[0] += count
+        return raw
+
+    # --- Rollups ---
+    # One document per (account_key, species_id, pond_id):
+    #   {total_fish, batch_count,
+    #    born: {<months index of birth>: {c: fish, n: batches}},
+    #    fixed: {<age>: {c: fish, n: batches}},
+    #    weights: {<rounded weight, '.' -> '_'>: {c: fish, n: batches}}}
+    # Ages are stored by birth month (year * 12 + month - age at add), so the
+    # current age is `now` month index - birth month, applied at read time.
+    # Batches without a usable date_added do not age (the raw path counts them
+    # as added `now`), so they are stored under their age at add in `fixed`.
+
+    def index_specs(self):
+        specs = super().index_specs()
+        if self.rollups is not None:
+            specs.append((self.rollups, self.ROLLUP_INDEXES, []))
+        return specs
+
+    def rollups_ready(self):
+        """True once rebuild_rollups has populated the rollup collection."""
+        if self.rollups is None:
+            return False
+        if not self._rollups_ready:
+            try:
+                self._rollups_ready = self.rollups.find_one({'_id': ROLLUP_MARKER_ID}, {'_id': 1}) is not None
+            except Exception:
+                logging.exception('Failed to read fish analytics rollup marker')
+                return False
+        return self._rollups_ready
+
+    def _update_rollup(self, batch, sign, session=None):
+        if self.rollups is None or not batch.get('species_id'):
+            return
+        try:
+            count, added_idx, age_at_add, w_rounded = self._batch_parts(batch, get_time_date_dt(include_time=True))
+        except Exception:
+            logging.warning(f"Skipping rollup update for unparseable fish_analytics batch {batch.get('_id')}")
+            return
+        field, akey = _age_bucket(added_idx, age_at_add)
+        inc = {
+            'total_fish': sign * count,
+            'batch_count': sign,
+            f'{field}.{akey}.c': sign * count,
+            f'{field}.{akey}.n': sign,
+        }
+        wkey = _weight_key(w_rounded)
+        if wkey is not None:
+            inc[f'weights.{wkey}.c'] = sign * count
+            inc[f'weights.{wkey}.n'] = sign
+        try:
+            self.rollups.update_one(
+                _rollup_key(batch),
+                {'$inc': inc, '$set': {'updated_at': get_time_date_dt(include_time=True)}},
+                upsert=True, session=session,
+            )
+        except Exception:
+            logging.exception(f"Failed to update fish analytics rollup for batch {batch.get('_id')}")
+
+    def _read_rollups(self, species_ids, account_key, now):
+        raw = {sid: ({}, {}, [], [0]) for sid in species_ids}
+        if not species_ids:
+            return raw
+        query = {'species_id': {'$in': species_ids}}
+        if account_key:
+            query['account_key'] = account_key
+        now_idx = now.year * 12 + now.month
+        for doc in self.rollups.find(query):
+            age_counts, weight_counts, _, total = raw[doc['species_id']]
+            total[0] += doc.get('total_fish', 0)
+            for born, bucket in (doc.get('born') or {}).items():
+                if bucket.get('n', 0) > 0:
+                    age = now_idx - int(born)
+                    age_counts[age] = age_counts.get(age, 0) + bucket.get('c', 0)
+            for fixed, bucket in (doc.get('fixed') or {}).items():
+                if bucket.get('n', 0) > 0:
+                    age = int(fixed)
+                    age_counts[age] = age_counts.get(age, 0) + bucket.get('c', 0)
+            for wkey, bucket in (doc.get('weights') or {}).items():
+                if bucket.get('n', 0) > 0:
+                    w = float(wkey.replace('_', '.'))
+                    weight_counts[w] = weight_counts.get(w, 0) + bucket.get('c', 0)
+        return raw
+
+    def rebuild_rollups(self, account_key=None):
+        """Regenerate rollups from the raw batches (all accounts, or one for repair).
+
+        Writes that land while the rebuild runs may be counted twice or not at
+        all, so run it when the account is quiet. Returns the number of rollup
+        documents written.
+        """
+        if self.rollups is None:
+            raise RuntimeError('rebuild_rollups() requires the repository to be created with a db')
+        now = get_time_date_dt(include_time=True)
+        query = {'species_id': {'$exists': True, '$ne': None}}
+        if account_key:
+            query['account_key'] = account_key
+
+        docs = {}
+        for batch in self.collection.find(query):
+            try:
+                count, added_idx, age_at_add, w_rounded = self._batch_parts(batch, now)
+            except Exception:
+                logging.warning(f"Skipping unparseable fish_analytics batch {batch.get('_id')}")
+                continue
+            key = _rollup_key(batch)
+            doc = docs.setdefault(tuple(key.values()),
+                                  dict(key, total_fish=0, batch_count=0, born={}, fixed={}, weights={}, updated_at=now))
+            doc['total_fish'] += count
+            doc['batch_count'] += 1
+            for field, bkey in (_age_bucket(added_idx, age_at_add), ('weights', _weight_key(w_rounded))):
+                if bkey is None:
+                    continue
+                bucket = doc[field].setdefault(bkey, {'c': 0, 'n': 0})
+                bucket['c'] += count
+                bucket['n'] += 1
+
+        if account_key:
+            self.rollups.delete_many({'account_key': account_key})
+        else:
+            self.rollups.delete_many({'_id': {'$ne': ROLLUP_MARKER_ID}})
+        if docs:
+            self.rollups.insert_many(list(docs.values()))
+        if not account_key:
+            # reads switch to the rollups only once every account has been built
+            self.rollups.update_one({'_id': ROLLUP_MARKER_ID}, {'$set': {'built_at': now}}, upsert=True)
+            self._rollups_ready = True
+        return len(docs)
+
+    @staticmethod
+    def _batch_parts(batch, now):
+        """Return (count, months index of date_added, age at add, rounded weight or None).
+
+        The months index is None when date_added is missing or unparseable; such
+        a batch counts as added `now`, i.e. its current age is its age at add.
+        """
+        count = int(batch.get('count', 0) or 0)
+        age_at_add = batch.get('fish_age_in_month', 0) or 0
+        date_added = batch.get('date_added')
+        if isinstance(date_added, str):
+            try:
+                # parse ISO string into a datetime (naive, local)
                 from datetime import datetime as _dt
-                date_added = _dt.fromtimestamp(date_added)
+                date_added = _dt.fromisoformat(date_added)
+            except Exception:
+                date_added = None
+        elif isinstance(date_added, (int, float)):
+            from datetime import datetime as _dt
+            date_added = _dt.fromtimestamp(date_added)
+
+        w_rounded = None
+        # Weight analytics if weight field exists on batch (per-fish weight)
+        fish_weight = batch.get('fish_weight') or batch.get('weight')
+        if fish_weight is not None:
+            try:
+                # round to 2 decimal places for grouping
+                w_rounded = round(float(fish_weight), 2)
+            except Exception:
+                # ignore invalid weight values
+                pass
 
-            months_since_add = (now.year - date_added.year) * 12 + (now.month - date_added.month)
-            current_age = int(age_at_add) + int(months_since_add)
+        added_idx = date_added.year * 12 + date_added.month if date_added is not None else None
+        return count, added_idx, int(age_at_add), w_rounded
 
-            # Age analytics
-            age_counts[current_age] = age_counts.get(current_age, 0) + count
+    @staticmethod
+    def _bucket_expr(now):
+        """$group key part: {age, weight} for batches with plain typed fields, else null.
 
-            # Weight analytics if weight field exists on batch (per-fish weight)
-            fish_weight = batch.get('fish_weight') or batch.get('weight')
-            if fish_weight is not None:
-                try:
-                    w = float(fish_weight)
-                    # round to 2 decimal places for grouping
-                    w_rounded = round(w, 2)
-                    weight_counts[w_rounded] = weight_counts.get(w_rounded, 0) + count
-                except Exception:
-                    # ignore invalid weight values
-                    pass
+        Mirrors _count_batch: a missing date_added counts as `now`, missing/null
+        count and fish_age_in_month as 0, and weight is fish_weight unless that is
+        missing/null/0, then weight. Rounding of weights is left to the caller.
+        """
+        ints = ['int', 'long']
+        numbers = ['int', 'long', 'double']
+
+        def _type_in(field, types):
+            return {'$in': [{'$type': field}, types]}
+
+        months = {'$cond': [
+            {'$eq': [{'$type': '$date_added'}, 'missing']},
+            0,
+            {'$add': [
+                {'$multiply': [{'$subtract': [now.year, {'$year': '$date_added'}]}, 12]},
+                {'$subtract': [now.month, {'$month': '$date_added'}]},
+            ]},
+        ]}
+        weight = {'$cond': [
+            {'$and': [_type_in('$fish_weight', numbers), {'$ne': ['$fish_weight', 0]}]},
+            '$fish_weight',
+            {'$ifNull': ['$weight', None]},
+        ]}
+        plain = {'$and': [
+            _type_in('$date_added', ['date', 'missing']),
+            _type_in('$count', ints + ['missing', 'null']),
+            _type_in('$fish_age_in_month', ints + ['missing', 'null']),
+            _type_in('$fish_weight', numbers + ['missing', 'null']),
+            _type_in('$weight', numbers + ['missing', 'null']),
+        ]}
+        return {'$cond': [
+            plain,
+            {'age': {'$add': [{'$ifNull': ['$fish_age_in_month', 0]}, months]}, 'weight': weight},
+            None,
+        ]}
 
-            total_fish += count
+    @staticmethod
+    def _count_batch(batch, now, age_counts, weight_counts):
+        """Add one batch to the age/weight buckets and return its fish count."""
+        count, added_idx, age_at_add, w_rounded = FishAnalyticsRepository._batch_parts(batch, now)
+        current_age = age_at_add if added_idx is None else age_at_add + (now.year * 12 + now.month) - added_idx
+        age_counts[current_age] = age_counts.get(current_age, 0) + count
+        if w_rounded is not None:
+            weight_counts[w_rounded] = weight_counts.get(w_rounded, 0) + count
+        return count
 
+    @staticmethod
+    def _build_analytics(now, batches, age_counts, weight_counts, total_fish,
+                         min_age=None, max_age=None, avg_n=None, min_weight=None, max_weight=None):
+        """Apply filters to the raw buckets and build the analytics dict (see get_analytics)."""
         # Apply age filters if provided
+        # (buckets are visited in key order so sums don't depend on batch order)
         filtered_age_counts = {}
-        for age, cnt in age_counts.items():
+        for age, cnt in sorted(age_counts.items()):
             if (min_age is not None and age < int(min_age)):
                 continue
             if (max_age is not None and age > int(max_age)):
@@ -153,7 +470,7 @@ class FishAnalyticsRepository(BaseRepository):
         # Apply weight filters if provided
         filtered_weight_counts = {}
         if weight_counts:
-            for w, cnt in weight_counts.items():
+            for w, cnt in sorted(weight_counts.items()):
                 if (min_weight is not None and float(w) < float(min_weight)):
                     continue
                 if (max_weight is not None and float(w) > float(max_weight)):
@@ -1,12 +1,14 @@
 import logging
 
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.time_utils import get_time_date_dt
 
 
 class FishRepository(BaseRepository):
     _instance = None
+    CACHE_KEY = '_id'
 
     def __new__(cls, db, collection_name="fish"):
         if cls._instance is None:
@@ -34,11 +36,8 @@ class FishRepository(BaseRepository):
         data['created_at'] = get_time_date_dt(include_time=True)
         return self.collection.insert_one(data)
 
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
-
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
     def update(self, query, update_fields):
         update_fields['updated_at'] = get_time_date_dt(include_time=True)
@@ -0,0 +1,82 @@
+"""Account-level pond rollups computed server-side.
+
+Each helper runs a projected `$group` pipeline so only the grouped integers come
+back, never whole pond documents (and their `current_stock` arrays).
+
+All helpers accept a repository (anything with `.collection`) or a raw pymongo
+collection.
+
+API:
+- total_stock(ponds, account_key) -> int
+- stock_by_species(ponds, account_key) -> {species: count}
+- pond_counts_by_status(ponds, account_key) -> {status: count}
+- fish_counts_by_pond_type(ponds, account_key) -> {pond_type: count}
+- species_by_pond(pond_events, account_key, pond_ids=None) -> {pond_id: [species]}
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from fin_server.repository.base_repository import BaseRepository
+
+UNKNOWN = 'unknown'
+
+
+def _coll(source):
+    # a raw pymongo Collection would return a sub-collection for `.collection`
+    return source.collection if isinstance(source, BaseRepository) else source
+
+
+def _grouped(source, pipeline) -> Dict[Any, Any]:
+    return {row['_id']: row['value'] for row in _coll(source).aggregate(pipeline)}
+
+
+def total_stock(ponds, account_key: str) -> int:
+    """Sum of `metadata.total_fish` over the account's ponds."""
+    rows = list(_coll(ponds).aggregate([
+        {'$match': {'account_key': account_key}},
+        {'$group': {'_id': None, 'value': {'$sum': '$metadata.total_fish'}}},
+    ]))
+    return rows[0]['value'] if rows else 0
+
+
+def stock_by_species(ponds, account_key: str) -> Dict[str, int]:
+    """Fish per species across the account, from `metadata.fish_types`."""
+    return _grouped(ponds, [
+        {'$match': {'account_key': account_key, 'metadata.fish_types': {'$type': 'object'}}},
+        {'$project': {'_id': 0, 'types': {'$objectToArray': '$metadata.fish_types'}}},
+        {'$unwind': '$types'},
+        {'$group': {'_id': '$types.k', 'value': {'$sum': '$types.v'}}},
+    ])
+
+
+def pond_counts_by_status(ponds, account_key: str) -> Dict[str, int]:
+    """Number of ponds per `status` (missing status counts as 'unknown')."""
+    return _grouped(ponds, [
+        {'$match': {'account_key': account_key}},
+        {'$group': {'_id': {'$ifNull': ['$status', UNKNOWN]}, 'value': {'$sum': 1}}},
+    ])
+
+
+def fish_counts_by_pond_type(ponds, account_key: str) -> Dict[str, int]:
+    """Fish per pond type (`type`, falling back to the legacy `water_type`)."""
+    return _grouped(ponds, [
+        {'$match': {'account_key': account_key}},
+        {'$group': {
+            '_id': {'$ifNull': ['$type', {'$ifNull': ['$water_type', UNKNOWN]}]},
+            'value': {'$sum': '$metadata.total_fish'},
+        }},
+    ])
+
+
+def species_by_pond(pond_events, account_key: str,
+                    pond_ids: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """Distinct species that have pond events, per pond."""
+    match: Dict[str, Any] = {'account_key': account_key}
+    if pond_ids is not None:
+        match['pond_id'] = {'$in': list(pond_ids)}
+    rows = _grouped(pond_events, [
+        {'$match': match},
+        {'$project': {'_id': 0, 'pond_id': 1, 'species': {'$ifNull': ['$species_code', '$fish_id']}}},
+        {'$match': {'species': {'$nin': [None, '']}}},
+        {'$group': {'_id': '$pond_id', 'value': {'$addToSet': '$species'}}},
+    ])
+    return {pond_id: sorted(species) for pond_id, species in rows.items()}
@@ -1,10 +1,23 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 import logging
 from fin_server.utils.time_utils import get_time_date_dt
 
 class PondEventRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('account_key', 1), ('fish_id', 1)], background=True),
+        # one per get_pond_history $unionWith branch
+        IndexModel([('pond_id', 1), ('created_at', -1)], background=True),
+        IndexModel([('pond_id', 1), ('fish_id', 1), ('created_at', -1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'pond_history_events', 'filter': {'pond_id': 'P'}, 'sort': [('created_at', -1)]},
+        {'name': 'species_events', 'filter': {'account_key': 'A', 'fish_id': 'F'}},
+    ]
+
     def __new__(cls, db, collection_name="pond_event"):
         if cls._instance is None:
             cls._instance = super(PondEventRepository, cls).__new__(cls)
@@ -23,14 +36,14 @@ class PondEventRepository(BaseRepository):
         data['created_at'] = get_time_date_dt(include_time=True)
         return self.collection.insert_one(data)
 
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
-    def find_many(self, query=None):
-        return self.find(query)
+    def find_many(self, query=None, fields=None):
+        return self.find(query, fields=fields)
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def update(self, query, update_fields):
         update_fields['updated_at'] = get_time_date_dt(include_time=True)
@@ -1,10 +1,22 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 import logging
 from fin_server.utils.time_utils import get_time_date_dt
 
 class PondRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('pond_id', 1)], background=True),
+        IndexModel([('account_key', 1), ('deleted_at', 1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'get_pond', 'filter': {'pond_id': 'P'}},
+        {'name': 'list_ponds', 'filter': {'account_key': 'A'}},
+    ]
+    IDENTITY_KEYS = ('pond_id',)
+
     def __new__(cls, db, collection_name="pond"):
         if cls._instance is None:
             cls._instance = super(PondRepository, cls).__new__(cls)
@@ -21,23 +33,32 @@ class PondRepository(BaseRepository):
     def create(self, data):
         logging.info(f"Inserting pond data: {data}")
         data['created_at'] = get_time_date_dt(include_time=True)
-        return self.collection.insert_one(data)
-
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
+        res = self.collection.insert_one(data)
+        stocked = bool((data.get('metadata') or {}).get('total_fish'))
+        self._record_dashboard_change(data.get('account_key'), inc={'totalPonds': 1}, stale=('stock',) if stocked else ())
+        return res
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
     def update(self, query, update_fields):
         update_fields['updated_at'] = get_time_date_dt(include_time=True)
-        return self.collection.update_one(query, {'$set': update_fields})
+        res = self.collection.update_one(query, {'$set': update_fields})
+        if 'metadata' in update_fields or 'metadata.total_fish' in update_fields:
+            pond = self.collection.find_one(query, {'account_key': 1})
+            if pond and getattr(res, 'matched_count', 0):
+                self._record_dashboard_change(pond.get('account_key'), stale=('stock',))
+        return res
 
     def delete(self, query):
-        return self.collection.delete_one(query)
+        pond = self.collection.find_one(query, {'account_key': 1})
+        res = self.collection.delete_one(query)
+        if pond and getattr(res, 'deleted_count', 0):
+            self._record_dashboard_change(pond.get('account_key'), stale=('ponds', 'stock'))
+        return res
 
-    def get_pond(self, pond_id):
-        return self.find_one({'pond_id': pond_id})
+    def get_pond(self, pond_id, fields=None):
+        return self.find_one({'pond_id': pond_id}, fields=fields)
 
     def _pond_query(self, pond_id):
         """Return a query that matches a pond by either pond_id or _id."""
@@ -53,7 +74,24 @@ class PondRepository(BaseRepository):
             update['$unset'] = unset_fields
         if not update:
             return None
-        return self.collection.update_one(self._pond_query(pond_id), update, upsert=False)
+        res = self.collection.update_one(self._pond_query(pond_id), update, upsert=False)
+        self._record_stock_change(pond_id, res, inc_fields, set_fields, unset_fields)
+        return res
+
+    def _record_stock_change(self, pond_id, res, inc_fields=None, set_fields=None, unset_fields=None):
+        """Keep the dashboard's totalStock card in step with metadata.total_fish."""
+        inc_fields, set_fields, unset_fields = inc_fields or {}, set_fields or {}, unset_fields or {}
+        touches = any(f in ('metadata', 'metadata.total_fish') for f in list(set_fields) + list(unset_fields))
+        delta = inc_fields.get('metadata.total_fish')
+        if not (touches or delta) or not getattr(res, 'matched_count', 0):
+            return
+        pond = self.collection.find_one(self._pond_query(pond_id), {'account_key': 1})
+        if not pond:
+            return
+        if touches or not isinstance(delta, (int, float)):
+            self._record_dashboard_change(pond.get('account_key'), stale=('stock',))
+        else:
+            self._record_dashboard_change(pond.get('account_key'), inc={'totalStock': delta})
 
     # --- Backwards-compatible thin collection proxies ---
     def update_one(self, query, update, **kwargs):
@@ -113,6 +151,8 @@ class PondRepository(BaseRepository):
             inc_fields = {'fish_count': int(delta), 'metadata.total_fish': int(delta), f'metadata.fish_types.{species}': int(delta)}
             update_doc = {'$set': {'current_stock': cs, 'updated_at': get_time_date_dt(include_time=True)}, '$inc': inc_fields}
             res = self.collection.update_one(q, update_doc)
+            if getattr(res, 'matched_count', 0):
+                self._record_dashboard_change(pond.get('account_key'), inc={'totalStock': int(delta)})
             return res
         except Exception:
             logging.exception('Failed to update_stock for pond=%s species=%s', pond_id, species)
@@ -156,6 +196,7 @@ class PondRepository(BaseRepository):
             update.setdefault('$set', {})
             update['$set']['updated_at'] = get_time_date_dt(include_time=True)
             res = self.collection.update_one(self._pond_query(pond_id), update, upsert=upsert)
+            self._record_stock_change(pond_id, res, inc_fields, set_fields, unset_fields)
             return res
         except Exception:
             logging.exception('Failed to update_fields for pond=%s', pond_id)
@@ -1,9 +1,20 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.utils.time_utils import get_time_date_dt
 
 class SamplingRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('pond_id', 1), ('created_at', -1)], background=True),
+        IndexModel([('account_key', 1), ('created_at', -1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'sampling_history', 'filter': {'pond_id': 'P'}, 'sort': [('created_at', -1)]},
+        {'name': 'dashboard_growth', 'filter': {'account_key': 'A', 'created_at': {'$gte': 0}}},
+    ]
+
     def __new__(cls, db, collection_name="sampling"):
         if cls._instance is None:
             cls._instance = super(SamplingRepository, cls).__new__(cls)
@@ -22,14 +33,15 @@ class SamplingRepository(BaseRepository):
         doc = dict(data)
         doc['created_at'] = get_time_date_dt(include_time=True)
         res = self.collection.insert_one(doc)
+        self._record_dashboard_change(doc.get('account_key'), stale=('growth',))
         return getattr(res, 'inserted_id', None)
 
     def find(self, query=None, *args, **kwargs):
         # Return a Cursor so callers can chain sort()/limit()
         return super().find(query or {}, *args, **kwargs)
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def update(self, query, update_fields, multi: bool = False):
         update_fields = dict(update_fields)
@@ -0,0 +1,168 @@
+"""Request-scoped identity map for repository lookups by key.
+
+Within one HTTP request (or one Socket.IO event, which flask-socketio runs in
+its own request context) the same pond / user / company is often fetched
+several times. Repositories that list their key fields in `IDENTITY_KEYS`
+serve `find_one({key: value})` from a map stored on `flask.g`, so repeated
+lookups cost one round trip.
+
+Consistency:
+- documents are copied in and out, so callers may mutate what they get back;
+- `IdentityMapListener` is registered on the MongoClient and drops every
+  cached document of a collection when a write to that collection starts in
+  the same context, whether it goes through a repository or a raw collection;
+- outside an app context (background threads, scripts) lookups are not cached.
+
+Hit/miss counters are exposed on GET /metrics under `identity_map`.
+
+API:
+- cached_find_one(collection, query, keys, loader=None, fields=None) -> document or None
+- current_identity_map() -> IdentityMap or None
+- IdentityMapListener (registered by `create_mongo_client`)
+"""
+import copy
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import monitoring
+
+from config import config
+from fin_server.repository.projection import project_document, projection, projects_locally
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+WRITE_COMMANDS = ('insert', 'update', 'delete', 'findAndModify')
+
+_MISSING = object()
+_HASHABLE = (str, int, ObjectId)
+
+_stats_lock = Lock()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def identity_map_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+    return stats
+
+
+class IdentityMap:
+    """Documents by (namespace, field, value) for one request."""
+
+    def __init__(self):
+        self._docs: Dict[str, Dict[Tuple[str, Any], Optional[Dict[str, Any]]]] = {}
+
+    def get(self, namespace: str, field: str, value: Any):
+        """Return the cached document (None for a cached miss) or `_MISSING`."""
+        return self._docs.get(namespace, {}).get((field, value), _MISSING)
+
+    def put(self, namespace: str, field: str, value: Any, doc: Optional[Dict[str, Any]], keys: Sequence[str]):
+        entries = self._docs.setdefault(namespace, {})
+        stored = copy.deepcopy(doc)
+        entries[(field, value)] = stored
+        if doc is None:
+            return
+        # the same document answers lookups by any of its keys
+        for key in keys:
+            key_value = doc.get(key)
+            if isinstance(key_value, _HASHABLE) and not isinstance(key_value, bool):
+                entries[(key, key_value)] = stored
+
+    def invalidate(self, namespace: str):
+        if self._docs.pop(namespace, None) is not None:
+            _count('invalidations')
+
+    def clear(self):
+        self._docs.clear()
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    """Return the map of the current request / Socket.IO event, or None outside one."""
+    if not config.IDENTITY_MAP_ENABLED:
+        return None
+    from flask import g, has_app_context
+    if not has_app_context():
+        return None
+    imap = g.get('identity_map')
+    if imap is None:
+        imap = g.identity_map = IdentityMap()
+    return imap
+
+
+def _lookup_key(query: Dict[str, Any], keys: Sequence[str]) -> Optional[Tuple[str, Any]]:
+    """Return (field, value) when `query` is a plain equality on one key field."""
+    if not isinstance(query, dict) or len(query) != 1:
+        return None
+    field, value = next(iter(query.items()))
+    if field not in keys or not isinstance(value, _HASHABLE) or isinstance(value, bool):
+        return None
+    return field, value
+
+
+def cached_find_one(collection, query: Dict[str, Any], keys: Sequence[str],
+                    loader: Optional[Callable[[Dict[str, Any]], Any]] = None, fields=None):
+    """`collection.find_one(query)`, served from the identity map when `query` is by key.
+
+    `loader(query)` replaces `collection.find_one` for key lookups that reach the
+    database. With a top-level `fields` list the whole document is cached and
+    trimmed; other projections always go to the database.
+    """
+    lookup = _lookup_key(query, keys)
+    if lookup is None or (fields is not None and not projects_locally(fields)):
+        return collection.find_one(query, projection(fields))
+    imap = current_identity_map()
+    if imap is None:
+        if loader is None:
+            return collection.find_one(query, projection(fields))
+        return project_document(loader(query), fields)
+
+    namespace = collection.full_name
+    cached = imap.get(namespace, *lookup)
+    if cached is not _MISSING:
+        _count('hits')
+        return project_document(copy.deepcopy(cached), fields)
+
+    _count('misses')
+    doc = (loader or collection.find_one)(query)
+    imap.put(namespace, lookup[0], lookup[1], doc, keys)
+    return project_document(doc, fields)
+
+
+class IdentityMapListener(monitoring.CommandListener):
+    """Invalidate the current identity map when a write command starts.
+
+    pymongo calls listeners on the thread issuing the command, so `flask.g`
+    resolves to the request (or event) that made the write.
+    """
+
+    def started(self, event):
+        if event.command_name not in WRITE_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            return
+        try:
+            imap = current_identity_map()
+        except Exception:
+            return
+        if imap is not None:
+            imap.invalidate(f'{event.database_name}.{collection}')
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+metrics_collector.register_provider('identity_map', identity_map_stats)
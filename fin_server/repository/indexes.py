@@ -0,0 +1,213 @@
+"""Declarative index registry.
+
+Every repository class declares the indexes its queries rely on in `INDEXES`
+(a list of pymongo `IndexModel`) and, optionally, representative `QUERY_SHAPES`
+(`{'name', 'filter', 'sort'}` dicts using placeholder values). Repositories that
+own more than one collection override `index_specs()`. Collections that have no
+repository class are declared in `COLLECTION_INDEXES` below.
+
+The registry is reconciled by the migration step (`MongoRepo.migrate()`,
+scripts/migrate.py or scripts/add_indexes.py), and in the background at boot
+only when `config.INDEX_RECONCILE_ON_STARTUP` is set:
+- missing indexes are created (background builds),
+- indexes present in the database but not declared are reported, not dropped,
+- declared indexes whose key pattern exists with different options are reported.
+
+With `config.INDEX_EXPLAIN_CHECK` (on by default in development) every query
+shape is explained and shapes whose winning plan is a COLLSCAN are logged.
+
+API:
+- reconcile_indexes(targets, create=True) -> list of per-collection reports
+- explain_query_shapes(targets) -> list of per-shape reports
+- run_index_checks(targets, explain=False) -> None (logs the reports)
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# (collection, [IndexModel], [query shape]) as returned by `index_specs()`
+IndexTarget = Tuple[Any, List[IndexModel], List[Dict[str, Any]]]
+
+# Collections without a repository class: (MongoRepo db attribute, collection) -> specs
+COLLECTION_INDEXES: Dict[Tuple[str, str], Dict[str, list]] = {
+    ('media_db', 'alerts'): {
+        'indexes': [
+            IndexModel([('account_key', ASCENDING), ('created_at', DESCENDING)], background=True),
+            IndexModel([('account_key', ASCENDING), ('acknowledged', ASCENDING)], background=True),
+            IndexModel([('alert_id', ASCENDING)], background=True),
+        ],
+        'query_shapes': [
+            {'name': 'list_alerts', 'filter': {'account_key': 'A', 'acknowledged': False},
+             'sort': [('created_at', DESCENDING)]},
+            {'name': 'unacknowledged_count', 'filter': {'account_key': 'A', 'acknowledged': False}},
+        ],
+    },
+    # Cross-worker cache invalidations (fin_server.repository.cache), polled by time
+    ('user_db', 'cache_invalidations'): {
+        'indexes': [
+            IndexModel([('at', ASCENDING)], expireAfterSeconds=3600, name='cache_invalidations_ttl'),
+        ],
+        'query_shapes': [
+            {'name': 'poll_invalidations', 'filter': {'at': {'$gte': 'T'}}, 'sort': [('at', ASCENDING)]},
+        ],
+    },
+}
+
+# Options that change index semantics; a mismatch is reported as a conflict
+_SEMANTIC_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+
+def _key_pattern(keys) -> Tuple:
+    """Comparable key pattern; all text indexes compare equal (one per collection)."""
+    keys = list(keys.items()) if hasattr(keys, 'items') else list(keys)
+    if any(direction == 'text' for _, direction in keys) or ('_fts', 'text') in keys:
+        return ('$text',)
+    return tuple((field, direction if isinstance(direction, str) else int(direction))
+                 for field, direction in keys)
+
+
+def _option(spec: Dict[str, Any], option: str):
+    value = spec.get(option)
+    return bool(value) if option in ('unique', 'sparse') else value
+
+
+def _describe(document: Dict[str, Any]) -> str:
+    return document.get('name') or '_'.join(f'{f}_{d}' for f, d in document['key'].items())
+
+
+def _collection_name(coll) -> str:
+    return getattr(coll, 'full_name', None) or getattr(coll, 'name', str(coll))
+
+
+def reconcile_indexes(targets: Iterable[IndexTarget], create: bool = True) -> List[Dict[str, Any]]:
+    """Compare declared indexes with the database and create the missing ones.
+
+    Args:
+        targets: (collection, index models, query shapes) tuples
+        create: False only reports what would be created (dry run)
+
+    Returns:
+        One report per collection: {collection, created | missing, extra, conflicts, error}
+    """
+    reports = []
+    for coll, models, _ in _merge_targets(targets):
+        report = {'collection': _collection_name(coll), 'created': [], 'missing': [],
+                  'extra': [], 'conflicts': []}
+        try:
+            existing = coll.index_information()
+        except Exception as e:
+            report['error'] = str(e)
+            reports.append(report)
+            continue
+
+        existing_by_key = {_key_pattern(info['key']): (name, info) for name, info in existing.items()}
+        declared = set()
+        missing = []
+        for model in models:
+            doc = model.document
+            pattern = _key_pattern(doc['key'])
+            declared.add(pattern)
+            if pattern not in existing_by_key:
+                missing.append(model)
+                continue
+            name, info = existing_by_key[pattern]
+            diffs = [opt for opt in _SEMANTIC_OPTIONS if _option(doc, opt) != _option(info, opt)]
+            if diffs:
+                report['conflicts'].append(f'{name} ({", ".join(diffs)} differ from {_describe(doc)})')
+
+        report['extra'] = sorted(name for pattern, (name, _) in existing_by_key.items()
+                                 if pattern not in declared and name != '_id_')
+
+        if missing and create:
+            try:
+                report['created'] = coll.create_indexes(missing)
+            except Exception as e:
+                report['error'] = str(e)
+                report['missing'] = [_describe(m.document) for m in missing]
+        else:
+            report['missing'] = [_describe(m.document) for m in missing]
+        reports.append(report)
+    return reports
+
+
+def _plan_stages(plan) -> List[str]:
+    """All `stage` names in an explain plan tree."""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append(plan['stage'])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def explain_query_shapes(targets: Iterable[IndexTarget]) -> List[Dict[str, Any]]:
+    """Explain each declared query shape and flag collection scans.
+
+    Returns:
+        One report per shape: {collection, query, stages, collscan, error}
+    """
+    reports = []
+    for coll, _, shapes in _merge_targets(targets):
+        for shape in shapes:
+            report = {'collection': _collection_name(coll), 'query': shape.get('name'),
+                      'stages': [], 'collscan': False}
+            try:
+                cursor = coll.find(shape.get('filter') or {}, shape.get('projection'))
+                if shape.get('sort'):
+                    cursor = cursor.sort(shape['sort'])
+                plan = cursor.limit(shape.get('limit', 50)).explain()
+                winning = (plan.get('queryPlanner') or {}).get('winningPlan', plan)
+                report['stages'] = _plan_stages(winning)
+                report['collscan'] = 'COLLSCAN' in report['stages']
+            except Exception as e:
+                report['error'] = str(e)
+            reports.append(report)
+    return reports
+
+
+def _merge_targets(targets: Iterable[IndexTarget]) -> List[IndexTarget]:
+    """Merge targets that point at the same collection (shared/aliased repositories)."""
+    merged: Dict[str, IndexTarget] = {}
+    for coll, models, shapes in targets:
+        if coll is None:
+            continue
+        key = _collection_name(coll)
+        if key in merged:
+            _, prev_models, prev_shapes = merged[key]
+            seen = {_key_pattern(m.document['key']) for m in prev_models}
+            models = prev_models + [m for m in models if _key_pattern(m.document['key']) not in seen]
+            shapes = prev_shapes + [s for s in shapes if s not in prev_shapes]
+        merged[key] = (coll, list(models), list(shapes))
+    return list(merged.values())
+
+
+def run_index_checks(targets: Iterable[IndexTarget], explain: bool = False, create: bool = True):
+    """Reconcile (and optionally explain) the registry, logging the outcome."""
+    targets = list(targets)
+    for report in reconcile_indexes(targets, create=create):
+        name = report['collection']
+        if report.get('error'):
+            logger.warning(f"Index reconcile failed for {name}: {report['error']}")
+        if report['created']:
+            logger.info(f"Created indexes on {name}: {', '.join(report['created'])}")
+        if report['missing']:
+            logger.warning(f"Missing indexes on {name}: {', '.join(report['missing'])}")
+        if report['extra']:
+            logger.info(f"Undeclared indexes on {name}: {', '.join(report['extra'])}")
+        for conflict in report['conflicts']:
+            logger.warning(f"Index option conflict on {name}: {conflict}")
+
+    if explain:
+        for report in explain_query_shapes(targets):
+            if report.get('error'):
+                logger.warning(f"Could not explain {report['collection']}.{report['query']}: {report['error']}")
+            elif report['collscan']:
+                logger.warning(f"COLLSCAN: query shape {report['query']} on {report['collection']} "
+                               f"is not covered by an index ({' > '.join(report['stages'])})")
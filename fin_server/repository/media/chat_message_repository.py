@@ -7,6 +7,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from bson import ObjectId
+from pymongo import IndexModel
 
 from fin_server.repository.base_repository import BaseRepository
 
@@ -17,6 +18,22 @@ class ChatMessageRepository(BaseRepository):
     """Repository for chat messages."""
     _instance = None
 
+    INDEXES = [
+        IndexModel([('message_id', 1)], background=True),
+        IndexModel([('conversation_id', 1), ('created_at', -1)], background=True),
+        IndexModel([('account_key', 1), ('created_at', -1)], background=True),
+        # search_messages runs a $text query ranked by textScore
+        IndexModel([('content', 'text')], name='chat_messages_content_text', background=True),
+        # TTL: deleted/cleared messages are removed once expires_at is reached
+        IndexModel([('expires_at', 1)], name='ttl_expires_at', expireAfterSeconds=0, sparse=True, background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'get_messages', 'filter': {'conversation_id': 'C', 'deleted_at': None},
+         'sort': [('created_at', -1)]},
+        {'name': 'search_messages', 'filter': {'account_key': 'A', 'deleted_at': None, 'deleted_for': {'$ne': 'U'},
+                                               '$text': {'$search': 'x'}}},
+    ]
+
     def __new__(cls, db, collection_name="chat_messages"):
         if cls._instance is None:
             cls._instance = super(ChatMessageRepository, cls).__new__(cls)
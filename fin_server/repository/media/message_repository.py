@@ -1,9 +1,17 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.utils.time_utils import get_time_date_dt
 
 class MessageRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('conversation_id', 1), ('created_at', -1)], background=True),
+        IndexModel([('conversation_id', 1), ('sender_key', 1), ('created_at', -1)], background=True),
+        IndexModel([('to_user_key', 1), ('delivered', 1)], background=True),
+    ]
+
     def __new__(cls, db, collection="message"):
         if cls._instance is None:
             cls._instance = super(MessageRepository, cls).__new__(cls)
@@ -29,11 +37,13 @@ class MessageRepository(BaseRepository):
         }
         return self.collection.insert_one(doc)
 
-    def find(self, query=None, *args, **kwargs):
+    def find(self, query=None, *args, fields=None, **kwargs):
+        if fields is not None:
+            kwargs['projection'] = projection(fields)
         return list(self.collection.find(query or {}, *args, **kwargs))
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def update(self, query, update_fields, multi: bool = False, *args, **kwargs):
         if multi:
@@ -1,4 +1,5 @@
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from fin_server.utils.time_utils import get_time_date_dt
 
 class NotificationRepository(BaseRepository):
@@ -23,11 +24,13 @@ class NotificationRepository(BaseRepository):
         data['delivered'] = False
         return self.collection.insert_one(data)
 
-    def find(self, query=None, *args, **kwargs):
+    def find(self, query=None, *args, fields=None, **kwargs):
+        if fields is not None:
+            kwargs['projection'] = projection(fields)
         return list(self.collection.find(query or {}, *args, **kwargs))
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def update(self, query, update_fields, multi: bool = False, *args, **kwargs):
         if multi:
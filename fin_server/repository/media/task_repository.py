@@ -1,9 +1,28 @@
+from pymongo import IndexModel
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 from bson import ObjectId
 
+# Statuses the dashboard does not count as active (see dashboard_service)
+INACTIVE_TASK_STATUSES = ('completed', 'done', 'cancelled')
+
+
 class TaskRepository(BaseRepository):
     _instance = None
 
+    INDEXES = [
+        IndexModel([('task_id', 1)], background=True),
+        IndexModel([('user_key', 1)], background=True),
+        IndexModel([('account_key', 1), ('status', 1)], background=True),
+        IndexModel([('assignee', 1), ('account_key', 1)], background=True),
+        IndexModel([('reminder_time', 1), ('status', 1), ('reminder', 1)], background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'get_tasks', 'filter': {'user_key': 'U'}},
+        {'name': 'find_by_task_id', 'filter': {'task_id': '0001000'}},
+        {'name': 'dashboard_active_tasks', 'filter': {'account_key': 'A', 'status': {'$nin': ['completed', 'done', 'cancelled']}}},
+    ]
+
     def __new__(cls, db, collection_name="task"):
         if cls._instance is None:
             cls._instance = super(TaskRepository, cls).__new__(cls)
@@ -24,13 +43,16 @@ class TaskRepository(BaseRepository):
             data['user_key'] = data.pop('userkey')
         # Generate incremental 7-digit task_id
         data['task_id'] = self.get_next_task_id()
-        return str(self.collection.insert_one(data).inserted_id)
+        inserted_id = str(self.collection.insert_one(data).inserted_id)
+        if data.get('status') not in INACTIVE_TASK_STATUSES:
+            self._record_dashboard_change(data.get('account_key'), inc={'activeTasks': 1})
+        return inserted_id
 
-    def find(self, query=None):
-        return list(self.collection.find(query or {}))
+    def find(self, query=None, fields=None):
+        return list(self.collection.find(query or {}, projection(fields)))
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
+    def find_one(self, query, fields=None):
+        return self.collection.find_one(query, projection(fields))
 
     def find_by_any_id(self, any_id: str):
         """Flexibly resolve a task by:
@@ -61,10 +83,19 @@ class TaskRepository(BaseRepository):
         return None
 
     def update(self, query, update_fields):
-        return self.collection.update_one(query, {'$set': update_fields}).modified_count
+        modified = self.collection.update_one(query, {'$set': update_fields}).modified_count
+        if modified and 'status' in update_fields:
+            task = self.collection.find_one(query, {'account_key': 1})
+            if task:
+                self._record_dashboard_change(task.get('account_key'), stale=('tasks',))
+        return modified
 
     def delete(self, query):
-        return self.collection.delete_one(query).deleted_count
+        task = self.collection.find_one(query, {'account_key': 1, 'status': 1})
+        deleted = self.collection.delete_one(query).deleted_count
+        if deleted and task and task.get('status') not in INACTIVE_TASK_STATUSES:
+            self._record_dashboard_change(task.get('account_key'), inc={'activeTasks': -1})
+        return deleted
 
     def get_next_task_id(self):
         # Find the max task_id in the collection, default to 999 if none
@@ -7,6 +7,8 @@ import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,10 @@ class UserConversationsRepository(BaseRepository):
     """Repository for user_conversations - fast lookup of user's conversations."""
     _instance = None
 
+    INDEXES = [
+        IndexModel([('user_key', 1)], unique=True, background=True),
+    ]
+
     def __new__(cls, db, collection_name="user_conversations"):
         if cls._instance is None:
             cls._instance = super(UserConversationsRepository, cls).__new__(cls)
@@ -28,18 +34,8 @@ class UserConversationsRepository(BaseRepository):
             self.collection_name = collection_name
             self.coll = self.collection
             logger.info(f"Initializing {self.collection_name} collection in media_db")
-            self._ensure_indexes()
             self._initialized = True
 
-    def _ensure_indexes(self):
-        """Create necessary indexes."""
-        if self.collection is not None:
-            try:
-                self.collection.create_index("user_key", unique=True)
-                logger.info(f"Created index on {self.collection_name}.user_key")
-            except Exception as e:
-                logger.warning(f"Could not create index: {e}")
-
     def get_user_doc(self, user_key: str) -> Optional[Dict]:
         """Get the user_conversations document for a user."""
         if self.collection is None:
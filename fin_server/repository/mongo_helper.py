@@ -1,43 +1,104 @@
 from typing import Any
+import pymongo
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ConfigurationError
+import importlib
 import logging
+import threading
+import time
 
 from config import config
+from fin_server.repository.client_manager import client_manager
+from fin_server.repository.projection import projection
 
 logger = logging.getLogger(__name__)
 
 
-def create_mongo_client(uri: str, max_retries: int = 3):
+def _record_startup(component: str, seconds: float):
+    from fin_server.utils.startup import startup_budget
+    startup_budget.add(component, seconds)
+
+
+# Wire compressors that need an optional package
+_COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy'}
+
+
+def _available_compressors(names):
+    """Drop configured compressors whose optional package is not installed."""
+    from importlib.util import find_spec
+
+    available = []
+    for name in names or []:
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and find_spec(module) is None:
+            logger.info(f"MongoDB compressor '{name}' skipped: {module} is not installed")
+            continue
+        available.append(name)
+    return available
+
+
+def create_mongo_client(uri: str, max_retries: int = 3, verify: bool = True, connect: bool = True):
     """Create MongoDB client with connection options and retry logic.
 
     Args:
         uri: MongoDB connection string
         max_retries: Number of connection attempts
+        verify: Ping the server before returning; False returns immediately and
+            lets the driver connect in the background
+        connect: False defers connecting (and the driver's monitor threads) to
+            the first operation; see client_manager for why that matters
 
     Returns:
         MongoClient instance or None if connection fails
     """
-    # Connection options for better reliability
+    # Connection, pool and compression options (config/settings.py, database section)
     client_options = {
-        'serverSelectionTimeoutMS': 10000,  # 10 seconds
-        'connectTimeoutMS': 10000,
-        'socketTimeoutMS': 30000,
+        'serverSelectionTimeoutMS': config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'connectTimeoutMS': config.MONGO_CONNECT_TIMEOUT_MS,
+        'socketTimeoutMS': config.MONGO_SOCKET_TIMEOUT_MS,
+        # per worker process: database.pool.budget split across workers, else pool.max_size
+        'maxPoolSize': config.MONGO_WORKER_POOL_SIZE,
+        'minPoolSize': min(config.MONGO_MIN_POOL_SIZE, config.MONGO_WORKER_POOL_SIZE),
         'retryWrites': True,
         'retryReads': True,
+        'connect': connect,
     }
+    if config.MONGO_MAX_IDLE_TIME_MS:
+        client_options['maxIdleTimeMS'] = config.MONGO_MAX_IDLE_TIME_MS
+    if config.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        client_options['waitQueueTimeoutMS'] = config.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    compressors = _available_compressors(config.MONGO_COMPRESSORS)
+    if compressors:
+        client_options['compressors'] = ','.join(compressors)
 
     # For SRV records (mongodb+srv://), add DNS timeout
     if uri and '+srv' in uri:
         # dnspython timeout is controlled differently
         pass
 
+    listeners = [client_manager.pool_listener]
+    profiler = None
+    if config.QUERY_PROFILER_ENABLED:
+        from fin_server.repository.query_profiler import get_query_profiler
+        profiler = get_query_profiler()
+        listeners.append(profiler)
+    if config.IDENTITY_MAP_ENABLED:
+        from fin_server.repository.identity_map import IdentityMapListener
+        listeners.append(IdentityMapListener())
+    if config.CACHE_ENABLED:
+        from fin_server.repository.cache import CacheInvalidationListener
+        listeners.append(CacheInvalidationListener())
+    client_options['event_listeners'] = listeners
+
     for attempt in range(max_retries):
         try:
             client = MongoClient(uri, **client_options)
-            # Test connection
-            client.admin.command('ping')
-            logger.info("MongoDB connection established successfully")
+            if verify:
+                # Test connection
+                client.admin.command('ping')
+                logger.info("MongoDB connection established successfully")
+            if profiler is not None:
+                profiler.attach(client)
             return client
         except (ConnectionFailure, ConfigurationError) as e:
             logger.warning(f"MongoDB connection attempt {attempt + 1}/{max_retries} failed: {e}")
@@ -52,23 +113,74 @@ def create_mongo_client(uri: str, max_retries: int = 3):
 
 
 class MongoRepo:
+    """Singleton holding the MongoClient, the databases and the repositories.
+
+    Repositories are created lazily on first attribute access (`repo.pond`,
+    `get_collection('pond')`) from `REPOSITORIES`, so boot only pays for the ones
+    it touches and never waits on the server: the client comes from
+    `client_manager`, which creates it without connecting and gives every
+    worker process its own (rebinding the databases and repositories after a
+    fork). Provisioning collections and indexes is an explicit migration step
+    (`migrate()`, scripts/migrate.py).
+    """
     _instance = None
     _client = None
     _is_initialized = False
     _mongo_uri = None
 
+    # Repository attribute -> (database attribute, 'module:Class')
+    REPOSITORIES = {
+        # USER DB REPOSITORIES
+        'users': ('user_db', 'fin_server.repository.user:UserRepository'),
+        'fish_mapping': ('user_db', 'fin_server.repository.user:FishMappingRepository'),
+        'companies': ('user_db', 'fin_server.repository.user:CompanyRepository'),
+        'ai_usage': ('user_db', 'fin_server.repository.user.ai_usage_repository:AIUsageRepository'),
+        'dashboard_snapshot': ('user_db', 'fin_server.repository.user.dashboard_snapshot_repository:DashboardSnapshotRepository'),
+        'refresh_tokens': ('user_db', 'fin_server.repository.user.refresh_token_repository:RefreshTokenRepository'),
+
+        # MEDIA DB REPOSITORIES
+        'message': ('media_db', 'fin_server.repository.media:MessageRepository'),
+        'notification': ('media_db', 'fin_server.repository.media:NotificationRepository'),
+        'notification_queue': ('media_db', 'fin_server.repository.media:NotificationQueueRepository'),
+        'task': ('media_db', 'fin_server.repository.media:TaskRepository'),
+
+        # CHAT/MESSAGING REPOSITORIES (in media_db)
+        'conversations': ('media_db', 'fin_server.repository.media:ConversationRepository'),
+        'chat_messages': ('media_db', 'fin_server.repository.media:ChatMessageRepository'),
+        'message_receipts': ('media_db', 'fin_server.repository.media:MessageReceiptRepository'),
+        'user_presence': ('media_db', 'fin_server.repository.media:UserPresenceRepository'),
+        'user_conversations': ('media_db', 'fin_server.repository.media.user_conversations_repository:UserConversationsRepository'),
+
+        # FISH DB REPOSITORIES
+        'fish': ('fish_db', 'fin_server.repository.fish:FishRepository'),
+        'fish_activity': ('fish_db', 'fin_server.repository.fish:FishActivityRepository'),
+        'fish_analytics': ('fish_db', 'fin_server.repository.fish:FishAnalyticsRepository'),
+        'pond': ('fish_db', 'fin_server.repository.fish:PondRepository'),
+        'pond_event': ('fish_db', 'fin_server.repository.fish:PondEventRepository'),
+        'sampling': ('fish_db', 'fin_server.repository.fish:SamplingRepository'),
+
+        # EXPENSE/TRANSACTION DB REPOSITORIES
+        'expenses': ('expenses_db', 'fin_server.repository.expenses_repository:ExpensesRepository'),
+        'feeding': ('expenses_db', 'fin_server.repository.fish:FeedingRepository'),
+    }
+
+    # Repositories owned by ExpensesRepository: attribute -> (owner attribute, attribute on owner)
+    REPOSITORY_ALIASES = {name: ('expenses', name) for name in (
+        'fin_accounts', 'bank_accounts', 'payment_methods', 'transactions', 'payments', 'bank_statements',
+        'statement_lines', 'reconciliations', 'expense_claims', 'approvals', 'settlement_batches', 'audit_logs',
+    )}
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(MongoRepo, cls).__new__(cls)
             cls._mongo_uri = config.MONGO_URI
-            try:
-                cls._client = create_mongo_client(cls._mongo_uri)
-            except Exception as e:
-                logger.error(f"Failed to initialize MongoDB client: {e}")
-                # Don't raise here - allow app to start, repos will be None
-                cls._client = None
-            if cls._client:
-                cls.init_repositories(cls._instance)
+            started = time.perf_counter()
+            # No ping: the first query connects (waiting up to serverSelectionTimeoutMS)
+            # instead of boot. None when the client cannot be created - allow app to
+            # start, repos will be None
+            cls._client = client_manager.get_client()
+            client_manager.track(cls)
+            _record_startup('mongo_client', time.perf_counter() - started)
             cls._is_initialized = True
         return cls._instance
 
@@ -85,97 +197,73 @@ class MongoRepo:
         return cls._is_initialized and cls._client is not None
 
     def __init__(self):
-        # Use database names from config
-        self.user_db_name = config.USER_DB_NAME
-        self.media_db_name = config.MEDIA_DB_NAME
-        self.expenses_db_name = config.EXPENSES_DB_NAME
-        self.fish_db_name = config.FISH_DB_NAME
-        self.analytics_db_name = config.ANALYTICS_DB_NAME
-
-        # Initialize database references (may be None if client not connected)
-        if self._client:
+        if self.__dict__.get('_initialized'):
+            return
+        self._repo_lock = threading.RLock()
+        self.init_dbs()
+        self._initialized = True
+
+        # Opt-in: run the migration step in the background at boot
+        if self._client and config.INDEX_RECONCILE_ON_STARTUP:
+            from fin_server.utils.threading_util import submit_task
+            submit_task(self.migrate, explain=config.INDEX_EXPLAIN_CHECK)
+
+    def __getattr__(self, name):
+        # Only called for attributes not set yet: create registered repositories on demand
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in self.REPOSITORY_ALIASES:
+            owner_name, attr = self.REPOSITORY_ALIASES[name]
+            owner = getattr(self, owner_name)
+            value = getattr(owner, attr, None) if owner is not None else None
+        elif name in self.REPOSITORIES:
+            value = self._create_repository(name)
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        if value is not None:
+            self.__dict__[name] = value
+        return value
+
+    def _create_repository(self, name):
+        db_attr, path = self.REPOSITORIES[name]
+        with self._repo_lock:
+            if name in self.__dict__:
+                return self.__dict__[name]
+            db = self.__dict__.get(db_attr)
+            if db is None:
+                return None
+            started = time.perf_counter()
             try:
-                self.user_db = self._client[self.user_db_name]
-                self.media_db = self._client[self.media_db_name]
-                self.expenses_db = self._client[self.expenses_db_name]
-                self.fish_db = self._client[self.fish_db_name]
-                self.analytics_db = self._client[self.analytics_db_name]
+                module_name, class_name = path.split(':')
+                repo = getattr(importlib.import_module(module_name), class_name)(db)
             except Exception as e:
-                logger.error(f"Failed to initialize one or more databases: {e}")
-                self.user_db = None
-                self.media_db = None
-                self.expenses_db = None
-                self.fish_db = None
-                self.analytics_db = None
-        else:
-            self.user_db = None
-            self.media_db = None
-            self.expenses_db = None
-            self.fish_db = None
-            self.analytics_db = None
+                logger.exception(f"Error initializing repository '{name}': {e}")
+                return None
+            _record_startup('repositories', time.perf_counter() - started)
+            return repo
 
-        #  USER DB REPOSITORIES
-        self.users: Any = None
-        self.fish_mapping: Any = None
-        self.companies = None
-        self.ai_usage: Any = None
-
-        # MEDIA DB REPOSITORIES
-        self.message: Any = None
-        self.notification: Any = None
-        self.notification_queue: Any = None
-        self.task: Any = None
-
-        # CHAT/MESSAGING REPOSITORIES (in media_db)
-        self.conversations: Any = None
-        self.chat_messages: Any = None
-        self.message_receipts: Any = None
-        self.user_presence: Any = None
-        self.user_conversations: Any = None
-
-        # FISH DB REPOSITORIES
-        self.fish: Any = None
-        self.pond: Any = None
-        self.pond_event: Any = None
-        self.fish_analytics: Any = None
-        self.fish_activity = None
-        self.feedback: Any = None
-        self.feedback_queue: Any = None
-        self.sampling: Any = None
-
-        # EXPENSE/TRANSACTION DB REPOSITORIES
-        self.expenses: Any = None
-        self.fin_accounts = None
-        self.bank_accounts = None
-        self.payment_methods = None
-        self.transactions = None
-        self.payments = None
-        self.bank_statements = None
-        self.statement_lines = None
-        self.reconciliations = None
-        self.expense_claims = None
-        self.approvals = None
-        self.settlement_batches = None
-        self.audit_logs = None
-        self.feeding: Any = None
-
-        if self._client:
-            self.init_repositories()
-        self._is_initialized = True
+    def ping(self, timeout: float = 2.0) -> bool:
+        """True if the server answers a ping within `timeout` seconds."""
+        if not self._client:
+            return False
+        try:
+            with pymongo.timeout(timeout):
+                self._client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.warning(f"MongoDB ping failed: {e}")
+            return False
 
     def init_client(self):
         if self._client is None:
-            try:
-                self._client = create_mongo_client(config.MONGO_URI)
-            except Exception as e:
-                logger.error(f"Failed to initialize MongoDB client: {e}")
-                self._client = None
+            MongoRepo._client = client_manager.get_client()
 
     def init_dbs(self):
         self.init_client()
 
         if not self._client:
             logger.warning("Cannot initialize databases - MongoDB client not connected")
+            self.user_db = self.media_db = self.expenses_db = self.fish_db = self.analytics_db = None
             return
 
         # Use database names from config
@@ -213,7 +301,7 @@ class MongoRepo:
         # Map db object -> required collection names
         db_collections_map = {
             'user_db': (self.user_db, [
-                'users', 'companies', 'ai_usage'
+                'users', 'companies', 'ai_usage', 'dashboard_snapshot', 'refresh_tokens'
             ]),
             'media_db': (self.media_db, [
                 'conversations', 'chat_messages', 'message_receipts', 'user_presence', 'user_conversations',
@@ -223,7 +311,7 @@ class MongoRepo:
                 'expenses', 'transactions', 'bank_accounts', 'fin_accounts', 'payments'
             ]),
             'fish_db': (self.fish_db, [
-                'fish', 'pond', 'pond_event', 'sampling', 'fish_activity'
+                'fish', 'pond', 'pond_event', 'sampling', 'fish_activity', 'fish_analytics_rollup'
             ]),
             'analytics_db': (self.analytics_db, [
                 'fish_analytics'
@@ -252,116 +340,56 @@ class MongoRepo:
                     # If the collection already exists (race) or creation not permitted, ignore
                     logger.warning(f"Could not create collection '{coll_name}' in {db_name}: {e}")
 
-    def _ensure_ttl_indexes(self):
-        """Create TTL indexes for automatic document expiration.
+    def index_targets(self):
+        """Collect (collection, indexes, query shapes) for every registered repository.
 
-        - chat_messages.expires_at: Auto-delete deleted/cleared messages after TTL expires
+        Every registered repository is created (aliases of the same repository
+        are visited once); collections without a repository class come from
+        `indexes.COLLECTION_INDEXES`.
         """
-        if not self._client:
-            return
+        from fin_server.repository.indexes import COLLECTION_INDEXES
 
-        from pymongo import ASCENDING
+        self.init_repositories()
+        targets, seen = [], set()
+        for repo in vars(self).values():
+            # look on the type: pymongo Database/Collection answer any attribute
+            if getattr(type(repo), 'index_specs', None) is None or id(repo) in seen:
+                continue
+            seen.add(id(repo))
+            targets.extend(repo.index_specs())
 
-        # TTL index on chat_messages.expires_at - documents with expires_at in the past get auto-deleted
-        if self.media_db is not None:
-            try:
-                chat_messages_coll = self.media_db['chat_messages']
-                # Create TTL index with expireAfterSeconds=0 means delete when expires_at datetime is reached
-                chat_messages_coll.create_index(
-                    [('expires_at', ASCENDING)],
-                    expireAfterSeconds=0,
-                    name='ttl_expires_at',
-                    sparse=True  # Only index documents that have expires_at field
-                )
-                logger.debug("Created TTL index 'ttl_expires_at' on chat_messages.expires_at")
-            except Exception as e:
-                # Index may already exist or creation failed
-                if 'already exists' not in str(e).lower():
-                    logger.warning(f"Could not create TTL index on chat_messages: {e}")
+        for (db_attr, coll_name), specs in COLLECTION_INDEXES.items():
+            db = getattr(self, db_attr, None)
+            if db is not None:
+                targets.append((db[coll_name], specs.get('indexes', []), specs.get('query_shapes', [])))
+        return targets
+
+    def ensure_indexes(self, explain: bool = False, create: bool = True):
+        """Reconcile declared indexes with the database (see fin_server.repository.indexes)."""
+        from fin_server.repository.indexes import run_index_checks
+        run_index_checks(self.index_targets(), explain=explain, create=create)
 
     def init_repositories(self):
+        """Create every registered repository now (normally created on first access)."""
         if not self._client:
             logger.warning("Cannot initialize repositories - MongoDB client not connected")
             return
+        for name in list(self.REPOSITORIES) + list(self.REPOSITORY_ALIASES):
+            getattr(self, name)
 
-        # Ensure DB objects are initialized and required collections exist
-        try:
-            self.init_dbs()
-            # Create collections under their respective DBs if missing
-            try:
-                self._ensure_collections_created()
-            except Exception as e:
-                logger.warning(f"Error ensuring collections exist: {e}")
-
-            # Create TTL indexes for auto-expiration
-            try:
-                self._ensure_ttl_indexes()
-            except Exception as e:
-                logger.warning(f"Error ensuring TTL indexes: {e}")
-
-            from fin_server.repository.expenses import TransactionsRepository
-            from fin_server.repository.expenses_repository import ExpensesRepository
-            from fin_server.repository.fish import FishRepository, FishActivityRepository, PondEventRepository, PondRepository, \
-                FishAnalyticsRepository, SamplingRepository, FeedingRepository
-            from fin_server.repository.media import (
-                MessageRepository, NotificationRepository, NotificationQueueRepository, TaskRepository,
-                ConversationRepository, ChatMessageRepository, UserPresenceRepository, MessageReceiptRepository
-            )
-            from fin_server.repository.media.user_conversations_repository import UserConversationsRepository
-            from fin_server.repository.user import UserRepository, FishMappingRepository, CompanyRepository
-            from fin_server.repository.user.ai_usage_repository import AIUsageRepository
-
-            # USER DB REPOSITORIES
-            self.users = UserRepository(self.user_db)
-            self.fish_mapping = FishMappingRepository(self.user_db)
-            self.companies = CompanyRepository(self.user_db)
-            self.ai_usage = AIUsageRepository(self.user_db)
-
-            # MEDIA DB REPOSITORIES
-            self.message = MessageRepository(self.media_db)
-            self.notification = NotificationRepository(self.media_db)
-            self.notification_queue = NotificationQueueRepository(self.media_db)
-            self.task = TaskRepository(self.media_db)
-
-            # CHAT/MESSAGING REPOSITORIES (in media_db)
-            if self.media_db is not None:
-                self.conversations = ConversationRepository(self.media_db)
-                self.chat_messages = ChatMessageRepository(self.media_db)
-                self.message_receipts = MessageReceiptRepository(self.media_db)
-                self.user_presence = UserPresenceRepository(self.media_db)
-                self.user_conversations = UserConversationsRepository(self.media_db)
-                logger.debug("Chat/Messaging repositories initialized in media_db")
-
-            # FISH DB REPOSITORIES
-            self.fish = FishRepository(self.fish_db)
-            self.fish_activity = FishActivityRepository(self.fish_db)
-            self.fish_analytics = FishAnalyticsRepository(self.fish_db)
-            self.pond = PondRepository(self.fish_db)
-            self.pond_event = PondEventRepository(self.fish_db)
-            self.sampling = SamplingRepository(self.fish_db)
-
-            # EXPENSE/TRANSACTION DB REPOSITORIES
-            self.expenses = ExpensesRepository(self.expenses_db)
-            self.fin_accounts = self.expenses.fin_accounts
-            self.bank_accounts = self.expenses.bank_accounts
-            self.payment_methods = self.expenses.payment_methods
-            self.transactions = self.expenses.transactions
-            self.payments = self.expenses.payments
-            self.bank_statements = self.expenses.bank_statements
-            self.statement_lines = self.expenses.statement_lines
-            self.reconciliations = self.expenses.reconciliations
-            self.expense_claims = self.expenses.expense_claims
-            self.approvals = self.expenses.approvals
-            self.settlement_batches = self.expenses.settlement_batches
-            self.audit_logs = self.expenses.audit_logs
-
-            self.feeding = FeedingRepository(self.expenses_db)
-
-
-        except Exception as e:
-            logger.error(f"Error initializing repositories: {e}")
-            raise e
+    def migrate(self, create: bool = True, explain: bool = False):
+        """Provision collections and declared indexes (the explicit migration step).
 
+        Args:
+            create: False only reports what is missing (dry run)
+            explain: Also explain declared query shapes and flag collection scans
+        """
+        if not self._client:
+            logger.warning("Cannot migrate - MongoDB client not connected")
+            return
+        if create:
+            self._ensure_collections_created()
+        self.ensure_indexes(explain=explain, create=create)
 
 
 def get_collection(collection_name: str) -> Any:
@@ -381,14 +409,7 @@ def get_collection(collection_name: str) -> Any:
         logger.warning(f"MongoDB not connected, cannot get collection '{collection_name}'")
         return None
 
-    # Ensure repositories are initialized
-    if not MongoRepo.is_initialized():
-        try:
-            repo.init_repositories()
-        except Exception as e:
-            logger.error(f"Failed to initialize repositories: {e}")
-            return None
-
+    # Repositories are created on first access
     coll = getattr(repo, collection_name, None)
     if coll is None:
         logger.warning(f"Repository '{collection_name}' is None")
@@ -412,14 +433,15 @@ def get_collection(collection_name: str) -> Any:
 class CollectionAdapter:
     def __init__(self, collection):
         self._coll = collection
+        client_manager.track(self)
 
-    def find(self, query=None, *args, **kwargs):
+    def find(self, query=None, *args, fields=None, **kwargs):
         if query is None:
             query = {}
+        if fields is not None:
+            kwargs['projection'] = projection(fields)
         # Return the raw pymongo Cursor so callers can chain sort/limit
         return self._coll.find(query, *args, **kwargs)
 
-    def find_many(self, query=None, *args, **kwargs):
-        if query is None:
-            query = {}
-        return list(self._coll.find(query, *args, **kwargs))
+    def find_many(self, query=None, *args, fields=None, **kwargs):
+        return list(self.find(query, *args, fields=fields, **kwargs))
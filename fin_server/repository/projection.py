@@ -0,0 +1,51 @@
+"""Field projections for repository reads.
+
+Repository `find` / `find_one` / `find_many` accept `fields=`:
+- an iterable of (dotted) field names to return (`_id` is always included), or
+- a pymongo projection dict passed through unchanged, e.g. `{'password': 0}`;
+- None (the default) returns whole documents.
+
+Callers declare the fields they actually read so less BSON crosses the wire
+and is decoded.
+
+API:
+- projection(fields) -> pymongo projection dict or None
+- project_document(doc, fields) -> doc trimmed to a top-level field list
+- projects_locally(fields) -> True when `project_document` can apply `fields`
+"""
+from typing import Any, Dict, Iterable, Optional, Union
+
+Fields = Optional[Union[Iterable[str], Dict[str, Any]]]
+
+
+def projection(fields: Fields) -> Optional[Dict[str, Any]]:
+    """Return the pymongo projection for `fields` (None for whole documents)."""
+    if fields is None:
+        return None
+    if isinstance(fields, dict):
+        return dict(fields)
+    if isinstance(fields, str):
+        fields = [fields]
+    return {field: 1 for field in fields}
+
+
+def projects_locally(fields: Fields) -> bool:
+    """True when `fields` is a list of top-level names that `project_document` can apply."""
+    if fields is None or isinstance(fields, dict):
+        return False
+    if isinstance(fields, str):
+        fields = [fields]
+    return all('.' not in field and not field.startswith('$') for field in fields)
+
+
+def project_document(doc: Optional[Dict[str, Any]], fields: Fields) -> Optional[Dict[str, Any]]:
+    """Trim an already fetched document to `fields` (see `projects_locally`)."""
+    if doc is None or fields is None:
+        return doc
+    if isinstance(fields, str):
+        fields = [fields]
+    out = {'_id': doc['_id']} if '_id' in doc else {}
+    for field in fields:
+        if field in doc:
+            out[field] = doc[field]
+    return out
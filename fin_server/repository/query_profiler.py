@@ -0,0 +1,317 @@
+"""Query-shape profiler built on pymongo command monitoring.
+
+A `QueryProfiler` is registered as a command listener on the shared MongoClient
+(see `create_mongo_client`), so it sees every query issued through
+`BaseRepository`, `CollectionAdapter` and the raw collections returned by
+`get_collection` alike.
+
+Each read/write command is reduced to a normalized shape (namespace, command and
+filter/sort/pipeline with every literal value replaced by '?') and aggregated:
+- call count, errors, total/avg/max latency and a latency histogram,
+- documents returned (first batch plus getMore batches),
+- the routes that issued it (`METHOD endpoint`, set per request by server.py).
+
+The first time a read shape is seen (and again every `EXPLAIN_INTERVAL` seconds)
+one sample is explained with `executionStats` on the background pool to get the
+winning plan and docs/keys examined. A shape is flagged when its plan contains a
+COLLSCAN or when docs examined / returned reaches
+`config.QUERY_PROFILER_EXAMINED_RATIO`.
+
+Stats are exposed on GET /metrics under `mongo_queries`.
+
+API:
+- get_query_profiler() -> QueryProfiler (process singleton)
+- set_query_route(route) -> token / reset_query_route(token)
+- QueryProfiler.stats() / QueryProfiler.reset()
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+from config import config
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# Commands that carry a query shape; everything else (hello, ping, ...) is ignored
+PROFILED_COMMANDS = ('find', 'aggregate', 'count', 'distinct', 'findAndModify', 'update', 'delete', 'insert')
+EXPLAINABLE_COMMANDS = ('find', 'aggregate', 'count', 'distinct')
+
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+EXPLAIN_INTERVAL = 600
+MAX_ROUTES_PER_SHAPE = 20
+
+# Command fields that are session/transport details, not part of the query
+_TRANSPORT_FIELDS = ('lsid', '$clusterTime', '$db', 'txnNumber', '$readPreference', 'readConcern',
+                     'writeConcern', 'apiVersion', 'apiStrict', 'apiDeprecationErrors',
+                     'startTransaction', 'autocommit', 'comment', 'maxTimeMS')
+
+_route: ContextVar[Optional[str]] = ContextVar('query_route', default=None)
+
+
+def set_query_route(route: Optional[str]):
+    """Attribute queries issued from the current context to `route`."""
+    return _route.set(route)
+
+
+def reset_query_route(token):
+    _route.reset(token)
+
+
+def _normalize(value):
+    """Replace literal values with '?', keeping operators and `$field` references."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(item) for item in value]
+        # `$in: [a, b, c]` and `$in: [a]` are the same shape
+        return items[:1] if items and all(item == '?' for item in items) else items
+    if isinstance(value, str) and value.startswith('$'):
+        return value
+    return '?'
+
+
+def _shape(command_name: str, command: Dict[str, Any]) -> Dict[str, Any]:
+    if command_name == 'find':
+        return {key: _normalize(command[key]) for key in ('filter', 'sort', 'projection') if command.get(key)}
+    if command_name == 'aggregate':
+        return {'pipeline': _normalize(command.get('pipeline') or [])}
+    if command_name in ('count', 'distinct'):
+        shape = {'query': _normalize(command.get('query') or {})}
+        if command.get('key'):
+            shape['key'] = command['key']
+        return shape
+    if command_name == 'findAndModify':
+        return {'query': _normalize(command.get('query') or {}), 'sort': _normalize(command.get('sort') or {}),
+                'update': _normalize(command.get('update')), 'remove': bool(command.get('remove'))}
+    if command_name in ('update', 'delete'):
+        statements = command.get('updates' if command_name == 'update' else 'deletes') or []
+        first = statements[0] if statements else {}
+        return {'q': _normalize(first.get('q') or {}),
+                'multi': bool(first.get('multi') or first.get('limit') == 0)}
+    return {}
+
+
+def _walk(plan, key):
+    """Yield every value of `key` in an explain document, ignoring rejected plans."""
+    if isinstance(plan, dict):
+        for name, value in plan.items():
+            if name in ('rejectedPlans', 'allPlansExecution'):
+                continue
+            if name == key:
+                yield value
+            yield from _walk(value, key)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _walk(item, key)
+
+
+def _explain_summary(explain: Dict[str, Any]) -> Dict[str, Any]:
+    stages = [stage for stage in _walk(explain, 'stage') if isinstance(stage, str)]
+    return {
+        'plan': stages,
+        'docs_examined': sum(v for v in _walk(explain, 'totalDocsExamined') if isinstance(v, int)),
+        'keys_examined': sum(v for v in _walk(explain, 'totalKeysExamined') if isinstance(v, int)),
+        'explain_returned': next((v for v in _walk(explain, 'nReturned') if isinstance(v, int)), 0),
+    }
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Command listener that aggregates per-shape query statistics."""
+
+    def __init__(self, explain: bool = True, examined_ratio: float = 10.0, max_shapes: int = 500):
+        self.explain = explain
+        self.examined_ratio = examined_ratio
+        self.max_shapes = max_shapes
+        self._client = None
+        self._lock = Lock()
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[int, tuple] = {}   # request_id -> (shape key, route, (database, sample command))
+        self._cursors: Dict[int, str] = {}     # open cursor id -> shape key (for getMore)
+        self._dropped = 0
+
+    def attach(self, client):
+        """Client used to run explain samples (the one this listener is registered on)."""
+        self._client = client
+
+    # --- CommandListener -----------------------------------------------------
+
+    def started(self, event):
+        name = event.command_name
+        if name == 'getMore':
+            self._pending[event.request_id] = (event.command.get('getMore'), None, None)
+            return
+        if name not in PROFILED_COMMANDS:
+            return
+        command = event.command
+        collection = command.get(name)
+        if not isinstance(collection, str):
+            return
+        shape = _shape(name, command)
+        key = f"{event.database_name}.{collection} {name} {json.dumps(shape, default=str)}"
+        sample = None
+        if self.explain and name in EXPLAINABLE_COMMANDS:
+            sample = (event.database_name, {k: v for k, v in command.items() if k not in _TRANSPORT_FIELDS})
+        with self._lock:
+            if key not in self._shapes:
+                if len(self._shapes) >= self.max_shapes:
+                    self._dropped += 1
+                    return
+                self._shapes[key] = {
+                    'namespace': f'{event.database_name}.{collection}', 'command': name, 'shape': shape,
+                    'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1), 'returned': 0, 'routes': {},
+                    'flags': [], 'explained_at': None,
+                }
+            self._pending[event.request_id] = (key, _route.get(), sample)
+
+    def succeeded(self, event):
+        pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+        key, route, sample = pending
+        reply = event.reply or {}
+        cursor = reply.get('cursor') if isinstance(reply.get('cursor'), dict) else None
+
+        if event.command_name == 'getMore':
+            # `key` holds the cursor id here
+            if cursor:
+                with self._lock:
+                    shape_key = self._cursors.get(key)
+                    if shape_key in self._shapes:
+                        self._shapes[shape_key]['returned'] += len(cursor.get('nextBatch') or [])
+                    if not cursor.get('id'):
+                        self._cursors.pop(key, None)
+            return
+
+        if cursor is not None:
+            returned = len(cursor.get('firstBatch') or [])
+        elif event.command_name == 'distinct':
+            returned = len(reply.get('values') or [])
+        else:
+            returned = reply.get('n', 0) if isinstance(reply.get('n'), int) else 0
+
+        explain_sample = None
+        with self._lock:
+            entry = self._record(key, route, event.duration_micros)
+            if entry is None:
+                return
+            entry['returned'] += returned
+            if cursor and cursor.get('id') and len(self._cursors) < self.max_shapes * 4:
+                self._cursors[cursor['id']] = key
+            if sample is not None and self._client is not None and (
+                    entry['explained_at'] is None or time.time() - entry['explained_at'] > EXPLAIN_INTERVAL):
+                entry['explained_at'] = time.time()
+                explain_sample = sample
+        if explain_sample is not None:
+            self._schedule_explain(key, *explain_sample)
+
+    def failed(self, event):
+        pending = self._pending.pop(event.request_id, None)
+        if pending is None or event.command_name == 'getMore':
+            return
+        key, route, _ = pending
+        with self._lock:
+            entry = self._record(key, route, event.duration_micros)
+            if entry is not None:
+                entry['errors'] += 1
+
+    # --- internals -----------------------------------------------------------
+
+    def _record(self, key, route, duration_micros):
+        entry = self._shapes.get(key)
+        if entry is None:
+            return None
+        ms = duration_micros / 1000.0
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+        entry['histogram'][bucket] += 1
+        route = route or 'background'
+        if route in entry['routes'] or len(entry['routes']) < MAX_ROUTES_PER_SHAPE:
+            entry['routes'][route] = entry['routes'].get(route, 0) + 1
+        return entry
+
+    def _schedule_explain(self, key, database_name, sample):
+        from fin_server.utils.threading_util import submit_task
+        try:
+            submit_task(self._explain, key, database_name, sample)
+        except RuntimeError:
+            pass  # pool shut down
+
+    def _explain(self, key, database_name, sample):
+        try:
+            explain = self._client[database_name].command({'explain': sample, 'verbosity': 'executionStats'})
+        except Exception as e:
+            logger.debug(f"Could not explain query shape {key}: {e}")
+            return
+        summary = _explain_summary(explain)
+        flags = []
+        if 'COLLSCAN' in summary['plan']:
+            flags.append('COLLSCAN')
+        if summary['docs_examined'] / max(summary['explain_returned'], 1) >= self.examined_ratio:
+            flags.append('examined_ratio')
+        with self._lock:
+            entry = self._shapes.get(key)
+            if entry is None:
+                return
+            newly_flagged = flags and not entry.get('flags')
+            entry.update(summary, flags=flags)
+        if newly_flagged:
+            logger.warning(f"Slow query shape ({', '.join(flags)}): {key} "
+                           f"examined {summary['docs_examined']} docs for {summary['explain_returned']} returned")
+
+    # --- reporting -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-shape statistics, slowest (by total time) first."""
+        labels = [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+        with self._lock:
+            shapes, flagged = [], []
+            for key, entry in self._shapes.items():
+                count = entry['count']
+                item = {k: v for k, v in entry.items() if k not in ('histogram', 'explained_at')}
+                item['total_ms'] = round(entry['total_ms'], 2)
+                item['max_ms'] = round(entry['max_ms'], 2)
+                item['avg_ms'] = round(entry['total_ms'] / count, 2) if count else 0.0
+                item['histogram'] = dict(zip(labels, entry['histogram']))
+                item['routes'] = dict(entry['routes'])
+                shapes.append(item)
+                if entry.get('flags'):
+                    flagged.append(key)
+            dropped = self._dropped
+        shapes.sort(key=lambda item: item['total_ms'], reverse=True)
+        return {
+            'shapes': shapes,
+            'flagged': flagged,
+            'dropped_shapes': dropped,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+            self._cursors.clear()
+            self._dropped = 0
+
+
+_profiler: Optional[QueryProfiler] = None
+_profiler_lock = Lock()
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Return the process-wide profiler (registered under `mongo_queries` in /metrics)."""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = QueryProfiler(explain=config.QUERY_PROFILER_EXPLAIN,
+                                          examined_ratio=config.QUERY_PROFILER_EXAMINED_RATIO,
+                                          max_shapes=config.QUERY_PROFILER_MAX_SHAPES)
+                metrics_collector.register_provider('mongo_queries', _profiler.stats)
+    return _profiler
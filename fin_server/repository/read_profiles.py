@@ -0,0 +1,80 @@
+"""Named read profiles for repository collections.
+
+A read profile maps a name to a read preference (and optional read concern /
+max staleness), configured under `database.read_profiles` in config/settings.py:
+
+    primary    - default; reads that must see the latest write
+    ledger     - expenses/transactions; always primary
+    analytics  - reporting reads that tolerate replication lag (secondaryPreferred)
+    dashboard  - dashboard card reads (secondaryPreferred)
+
+Repositories declare the profile their reads use with the `READ_PROFILE` class
+attribute; `BaseRepository` binds `self.collection` with it. Writes always go to
+the primary regardless of the profile.
+
+API:
+- read_profile_options(profile) -> with_options() kwargs (empty for primary)
+- apply_read_profile(collection, profile) -> collection bound to the profile
+"""
+import logging
+from typing import Any, Dict
+
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'primary'
+
+_MODES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest,
+}
+
+_options_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def read_profile_options(profile: str) -> Dict[str, Any]:
+    """Return the `with_options()` kwargs for a named profile.
+
+    Unknown profiles and invalid settings fall back to the client defaults
+    (primary) with a warning.
+    """
+    if profile in _options_cache:
+        return _options_cache[profile]
+
+    options: Dict[str, Any] = {}
+    settings = config.MONGO_READ_PROFILES.get(profile)
+    if settings is None:
+        logger.warning(f"Unknown read profile '{profile}', using primary")
+    else:
+        mode = settings.get('read_preference', PRIMARY)
+        try:
+            if mode not in _MODES:
+                raise ValueError(f"unknown read preference '{mode}'")
+            if mode != PRIMARY:
+                staleness = settings.get('max_staleness_seconds')
+                options['read_preference'] = _MODES[mode](max_staleness=int(staleness) if staleness else -1)
+            if settings.get('read_concern'):
+                options['read_concern'] = ReadConcern(settings['read_concern'])
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid read profile '{profile}' ({e}), using primary")
+            options = {}
+
+    _options_cache[profile] = options
+    return options
+
+
+def apply_read_profile(collection, profile: str):
+    """Return `collection` bound to `profile` (unchanged for primary)."""
+    if collection is None:
+        return None
+    options = read_profile_options(profile)
+    if not options or not hasattr(collection, 'with_options'):
+        return collection
+    return collection.with_options(**options)
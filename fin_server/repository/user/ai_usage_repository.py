@@ -8,13 +8,25 @@ This module provides storage for AI API usage metrics including:
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 
+from pymongo import IndexModel
+
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class AIUsageRepository(BaseRepository):
     """Repository for AI usage tracking."""
 
     _instance = None
+    READ_PROFILE = 'analytics'
+
+    INDEXES = [
+        IndexModel([('account_key', 1)], name='ai_usage_account', background=True),
+        IndexModel([('user_key', 1)], name='ai_usage_user', background=True),
+        IndexModel([('request_id', 1)], unique=True, name='ai_usage_request', background=True),
+        IndexModel([('created_at', -1)], name='ai_usage_date', background=True),
+        IndexModel([('account_key', 1), ('created_at', -1)], name='ai_usage_account_date', background=True),
+    ]
 
     def __new__(cls, db, collection_name="ai_usage"):
         if cls._instance is None:
@@ -26,21 +38,9 @@ class AIUsageRepository(BaseRepository):
         if not getattr(self, "_initialized", False):
             super().__init__(db=db, collection_name=collection_name)
             self.collection_name = collection_name
-            self._create_indexes()
             print(f"Initializing {self.collection_name} collection")
             self._initialized = True
 
-    def _create_indexes(self):
-        """Create indexes for efficient querying."""
-        try:
-            self.collection.create_index([('account_key', 1)], name='ai_usage_account')
-            self.collection.create_index([('user_key', 1)], name='ai_usage_user')
-            self.collection.create_index([('request_id', 1)], unique=True, name='ai_usage_request')
-            self.collection.create_index([('created_at', -1)], name='ai_usage_date')
-            self.collection.create_index([('account_key', 1), ('created_at', -1)], name='ai_usage_account_date')
-        except Exception:
-            pass
-
     # =========================================================================
     # Core CRUD Operations
     # =========================================================================
@@ -52,15 +52,16 @@ class AIUsageRepository(BaseRepository):
         result = self.collection.insert_one(data)
         return str(result.inserted_id)
 
-    def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def find_one(self, query: Dict[str, Any], fields=None) -> Optional[Dict[str, Any]]:
         """Find a single usage record."""
-        return self.collection.find_one(query)
+        return self.collection.find_one(query, projection(fields))
 
-    def find_many(self, query: Dict[str, Any] = None, limit: int = 100, skip: int = 0, sort: List = None) -> List[Dict[str, Any]]:
+    def find_many(self, query: Dict[str, Any] = None, limit: int = 100, skip: int = 0, sort: List = None,
+                  fields=None) -> List[Dict[str, Any]]:
         """Find multiple usage records."""
         if query is None:
             query = {}
-        cursor = self.collection.find(query)
+        cursor = self.collection.find(query, projection(fields))
         if sort:
             cursor = cursor.sort(sort)
         else:
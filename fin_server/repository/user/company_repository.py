@@ -3,12 +3,15 @@
 This module provides CRUD operations for company documents.
 """
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 
 class CompanyRepository(BaseRepository):
     """Repository for company collection operations."""
 
     _instance = None
+    IDENTITY_KEYS = ('account_key',)
+    CACHE_KEY = 'account_key'
 
     def __new__(cls, db, collection_name="companies"):
         if cls._instance is None:
@@ -32,19 +35,15 @@ class CompanyRepository(BaseRepository):
                 raise ValueError(f"Company with account_key '{account_key}' already exists.")
         return str(self.collection.insert_one(data).inserted_id)
 
-    def find(self, query=None, *args, **kwargs):
+    def find(self, query=None, *args, fields=None, **kwargs):
         """Find companies matching query."""
-        return self.find_many(query)
+        return self.find_many(query, fields=fields)
 
-    def find_one(self, query):
-        """Find a single company."""
-        return self.collection.find_one(query)
-
-    def find_many(self, query=None, limit=0, skip=0, sort=None):
+    def find_many(self, query=None, limit=0, skip=0, sort=None, fields=None):
         """Find multiple companies."""
         if query is None:
             query = {}
-        cursor = self.collection.find(query)
+        cursor = self.collection.find(query, projection(fields))
         if sort:
             cursor = cursor.sort(sort)
         if skip:
@@ -113,14 +112,18 @@ class CompanyRepository(BaseRepository):
         """
         from fin_server.repository.mongo_helper import get_collection
         users_coll = get_collection('users')
-        users = list(users_coll.find({'account_key': account_key}))
+        refresh_tokens = get_collection('refresh_tokens')
+        users = list(users_coll.find({'account_key': account_key}, fields={
+            'user_key': 1, 'username': 1, 'roles': 1, 'joined_date': 1}))
+        active = refresh_tokens.active_user_keys(u.get('user_key') for u in users) \
+            if refresh_tokens is not None else set()
         return [
             {
                 'user_key': u.get('user_key'),
                 'username': u.get('username'),
                 'roles': u.get('roles', []),
                 'joined_date': u.get('joined_date'),
-                'active': bool(u.get('refresh_tokens'))
+                'active': u.get('user_key') in active
             }
             for u in users
         ]
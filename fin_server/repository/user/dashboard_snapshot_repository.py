@@ -0,0 +1,86 @@
+"""Dashboard snapshot repository.
+
+One document per account (`_id` = account_key) holding the precomputed
+dashboard cards and recent alerts served by GET /api/dashboard. The document is
+maintained by `fin_server.services.dashboard_service`; write paths only bump
+counters or flag parts as stale, so this repository keeps the primitives small.
+
+Reads stay on the primary (the default profile): the snapshot's `version` and
+stale flags guard the recompute writes, so a lagging copy would drop them.
+Only the card queries in dashboard_service use the `dashboard` profile.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from fin_server.repository.base_repository import BaseRepository
+
+
+class DashboardSnapshotRepository(BaseRepository):
+    """Repository for per-account dashboard snapshots."""
+
+    _instance = None
+
+    def __new__(cls, db, collection_name="dashboard_snapshot"):
+        if cls._instance is None:
+            cls._instance = super(DashboardSnapshotRepository, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, db, collection_name="dashboard_snapshot"):
+        if not getattr(self, "_initialized", False):
+            super().__init__(db=db, collection_name=collection_name)
+            self.collection_name = collection_name
+            print(f"Initializing {self.collection_name} collection")
+            self._initialized = True
+
+    def get(self, account_key: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot for an account (primary key read)."""
+        return self.collection.find_one({'_id': account_key})
+
+    def store_recompute(self, account_key: str, snapshot: Dict[str, Any], version: Optional[int] = None) -> bool:
+        """Store a full recompute whose queries ran after the snapshot was at `version`.
+
+        The write only applies while the snapshot is still at `version`, so a
+        counter change recorded during the recompute is not overwritten; the
+        existing snapshot is kept and the next read recomputes again. With
+        `version` None (no snapshot was read) the snapshot is only created if
+        none exists yet. Returns True if the recompute was stored.
+        """
+        fields = dict(snapshot)
+        fields.pop('_id', None)
+        fields.pop('version', None)
+        if version is None:
+            res = self.collection.update_one({'_id': account_key}, {'$setOnInsert': dict(fields, version=0)},
+                                             upsert=True)
+            return res.upserted_id is not None
+        res = self.collection.update_one({'_id': account_key, 'version': version},
+                                         {'$set': fields, '$inc': {'version': 1}}, upsert=False)
+        return res.modified_count > 0
+
+    def apply_change(self, account_key: str, inc: Optional[Dict[str, Any]] = None,
+                     stale: Iterable[str] = ()):
+        """Increment card counters and/or flag parts stale on an existing snapshot.
+
+        Never upserts: an account without a snapshot gets a full recompute on its
+        next read anyway. Every change bumps `version` so concurrent partial
+        refreshes can detect that they raced with a write.
+        """
+        update: Dict[str, Any] = {'$inc': {'version': 1}}
+        for field, delta in (inc or {}).items():
+            update['$inc'][f'cards.{field}'] = delta
+        flags = {f'stale.{part}': True for part in stale}
+        if flags:
+            update['$set'] = flags
+        return self.collection.update_one({'_id': account_key}, update, upsert=False)
+
+    def refresh_parts(self, account_key: str, version: int, set_fields: Dict[str, Any],
+                      parts: Iterable[str]):
+        """Store recomputed parts and clear their stale flags.
+
+        Only applies if the snapshot is still at `version`; a write that landed
+        in between leaves the flags in place for the next read.
+        """
+        update = {
+            '$set': set_fields,
+            '$unset': {f'stale.{part}': '' for part in parts},
+        }
+        return self.collection.update_one({'_id': account_key, 'version': version}, update, upsert=False)
@@ -3,6 +3,8 @@ from fin_server.utils.time_utils import get_time_date_dt
 
 class FishMappingRepository(BaseRepository):
     _instance = None
+    IDENTITY_KEYS = ('account_key',)
+    CACHE_KEY = 'account_key'
 
     def __new__(cls, db, collection_name="fish_mapping"):
         if cls._instance is None:
@@ -20,8 +22,6 @@ class FishMappingRepository(BaseRepository):
     def update_one(self, *args, **kwargs):
         return self.collection.update_one(*args, **kwargs)
 
-    def find_one(self, *args, **kwargs):
-        return self.collection.find_one(*args, **kwargs)
     # Add more methods as needed
 
     def create_or_update_mapping(self, fish_doc):
@@ -44,5 +44,5 @@ class FishMappingRepository(BaseRepository):
             return None
 
     def get_fish_ids_for_account(self, account_key):
-        doc = self.collection.find_one({'account_key': account_key})
+        doc = self.find_one({'account_key': account_key})
         return doc.get('fish_ids', []) if doc else []
@@ -5,17 +5,38 @@ Collections in user_db:
 - permissions: Permission definitions (catalog)
 - user_permissions: User-specific permission overrides
 - permission_requests: Access requests from users
+
+Effective permissions are read through the shared cache per
+(user_key, account_key, role) for `cache.permissions_ttl_seconds`. Role and
+user-override writes made here drop them in every worker.
 """
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from pymongo.collection import Collection
+
+from config import config
+from fin_server.repository.cache import get_shared_cache, read_through, register_collection
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.time_utils import get_time_date_dt
 from fin_server.utils.generator import generate_uuid_hex
 
 logger = logging.getLogger(__name__)
 
+EFFECTIVE_PERMISSIONS_NAMESPACE = 'effective_permissions'
+
+
+def invalidate_effective_permissions():
+    """Drop every cached effective-permission entry (here and in the other workers).
+
+    Permission writes are rare admin actions and a role change affects every
+    user holding the role, so the whole namespace is dropped.
+    """
+    cache = get_shared_cache()
+    if cache is not None:
+        cache.invalidate(EFFECTIVE_PERMISSIONS_NAMESPACE)
+
 
 class PermissionRepository:
     """Repository for managing permissions in MongoDB."""
@@ -119,6 +140,7 @@ class PermissionRepository:
             }
 
             self.roles_collection.insert_one(role_doc)
+            invalidate_effective_permissions()
             logger.info(f"Created role: {role_code}")
             return role_doc
         except Exception as e:
@@ -129,31 +151,45 @@ class PermissionRepository:
         """Get role by code.
 
         First checks for account-specific role, then falls back to global.
+        Read through the shared cache; any write to the roles collection
+        invalidates it.
         """
         if not self.roles_collection:
             return None
 
         try:
-            # First try account-specific role
-            if account_key:
-                role = self.roles_collection.find_one({
-                    'role_code': role_code.lower(),
-                    'account_key': account_key,
-                    'active': True
-                })
-                if role:
-                    return role
-
-            # Fall back to global role
+            namespace = self._roles_namespace()
+            return read_through(namespace, f"{role_code.lower()}|{account_key or ''}",
+                                lambda: self._find_role(role_code, account_key))
+        except Exception as e:
+            logger.exception(f"Error getting role: {e}")
+            return None
+
+    def _roles_namespace(self) -> str:
+        coll = self.roles_collection
+        if not isinstance(coll, Collection):
+            coll = getattr(coll, 'collection', None) or getattr(coll, '_coll', None)
+        namespace = getattr(coll, 'full_name', None) or 'roles'
+        register_collection(namespace)
+        return namespace
+
+    def _find_role(self, role_code: str, account_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        # First try account-specific role
+        if account_key:
             role = self.roles_collection.find_one({
                 'role_code': role_code.lower(),
-                'scope': 'global',
+                'account_key': account_key,
                 'active': True
             })
-            return role
-        except Exception as e:
-            logger.exception(f"Error getting role: {e}")
-            return None
+            if role:
+                return role
+
+        # Fall back to global role
+        return self.roles_collection.find_one({
+            'role_code': role_code.lower(),
+            'scope': 'global',
+            'active': True
+        })
 
     def get_all_roles(self, account_key: Optional[str] = None, include_global: bool = True) -> List[Dict[str, Any]]:
         """Get all available roles for an account. Falls back to defaults."""
@@ -210,6 +246,7 @@ class PermissionRepository:
                 updates['updated_by'] = updated_by
 
             result = self.roles_collection.update_one(query, {'$set': updates})
+            invalidate_effective_permissions()
             return result.modified_count > 0
         except Exception as e:
             logger.exception(f"Error updating role: {e}")
@@ -232,6 +269,7 @@ class PermissionRepository:
                     'deleted_by': deleted_by
                 }
             })
+            invalidate_effective_permissions()
             return result.modified_count > 0
         except Exception as e:
             logger.exception(f"Error deleting role: {e}")
@@ -418,6 +456,7 @@ class PermissionRepository:
                 },
                 upsert=True
             )
+            invalidate_effective_permissions()
 
             return result.modified_count > 0 or result.upserted_id is not None
         except Exception as e:
@@ -448,6 +487,7 @@ class PermissionRepository:
                 },
                 upsert=True
             )
+            invalidate_effective_permissions()
 
             self._log_permission_change(
                 user_key=user_key,
@@ -486,6 +526,7 @@ class PermissionRepository:
                 },
                 upsert=True
             )
+            invalidate_effective_permissions()
 
             self._log_permission_change(
                 user_key=user_key,
@@ -536,6 +577,7 @@ class PermissionRepository:
                 update,
                 upsert=True
             )
+            invalidate_effective_permissions()
 
             return True
         except Exception as e:
@@ -713,7 +755,15 @@ class PermissionRepository:
                 - denied_permissions: Explicitly denied permissions
                 - effective_permissions: Final computed permissions
                 - assigned_ponds: Ponds user can access (None = all)
+
+        Read through the shared cache; the writes in this repository that
+        change a role or a user's overrides invalidate it.
         """
+        return read_through(EFFECTIVE_PERMISSIONS_NAMESPACE, f"{user_key}|{account_key}|{(role_code or '').lower()}",
+                            lambda: self._compute_effective_permissions(user_key, account_key, role_code),
+                            ttl=config.CACHE_PERMISSIONS_TTL_SECONDS)
+
+    def _compute_effective_permissions(self, user_key: str, account_key: str, role_code: str) -> Dict[str, Any]:
         # Get role permissions
         role = self.get_role(role_code, account_key)
         role_permissions = set(role.get('permissions', [])) if role else set()
@@ -0,0 +1,150 @@
+"""Refresh token repository.
+
+One document per issued refresh token (one per signed-in device), stored in
+user_db.refresh_tokens instead of an array on the user document:
+
+    {_id: sha256(token), user_key, account_key, created_at, last_used_at,
+     expires_at, device: {device_id, user_agent, ip}}
+
+The token itself is never stored. Validating or revoking a token is a primary
+key lookup / delete on its hash, and refreshing or logging out never reads or
+rewrites the user document. Expired tokens are removed by the TTL index on
+`expires_at`; reads also filter on it, since the TTL monitor runs only about
+once a minute.
+
+API:
+- hash_token(token) -> session id
+- store(token, user_key, account_key, expires_at, device=None, max_sessions=None) -> session id
+- get_active(token) -> session document or None
+- revoke(token) / revoke_session(user_key, session_id) / revoke_user(user_key) -> deleted count
+- list_sessions(user_key) -> sessions, most recently used first
+- has_active(user_key) / active_user_keys(user_keys) / count_active_users(account_key)
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pymongo import IndexModel
+
+from fin_server.repository.base_repository import BaseRepository
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RefreshTokenRepository(BaseRepository):
+    """Repository for refresh tokens, keyed by token hash."""
+
+    _instance = None
+
+    INDEXES = [
+        IndexModel([('expires_at', 1)], name='ttl_expires_at', expireAfterSeconds=0, background=True),
+        IndexModel([('user_key', 1), ('created_at', -1)], name='refresh_tokens_user', background=True),
+        IndexModel([('account_key', 1), ('user_key', 1)], name='refresh_tokens_account', background=True),
+    ]
+    QUERY_SHAPES = [
+        {'name': 'list_sessions', 'filter': {'user_key': 'U', 'expires_at': {'$gt': 'T'}},
+         'sort': [('created_at', -1)]},
+        {'name': 'active_users', 'filter': {'account_key': 'A', 'expires_at': {'$gt': 'T'}}},
+    ]
+
+    def __new__(cls, db, collection_name="refresh_tokens"):
+        if cls._instance is None:
+            cls._instance = super(RefreshTokenRepository, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, db, collection_name="refresh_tokens"):
+        if not getattr(self, "_initialized", False):
+            super().__init__(db=db, collection_name=collection_name)
+            self.collection_name = collection_name
+            print(f"Initializing {self.collection_name} collection")
+            self._initialized = True
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    # =========================================================================
+    # Issue / validate
+    # =========================================================================
+
+    def store(self, token: str, user_key: str, account_key: Optional[str], expires_at: datetime,
+              device: Optional[Dict[str, Any]] = None, max_sessions: Optional[int] = None) -> str:
+        """Record a newly issued refresh token and return its session id.
+
+        A token issued to a device that already has one replaces it; beyond
+        `max_sessions` live tokens per user, the oldest are revoked.
+        """
+        device = {k: v for k, v in (device or {}).items() if v}
+        if device.get('device_id'):
+            self.collection.delete_many({'user_key': user_key, 'device.device_id': device['device_id']})
+        now = _now()
+        session_id = self.hash_token(token)
+        self.collection.insert_one({
+            '_id': session_id,
+            'user_key': user_key,
+            'account_key': account_key,
+            'created_at': now,
+            'last_used_at': now,
+            'expires_at': expires_at,
+            'device': device,
+        })
+        if max_sessions:
+            surplus = self.collection.find({'user_key': user_key}, {'_id': 1}) \
+                .sort('created_at', -1).skip(max_sessions)
+            ids = [doc['_id'] for doc in surplus]
+            if ids:
+                self.collection.delete_many({'_id': {'$in': ids}})
+        return session_id
+
+    def get_active(self, token: str) -> Optional[Dict[str, Any]]:
+        """Unexpired session document for `token`, or None if unknown, revoked or expired."""
+        return self.collection.find_one({'_id': self.hash_token(token), 'expires_at': {'$gt': _now()}})
+
+    def touch(self, session_id: str) -> None:
+        self.collection.update_one({'_id': session_id}, {'$set': {'last_used_at': _now()}})
+
+    # =========================================================================
+    # Revocation
+    # =========================================================================
+
+    def revoke(self, token: str) -> int:
+        return self.collection.delete_one({'_id': self.hash_token(token)}).deleted_count
+
+    def revoke_session(self, user_key: str, session_id: str) -> int:
+        return self.collection.delete_one({'_id': session_id, 'user_key': user_key}).deleted_count
+
+    def revoke_user(self, user_key: str) -> int:
+        """Revoke every refresh token of a user (logout from all devices)."""
+        return self.collection.delete_many({'user_key': user_key}).deleted_count
+
+    # =========================================================================
+    # Sessions
+    # =========================================================================
+
+    def list_sessions(self, user_key: str) -> List[Dict[str, Any]]:
+        cursor = self.collection.find({'user_key': user_key, 'expires_at': {'$gt': _now()}}) \
+            .sort('created_at', -1)
+        sessions = []
+        for doc in cursor:
+            doc['session_id'] = doc.pop('_id')
+            sessions.append(doc)
+        sessions.sort(key=lambda s: s.get('last_used_at') or s['created_at'], reverse=True)
+        return sessions
+
+    def has_active(self, user_key: str) -> bool:
+        return self.collection.find_one({'user_key': user_key, 'expires_at': {'$gt': _now()}}, {'_id': 1}) is not None
+
+    def active_user_keys(self, user_keys: Iterable[str]) -> Set[str]:
+        """The subset of `user_keys` with at least one live refresh token."""
+        user_keys = list(user_keys)
+        if not user_keys:
+            return set()
+        return set(self.collection.distinct('user_key', {'user_key': {'$in': user_keys},
+                                                         'expires_at': {'$gt': _now()}}))
+
+    def count_active_users(self, account_key: str) -> int:
+        return len(self.collection.distinct('user_key', {'account_key': account_key,
+                                                         'expires_at': {'$gt': _now()}}))
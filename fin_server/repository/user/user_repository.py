@@ -1,7 +1,10 @@
 from fin_server.repository.base_repository import BaseRepository
+from fin_server.repository.projection import projection
 
 class UserRepository(BaseRepository):
     _instance = None
+    IDENTITY_KEYS = ('user_key',)
+    CACHE_KEY = 'user_key'
 
     def __new__(cls, db, collection_name="users"):
         if cls._instance is None:
@@ -25,17 +28,14 @@ class UserRepository(BaseRepository):
                 raise ValueError(f"Duplicate user_key '{user_key}' not allowed.")
         return str(self.collection.insert_one(data).inserted_id)
 
-    def find(self, query=None, *args, **kwargs):
+    def find(self, query=None, *args, fields=None, **kwargs):
         # Return a list for backward compatibility; callers that need a cursor can use find_many or the BaseRepository.find()
-        return self.find_many(query)
+        return self.find_many(query, fields=fields)
 
-    def find_one(self, query):
-        return self.collection.find_one(query)
-
-    def find_many(self, query=None, limit=0, skip=0, sort=None):
+    def find_many(self, query=None, limit=0, skip=0, sort=None, fields=None):
         if query is None:
             query = {}
-        cursor = self.collection.find(query)
+        cursor = self.collection.find(query, projection(fields))
         if sort:
             cursor = cursor.sort(sort)
         if skip:
@@ -16,6 +16,7 @@ from config import config
 from fin_server.dto.user_dto import UserDTO
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.security.authentication import AuthSecurity
+from fin_server.security.token_cache import token_cache
 from fin_server.utils.generator import build_user
 from fin_server.utils.helpers import respond_success, respond_error, normalize_doc
 from fin_server.utils.validation import validate_signup, validate_signup_user, build_signup_login_response
@@ -218,13 +219,13 @@ def refresh_token():
     payload = AuthSecurity.decode_token(refresh_token)
     user_key = payload.get('user_key')
 
-    user = user_repo.find_one({'user_key': user_key})
+    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token, payload=payload):
+        return respond_error('Invalid or expired refresh token', status=401)
+
+    user = user_repo.find_one({'user_key': user_key}, fields=('account_key', 'role', 'authorities'))
     if not user:
         return respond_error('User not found', status=404)
 
-    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token):
-        return respond_error('Invalid or expired refresh token', status=401)
-
     access_token = AuthSecurity.encode_token({
         'user_key': user_key,
         'account_key': user.get('account_key'),
@@ -245,25 +246,53 @@ def refresh_token():
 @handle_errors
 @require_auth
 def auth_logout(auth_payload):
-    """Logout user by clearing refresh tokens."""
+    """Logout user by revoking refresh tokens.
+
+    With `refresh_token` in the body only that device is logged out;
+    otherwise every refresh token of the user is revoked.
+    """
     user_key = auth_payload.get('user_key')
     account_key = auth_payload.get('account_key')
     logger.info(f"POST /api/auth/logout | account_key: {account_key}, user_key: {user_key}")
+    token_cache.evict_user(user_key)
 
-    user_dto = UserDTO.find_by_user_key(user_key, account_key)
-    if not user_dto:
-        return respond_error('User not found', status=404)
+    data = request.get_json(silent=True) or {}
+    refresh_token = data.get('refresh_token') or data.get('refreshToken')
+    if refresh_token:
+        revoked = AuthSecurity.revoke_refresh_token(refresh_token, user_key)
+    else:
+        revoked = AuthSecurity.revoke_user_refresh_tokens(user_key)
 
-    # Check if user has active tokens
-    if not user_dto.refresh_tokens:
+    if not revoked:
         return respond_success({'message': 'Already logged out', 'success': True})
+    return respond_success({'message': 'Logged out successfully', 'success': True})
 
-    # Clear all refresh tokens
-    user_dto._refresh_tokens = []
-    user_dto._refresh_token_cache = set()
-    user_dto.save()
 
-    return respond_success({'message': 'Logged out successfully', 'success': True})
+@auth_bp.route('/sessions', methods=['GET'])
+@handle_errors
+@require_auth
+def list_sessions(auth_payload):
+    """List the current user's signed-in devices (live refresh tokens)."""
+    user_key = auth_payload.get('user_key')
+    logger.info(f"GET /api/auth/sessions | user_key: {user_key}")
+
+    repo = get_collection('refresh_tokens')
+    sessions = repo.list_sessions(user_key) if repo is not None else []
+    return respond_success({'sessions': [normalize_doc(s) for s in sessions]})
+
+
+@auth_bp.route('/sessions/<session_id>', methods=['DELETE'])
+@handle_errors
+@require_auth
+def revoke_session(session_id, auth_payload):
+    """Log out one device by session id."""
+    user_key = auth_payload.get('user_key')
+    logger.info(f"DELETE /api/auth/sessions/{session_id} | user_key: {user_key}")
+
+    repo = get_collection('refresh_tokens')
+    if repo is None or not repo.revoke_session(user_key, session_id):
+        return respond_error('Session not found', status=404)
+    return respond_success({'message': 'Session revoked', 'success': True})
 
 
 # =============================================================================
@@ -16,6 +16,7 @@ from typing import Optional
 from flask import Blueprint, request
 
 from fin_server.messaging.repository import get_messaging_repository
+from fin_server.repository.base_repository import find_page
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.decorators import handle_errors, require_auth
 from fin_server.utils.helpers import respond_success, respond_error, normalize_doc
@@ -241,12 +242,11 @@ def get_messages(conversation_id, auth_payload):
             query['created_at'] = {'$gt': after}
 
         sort_order = -1 if not after else 1
-        cursor = repo.messages.find(query).sort('created_at', sort_order).limit(limit + 1)
-        messages = list(cursor)
-
-        has_more = len(messages) > limit
-        if has_more:
-            messages = messages[:limit]
+        messages, next_cursor = find_page(
+            repo.messages, query, sort=[('created_at', sort_order)],
+            after=request.args.get('cursor'), limit=limit
+        )
+        has_more = next_cursor is not None
 
         if sort_order == -1:
             messages.reverse()
@@ -258,15 +258,16 @@ def get_messages(conversation_id, auth_payload):
             'count': len(result),
             'has_more': has_more
         }
-
         if result:
             response['oldest_timestamp'] = result[0].get('created_at')
             response['newest_timestamp'] = result[-1].get('created_at')
 
         logger.debug(f"get_msgs: conv={conversation_id[:12]}..., count={len(result)}")
 
-        return respond_success(response)
+        return respond_success(response, meta={'nextCursor': next_cursor})
 
+    except ValueError as e:
+        return respond_error(str(e), status=400)
     except Exception as e:
         logger.error(f'get_msgs error: {e}')
         return respond_error('Failed to get messages', status=500)
@@ -13,8 +13,9 @@ from config import config
 from fin_server.dto.company_dto import CompanyDTO
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.security.authentication import AuthSecurity
+from fin_server.services.auth_service import request_device_info
 from fin_server.utils.decorators import handle_errors, require_auth
-from fin_server.utils.generator import build_user, get_current_timestamp, epoch_to_datetime
+from fin_server.utils.generator import build_refresh, build_user, get_current_timestamp, epoch_to_datetime
 from fin_server.utils.helpers import respond_success, respond_error
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,10 @@ company_bp = Blueprint('company', __name__, url_prefix='/api/company')
 # Repositories
 user_repo = get_collection('users')
 companies_repo = get_collection('companies')
+refresh_token_repo = get_collection('refresh_tokens')
 
+# Fields read by _build_company_users_list; "active" means a live refresh token
+COMPANY_USER_FIELDS = ('user_key', 'username', 'role', 'authorities', 'joined_date')
 
 # =============================================================================
 # Helper Functions
@@ -38,7 +42,9 @@ def _build_company_users_list(account_key):
     Users are stored in the users collection with account_key reference,
     not embedded in the company document.
     """
-    users = user_repo.find_many({'account_key': account_key})
+    users = user_repo.find_many({'account_key': account_key}, fields=COMPANY_USER_FIELDS)
+    active = refresh_token_repo.active_user_keys(u.get('user_key') for u in users) \
+        if refresh_token_repo is not None else set()
     return [
         {
             'user_key': u.get('user_key'),
@@ -46,7 +52,7 @@ def _build_company_users_list(account_key):
             'role': u.get('role', 'user'),
             'authorities': u.get('authorities', []),
             'joined_date': u.get('joined_date'),
-            'active': bool(u.get('refresh_tokens'))
+            'active': u.get('user_key') in active
         }
         for u in users
     ]
@@ -189,7 +195,7 @@ def register_company():
         'roles': admin_data.get('roles', []),
         'type': 'access'
     })
-    refresh_token = admin_data.get('refresh_tokens', [None])[0]
+    refresh_token = build_refresh(admin_data, request_device_info())
 
     response = {
         'company': {
@@ -312,11 +318,10 @@ def get_company_public(account_key):
 
     # Get admin user info
     admin_user_key = company.get('admin_user_key')
-    admin_user = user_repo.find_one({'user_key': admin_user_key}) if admin_user_key else None
+    admin_user = user_repo.find_one({'user_key': admin_user_key}, fields=('user_key', 'username')) if admin_user_key else None
 
     # Count active workers
-    users = user_repo.find_many({'account_key': account_key})
-    worker_count = sum(1 for u in users if u.get('refresh_tokens'))
+    worker_count = refresh_token_repo.count_active_users(account_key) if refresh_token_repo is not None else 0
 
     # Format created date
     created_date_fmt = _format_created_date(company.get('created_date'))
@@ -15,7 +15,7 @@ from flask import Blueprint, request
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.services.expense_service import create_expense_with_repo, post_transaction_effects
 from fin_server.utils.decorators import handle_errors, require_auth
-from fin_server.utils.helpers import respond_success, respond_error
+from fin_server.utils.helpers import respond_success, respond_error, respond_stream
 
 logger = logging.getLogger(__name__)
 
@@ -151,8 +151,8 @@ def list_expenses(auth_payload):
     except ValueError:
         return respond_error('Invalid limit', status=400)
 
-    res = expense_repo.find_expenses(q, limit=limit)
-    return respond_success({'data': res})
+    docs, next_cursor = expense_repo.find_expenses_page(q, after=args.get('cursor'), limit=limit)
+    return respond_stream(docs, meta={'nextCursor': next_cursor})
 
 
 @expenses_bp.route('/<expense_id>/pay', methods=['POST'])
@@ -273,21 +273,23 @@ def import_bank_statement(auth_payload):
     res = bs_repo.create(stmt)
     inserted_id = getattr(res, 'inserted_id', None) if res is not None else None
 
+    line_errors = []
     if lines:
         # Attach statement ID to lines
         for line in lines:
             line['bankStatementId'] = inserted_id
 
-        # Insert lines
-        try:
-            sl_repo.insert_many(lines)
-        except Exception:
-            coll = getattr(sl_repo, 'coll', getattr(sl_repo, 'collection', sl_repo))
-            for line in lines:
-                coll.insert_one(line)
+        # Insert lines (unordered bulk: a failing line is reported, the rest are kept)
+        report = sl_repo.insert_many(lines)
+        line_errors = [{'index': err['index'], 'message': err['message']} for err in report.errors]
+        failed = {err['index'] for err in line_errors}
+        if line_errors:
+            logger.warning(f'{len(line_errors)} of {len(lines)} statement lines failed to import')
 
         # Reconcile lines with external references
-        for line in lines:
+        for i, line in enumerate(lines):
+            if i in failed:
+                continue
             ext = line.get('externalRef') or line.get('external_ref')
             bank_acc = line.get('bankAccountId') or line.get('bank_account_id')
             if ext and bank_acc:
@@ -296,7 +298,10 @@ def import_bank_statement(auth_payload):
                 except Exception:
                     logger.exception('Failed to reconcile statement line')
 
-    return respond_success({'data': {'bankStatementId': str(inserted_id)}})
+    data = {'bankStatementId': str(inserted_id)}
+    if line_errors:
+        data['lineErrors'] = line_errors
+    return respond_success({'data': data})
 
 
 @expenses_bp.route('/reconcile/by-external', methods=['POST'])
@@ -793,18 +798,19 @@ def get_expenses_by_pond(pond_id, auth_payload):
     except ValueError:
         limit = 100
 
-    expenses = list(expense_repo.find(query).sort('created_at', -1).limit(limit))
+    docs, next_cursor = expense_repo.find_expenses_page(
+        query, sort=[('created_at', -1)], after=request.args.get('cursor'), limit=limit
+    )
 
-    result = []
-    for e in expenses:
+    def _to_dict(e):
         try:
-            dto = ExpenseDTO.from_doc(e)
-            result.append(dto.to_dict())
+            return ExpenseDTO.from_doc(e).to_dict()
         except Exception:
             e['_id'] = str(e.get('_id'))
-            result.append(e)
+            return e
 
-    return respond_success({'expenses': result, 'pondId': pond_id})
+    return respond_stream(docs, key='expenses', extra={'pondId': pond_id}, transform=_to_dict,
+                          meta={'nextCursor': next_cursor})
 
 
 # Add category routes to API blueprint
@@ -124,6 +124,7 @@ def _get_analytics_params(args):
         'avg_n': args.get('avg_n'),
         'min_weight': args.get('min_weight'),
         'max_weight': args.get('max_weight'),
+        'include_batches': str(args.get('include_batches', 'false')).lower() == 'true',
     }
 
 
@@ -317,13 +318,17 @@ def get_fish(auth_payload):
         if field in query:
             mongo_query[field] = {"$eq": query[field]}
 
-    fish_list = fish_repo.find(mongo_query)
+    fish_list = list(fish_repo.find(mongo_query))
     analytics_params = _get_analytics_params(query)
 
+    # One aggregation for all species instead of one get_analytics call each
+    analytics_by_species = fish_analytics_repo.get_analytics_many(
+        [f.get('_id') for f in fish_list], account_key=account_key, **analytics_params
+    )
+
     result = []
     for f in fish_list:
-        species_id = f.get('_id')
-        analytics = fish_analytics_repo.get_analytics(species_id, account_key=account_key, **analytics_params)
+        analytics = analytics_by_species[f.get('_id')]
 
         # Age filter
         min_age = analytics_params.get('min_age')
@@ -421,13 +426,8 @@ def get_fish_analytics(auth_payload):
         analytics = fish_analytics_repo.get_analytics(species_code, account_key=account_key, **analytics_params)
         return respond_success({'analytics': [{'species_code': species_code, 'analytics': analytics}]})
 
-    result = [
-        {
-            'species_code': sid,
-            'analytics': fish_analytics_repo.get_analytics(sid, account_key=account_key, **analytics_params)
-        }
-        for sid in fish_ids
-    ]
+    analytics_by_species = fish_analytics_repo.get_analytics_many(fish_ids, account_key=account_key, **analytics_params)
+    result = [{'species_code': sid, 'analytics': analytics_by_species[sid]} for sid in fish_ids]
 
     return respond_success({'analytics': result})
 
@@ -133,6 +133,7 @@ def list_notifications(auth_payload):
         unread: bool - Show only unread (default: false)
         limit: int - Max results (default: 50)
         skip: int - Offset for pagination
+        cursor: str - nextCursor from the previous page (preferred over skip)
     """
     account_key = auth_payload.get('account_key')
     user_key = auth_payload.get('user_key')
@@ -141,6 +142,7 @@ def list_notifications(auth_payload):
     unread_only = request.args.get('unread', 'false').lower() == 'true'
     limit = min(int(request.args.get('limit', 50)), 100)
     skip = int(request.args.get('skip', 0))
+    after = request.args.get('cursor')
 
     if not notification_repo:
         return respond_error('Notification service unavailable', status=503)
@@ -150,11 +152,8 @@ def list_notifications(auth_payload):
         if unread_only:
             query['read'] = False
 
-        notifications = list(
-            notification_repo.collection.find(query)
-            .sort('created_at', -1)
-            .skip(skip)
-            .limit(limit)
+        notifications, next_cursor = notification_repo.find_page(
+            query, sort=[('created_at', -1)], after=after, limit=limit, skip=0 if after else skip
         )
 
         result = [_normalize_notification(n) for n in notifications]
@@ -171,7 +170,9 @@ def list_notifications(auth_payload):
             'count': len(result),
             'unread_count': unread_count,
             'meta': {'limit': limit, 'skip': skip}
-        })
+        }, meta={'nextCursor': next_cursor})
+    except ValueError as e:
+        return respond_error(str(e), status=400)
     except Exception as e:
         logger.exception(f'Error listing notifications: {e}')
         return respond_error('Failed to list notifications', status=500)
@@ -11,11 +11,11 @@ from fin_server.repository.mongo_helper import get_collection
 # fish-related repositories (canonical imports)
 from fin_server.security.authentication import get_auth_payload
 from fin_server.utils.helpers import get_request_payload, parse_pagination
-from fin_server.utils.helpers import normalize_doc, respond_success, respond_error
+from fin_server.utils.helpers import normalize_doc, respond_success, respond_error, respond_stream
 from fin_server.utils.time_utils import get_time_date_dt
 
 # import the new service
-from fin_server.services.pond_service import delete_pond_and_related
+from fin_server.services.pond_service import delete_pond_and_related, get_pond_history
 from fin_server.services.expense_service import prepare_pond_deletion_financials
 
 # module-level singletons/repo instances
@@ -65,7 +65,7 @@ def get_next_pond_number(account_key):
     Looks for pond_ids like <account_key>-<number> and returns next number.
     """
     import re
-    ponds = pond_repository.find({'pond_id': {'$regex': f'^{account_key}-\\d+$'}})
+    ponds = pond_repository.find({'pond_id': {'$regex': f'^{account_key}-\\d+$'}}, fields=('pond_id',))
     max_num = 0
     for pond in ponds:
         match = re.match(rf'^{re.escape(account_key)}-(\d+)$', pond.get('pond_id', ''))
@@ -300,15 +300,16 @@ def pond_activity(pond_id):
         # Include account scoping if present on records
         query['account_key'] = account_key
 
-        # Perform query with limit/skip
-        activities = list(repo.collection.find(query).sort('created_at', -1).skip(skip).limit(limit))
-        # Convert ObjectIds/datetimes if needed in response (light normalization)
-        for a in activities:
-            if 'created_at' in a and hasattr(a['created_at'], 'isoformat'):
-                a['created_at'] = a['created_at'].isoformat()
-        return respond_success({'pondId': pond_id, 'activities': activities})
+        # Keyset pagination via `cursor`; skip is kept for older clients.
+        # Rows are normalized as they are streamed.
+        after = request.args.get('cursor')
+        docs, next_cursor = repo.find_page(query, sort=[('created_at', -1)], after=after,
+                                           limit=limit, skip=0 if after else skip)
+        return respond_stream(docs, key='activities', extra={'pondId': pond_id}, meta={'nextCursor': next_cursor})
     except (UnauthorizedError, Unauthorized) as e:
         return respond_error(str(e), status=401)
+    except ValueError as e:
+        return respond_error(str(e), status=400)
     except Exception as e:
         current_app.logger.exception(f'Exception in pond_activity: {e}')
         return respond_error('Server error', status=500)
@@ -326,6 +327,8 @@ def pond_history(pond_id):
        - include_analytics (true/false)
        - limit (int, default 100)
        - skip (int, default 0)
+    limit/skip page through the merged timeline of all included sources
+    (newest first); `has_more` tells whether another page exists.
     """
     try:
         payload = get_auth_payload(request)
@@ -340,10 +343,6 @@ def pond_history(pond_id):
         limit = int(q.get('limit', 100))
         skip = int(q.get('skip', 0))
 
-        pond_event_repo = pond_event_class()
-        fish_activity_repo = fish_activity_class()
-        fish_analytics_repo = fish_analytics_class()
-
         # helper to parse dates
         def _parse_dt(s):
             if not s:
@@ -360,87 +359,15 @@ def pond_history(pond_id):
         sd = _parse_dt(start_date)
         ed = _parse_dt(end_date)
 
+        # Filtering, merge and pagination all run in MongoDB (see get_pond_history)
+        history = get_pond_history(
+            pond_event_class, fish_activity_class, fish_analytics_class, pond_id,
+            account_key=account_key, start=sd, end=ed, species_code=species_code,
+            include_events=include_events, include_activities=include_activities,
+            include_analytics=include_analytics, limit=limit, skip=skip,
+        )
         result = {'pond_id': pond_id, 'account_key': account_key}
-
-        # EVENTS
-        events_out = []
-        if include_events:
-            events = pond_event_repo.get_events_by_pond(pond_id)
-            # filter by date range
-            filtered = []
-            for e in events:
-                dt = e.get('created_at')
-                if isinstance(dt, str):
-                    try:
-                        dt = datetime.fromisoformat(dt)
-                    except Exception:
-                        dt = None
-                if sd and dt and dt < sd:
-                    continue
-                if ed and dt and dt > ed:
-                    continue
-                if species_code and e.get('fish_id') != species_code:
-                    continue
-                filtered.append(e)
-            events_out = filtered[skip:skip+limit]
-        result['events'] = events_out
-
-        # ACTIVITIES
-        activities_out = []
-        if include_activities:
-            query = {'pond_id': pond_id}
-            if species_code:
-                query['fish_id'] = species_code
-            activities = fish_activity_repo.find(query)
-            filtered = []
-            for a in activities:
-                dt = a.get('created_at')
-                if isinstance(dt, str):
-                    try:
-                        dt = datetime.fromisoformat(dt)
-                    except Exception:
-                        dt = None
-                if sd and dt and dt < sd:
-                    continue
-                if ed and dt and dt > ed:
-                    continue
-                filtered.append(a)
-            activities_out = filtered[skip:skip+limit]
-        result['activities'] = activities_out
-
-        # ANALYTICS (batches) - include batches for species seen on this pond or provided species_code
-        analytics_out = []
-        if include_analytics:
-            species_to_check = set()
-            if species_code:
-                species_to_check.add(species_code)
-            else:
-                # gather species from events in the window
-                for e in result.get('events', []):
-                    fid = e.get('fish_id')
-                    if fid:
-                        species_to_check.add(fid)
-            # fetch batches for each species and filter by date_added
-            for sid in species_to_check:
-                batches = fish_analytics_repo.get_batches(sid, account_key=account_key)
-                filtered = []
-                for b in batches:
-                    dt = b.get('date_added')
-                    if isinstance(dt, str):
-                        try:
-                            dt = datetime.fromisoformat(dt)
-                        except Exception:
-                            dt = None
-                    if sd and dt and dt < sd:
-                        continue
-                    if ed and dt and dt > ed:
-                        continue
-                    filtered.append(b)
-                analytics_out.extend(filtered)
-            # dedupe/sort by date_added desc
-            analytics_out = sorted(analytics_out, key=lambda x: x.get('date_added') or datetime.min, reverse=True)
-            analytics_out = analytics_out[skip:skip+limit]
-        result['analytics'] = analytics_out
+        result.update(history)
 
         # Normalize nested BSON types (ObjectId) and datetimes
         result_normalized = normalize_doc(result)
@@ -83,7 +83,7 @@ def update_pond_metadata(pond_id, fish_id, count, event_type):
         pond_repository.atomic_update_metadata(pond_id, inc_fields=inc_fields, set_fields={'metadata.last_activity': last_activity})
         # Best-effort cleanup: remove negative/zero counts
         try:
-            pond = pond_repository.get_pond(pond_id)
+            pond = pond_repository.get_pond(pond_id, fields=('metadata.fish_types',))
             if pond:
                 fish_types = (pond.get('metadata') or {}).get('fish_types', {})
                 to_unset = {f'metadata.fish_types.{k}': '' for k, v in fish_types.items() if v <= 0}
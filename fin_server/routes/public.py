@@ -22,8 +22,9 @@ def health_check():
     try:
         if not MongoRepo.is_initialized():
             return respond_error({'status': 'degraded', 'reason': 'database not initialized'}, status=503)
-        # Perform a very lightweight ping by listing collections once.
-        # Any connectivity/timeout issues will raise and be logged.
+        # The client connects lazily, so check the server actually answers
+        if not MongoRepo.get_instance().ping():
+            return respond_error({'status': 'degraded', 'reason': 'database unreachable'}, status=503)
         return respond_success({'status': 'ok', 'db': 'reachable'})
     except Exception as e:
         current_app.logger.exception(f'Health check DB error: {e}')
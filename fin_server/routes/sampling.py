@@ -8,7 +8,7 @@ from fin_server.routes.fish import fish_analytics_repo
 from fin_server.routes.pond_event import fish_activity_repo
 from fin_server.security.authentication import get_auth_payload
 from fin_server.utils.generator import generate_sampling_id
-from fin_server.utils.helpers import respond_success, respond_error, normalize_doc, parse_iso_or_epoch
+from fin_server.utils.helpers import respond_success, respond_error, respond_stream, normalize_doc, parse_iso_or_epoch
 from fin_server.utils.validation import compute_total_amount_from_payload
 from fin_server.services.sampling_service import perform_buy_sampling
 from fin_server.services.expense_service import handle_sampling_deletion
@@ -127,6 +127,7 @@ def get_sampling_history():
     - pondId / pond_id
     - species
     - limit (default 10)
+    - cursor (nextCursor from the previous page)
     """
     try:
         args = request.args or {}
@@ -161,17 +162,20 @@ def get_sampling_history():
         if date_query:
             q['sampling_date'] = date_query
 
-        cursor = sampling_repo.find(q).sort([('sampling_date', -1), ('created_at', -1)]).limit(limit)
-        recs = list(cursor)
-        out = []
-        for r in recs:
+        docs, next_cursor = sampling_repo.find_page(
+            q, sort=[('sampling_date', -1), ('created_at', -1)], after=args.get('cursor'), limit=limit
+        )
+
+        def _to_dict(r):
             ro = normalize_doc(r)
             try:
-                dto = GrowthRecordDTO.from_doc(ro)
-                out.append(dto.to_dict())
+                return GrowthRecordDTO.from_doc(ro).to_dict()
             except Exception:
-                out.append(ro)
-        return respond_success(out)
+                return ro
+
+        return respond_stream(docs, transform=_to_dict, meta={'nextCursor': next_cursor})
+    except ValueError as e:
+        return respond_error(str(e), status=400)
     except Exception:
         current_app.logger.exception('Error in get_sampling_history')
         return respond_error('Server error', status=500)
@@ -12,7 +12,7 @@ from flask import Blueprint, request, current_app
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.services.expense_service import post_transaction_effects
 from fin_server.utils.decorators import handle_errors, require_auth
-from fin_server.utils.helpers import respond_success, respond_error, normalize_doc, parse_iso_or_epoch
+from fin_server.utils.helpers import respond_success, respond_error, respond_stream, normalize_doc, parse_iso_or_epoch
 
 logger = logging.getLogger(__name__)
 
@@ -96,7 +96,7 @@ def transactions_options_root():
 @handle_errors
 @require_auth
 def list_transactions(auth_payload):
-    """List transactions with filters."""
+    """List transactions with filters (keyset-paginated via `cursor`)."""
     args = request.args.to_dict()
 
     # Parse limit
@@ -108,10 +108,9 @@ def list_transactions(auth_payload):
 
     q = _build_transaction_query(args, auth_payload.get('account_key'))
 
-    cursor = transactions_repo.find(q).sort([('created_at', -1)]).limit(limit)
-    out = [normalize_doc(r) for r in cursor]
+    docs, next_cursor = transactions_repo.find_page(q, sort=[('created_at', -1)], after=args.get('cursor'), limit=limit)
 
-    return respond_success(out)
+    return respond_stream(docs, transform=normalize_doc, meta={'nextCursor': next_cursor})
 
 
 @transactions_bp.route('', methods=['POST'])
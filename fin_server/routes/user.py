@@ -13,6 +13,7 @@ from flask import Blueprint, request
 
 from fin_server.dto.user_dto import UserDTO
 from fin_server.repository.mongo_helper import get_collection
+from fin_server.security.authentication import AuthSecurity
 from fin_server.services.auth_service import check_password
 from fin_server.utils.generator import build_user
 from fin_server.utils.helpers import respond_success, respond_error, normalize_doc
@@ -62,12 +63,21 @@ def _get_user_dto_from_payload(auth_payload):
     if not user_dto:
         return None, respond_error('User not found', status=404)
 
-    if not user_dto.refresh_tokens:
+    refresh_repo = get_collection('refresh_tokens')
+    if refresh_repo is not None and not refresh_repo.has_active(user_key):
         return None, respond_error('User is logged out', status=401)
 
     return user_dto, None
 
 
+# Fields read by _build_user_response
+USER_RESPONSE_FIELDS = (
+    'user_key', 'email', 'name', 'username', 'first_name', 'last_name', 'role', 'authorities', 'phone',
+    'avatar', 'permissions', 'actions', 'created_at', 'joinedDate', 'joined_date', 'last_login', 'lastLogin',
+    'manager_id', 'managerId',
+)
+
+
 def _build_user_response(doc):
     """Build frontend-friendly user object from document."""
     if not doc:
@@ -241,9 +251,7 @@ def logout(auth_payload):
     if error:
         return error
 
-    user_dto._refresh_tokens = []
-    user_dto._refresh_token_cache = set()
-    user_dto.save()
+    AuthSecurity.revoke_user_refresh_tokens(user_dto.user_key)
 
     return respond_success({'message': 'Logged out'})
 
@@ -355,7 +363,7 @@ def list_users(auth_payload):
     if not account_key:
         return respond_error('Missing account_key', status=400)
 
-    users = user_repo.find_many({'account_key': account_key})
+    users = user_repo.find_many({'account_key': account_key}, fields=USER_RESPONSE_FIELDS)
     show_phone = request.args.get('phone', 'false').lower() == 'true'
 
     result = []
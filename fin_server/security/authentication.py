@@ -1,6 +1,6 @@
 from jose import jwt, JWTError
 from jose.exceptions import JWSError
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
 
 from fin_server.repository.mongo_helper import get_collection
 from fin_server.utils.time_utils import now_std
@@ -9,14 +9,22 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.backends import default_backend
 import hashlib
+import secrets
 import time
 from fin_server.exception.UnauthorizedError import UnauthorizedError
+from fin_server.security.signing_keys import is_asymmetric
+from fin_server.security.token_cache import token_cache
+from fin_server.utils.metrics import collector as metrics_collector
 
 user_repo = get_collection('users')
 
 class AuthSecurity:
     secret_key = None
     algorithm = 'HS256'
+    # KeyRing for RS*/ES* algorithms (see security.signing_keys); None for HMAC
+    key_ring = None
+    # with a key ring, also accept HS256 tokens signed with secret_key
+    accept_hs256 = False
     # Defaults: access token valid for 7 days, refresh token valid for 90 days
     access_token_expire_minutes = 7 * 24 * 60  # 10080 minutes
     refresh_token_expire_days = 90
@@ -29,11 +37,48 @@ class AuthSecurity:
         self.__class__.refresh_token_expire_days = refresh_token_expire_days
 
     @classmethod
-    def configure(cls, secret_key, algorithm='HS256', access_token_expire_minutes=7*24*60, refresh_token_expire_days=90):
+    def configure(cls, secret_key, algorithm='HS256', access_token_expire_minutes=7*24*60, refresh_token_expire_days=90,
+                  key_ring=None, accept_hs256=False):
+        """Set signing parameters.
+
+        RS*/ES* algorithms sign and verify with `key_ring` (a
+        `signing_keys.KeyRing`); `secret_key` is then only used for HS256
+        tokens, when `accept_hs256` is set.
+        """
+        if is_asymmetric(algorithm) and key_ring is None:
+            raise ValueError(f"{algorithm} needs a key ring (security.jwt.keys_dir or jwks_url)")
+        if (secret_key, algorithm, key_ring, accept_hs256) != (cls.secret_key, cls.algorithm, cls.key_ring, cls.accept_hs256):
+            # tokens verified with the previous keys are no longer valid
+            token_cache.clear()
         cls.secret_key = secret_key
         cls.algorithm = algorithm
+        cls.key_ring = key_ring if is_asymmetric(algorithm) else None
+        cls.accept_hs256 = accept_hs256
         cls.access_token_expire_minutes = access_token_expire_minutes
         cls.refresh_token_expire_days = refresh_token_expire_days
+        if cls.key_ring is not None:
+            metrics_collector.register_provider('jwt_keys', cls.key_ring.stats)
+
+    @classmethod
+    def _encode(cls, claims: dict) -> str:
+        if cls.key_ring is None:
+            return jwt.encode(claims, cls.secret_key, algorithm=cls.algorithm)
+        key = cls.key_ring.signing_key()
+        return jwt.encode(claims, key.signing, algorithm=key.algorithm, headers={'kid': key.kid})
+
+    @classmethod
+    def _decode(cls, token: str) -> dict:
+        """Verify the signature and registered claims; the key comes from the token's kid."""
+        if cls.key_ring is None:
+            return jwt.decode(token, cls.secret_key, algorithms=[cls.algorithm])
+        header = jwt.get_unverified_header(token)
+        kid = header.get('kid')
+        if kid is None and cls.accept_hs256 and cls.secret_key and header.get('alg') == 'HS256':
+            return jwt.decode(token, cls.secret_key, algorithms=['HS256'])
+        key = cls.key_ring.verification_key(kid)
+        if key is None:
+            raise JWTError(f"Signature verification failed: unknown signing key '{kid}'")
+        return jwt.decode(token, key.verifying, algorithms=[key.algorithm])
 
     @classmethod
     def encode_token(cls, data: dict, expires_delta: timedelta = None) -> str:
@@ -42,7 +87,7 @@ class AuthSecurity:
         base = now_std(include_time=True)
         expire = base + (expires_delta or timedelta(minutes=cls.access_token_expire_minutes))
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, cls.secret_key, algorithm=cls.algorithm)
+        return cls._encode(to_encode)
 
     @classmethod
     def decode_token(cls, token: str) -> dict:
@@ -50,7 +95,7 @@ class AuthSecurity:
         if not token or token.count('.') != 2:
             raise UnauthorizedError("Malformed or missing token. Please provide a valid JWT token in the Authorization header.")
         try:
-            payload = jwt.decode(token, cls.secret_key, algorithms=[cls.algorithm])
+            payload = cls._decode(token)
             exp = payload.get('exp')
             if exp is not None:
                 now = int(time.time())
@@ -79,18 +124,59 @@ class AuthSecurity:
         except Exception as e:
             raise UnauthorizedError(f"Token decode error: {str(e)}. Please contact support if this persists.")
 
+    @classmethod
+    def verify_token(cls, token: str) -> dict:
+        """`decode_token`, served from the verified-token cache when possible."""
+        if token:
+            payload = token_cache.get(token)
+            if payload is not None:
+                return payload
+        payload = cls.decode_token(token)
+        token_cache.put(token, payload)
+        return payload
+
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
         to_encode = data.copy()
         base = now_std(include_time=True)
         expire = base + timedelta(days=cls.refresh_token_expire_days)
-        to_encode.update({"exp": expire, "type": "refresh"})
-        return jwt.encode(to_encode, cls.secret_key, algorithm=cls.algorithm)
+        # jti keeps tokens issued to the same user within one second distinct
+        to_encode.update({"exp": expire, "type": "refresh", "jti": secrets.token_hex(16)})
+        return cls._encode(to_encode)
+
+    @classmethod
+    def issue_refresh_token(cls, data: dict, device: dict = None) -> str:
+        """Create a refresh token and record it in the refresh token store.
+
+        `device` (device_id, user_agent, ip, ...) is kept with the token so a
+        user's sessions can be listed and revoked one by one.
+        """
+        from config import config
+        repo = cls._refresh_token_repo()
+        if repo is None:
+            raise RuntimeError("Refresh token repository not available")
+        token = cls.create_refresh_token(data)
+        expires_at = datetime.fromtimestamp(jwt.get_unverified_claims(token)['exp'], timezone.utc)
+        repo.store(token, data.get('user_key'), data.get('account_key'), expires_at,
+                   device=device, max_sessions=config.REFRESH_TOKEN_MAX_SESSIONS)
+        return token
+
+    @classmethod
+    def revoke_refresh_token(cls, token: str, user_key: str) -> bool:
+        """Revoke one refresh token, only if it belongs to `user_key`."""
+        repo = cls._refresh_token_repo()
+        return bool(repo is not None and repo.revoke_session(user_key, repo.hash_token(token)))
+
+    @classmethod
+    def revoke_user_refresh_tokens(cls, user_key: str) -> int:
+        """Revoke every refresh token of a user; returns how many were live."""
+        repo = cls._refresh_token_repo()
+        return repo.revoke_user(user_key) if repo is not None else 0
 
     @classmethod
     def refresh_access_token(cls, refresh_token: str) -> str:
         try:
-            payload = jwt.decode(refresh_token, cls.secret_key, algorithms=[cls.algorithm])
+            payload = cls._decode(refresh_token)
             if payload.get("type") != "refresh":
                 raise ValueError("Invalid refresh token type.")
             # Remove exp and type for new access token
@@ -156,6 +242,10 @@ class AuthSecurity:
         """Convenience accessor for the UserRepository singleton."""
         return user_repo
 
+    @classmethod
+    def _refresh_token_repo(cls):
+        return get_collection('refresh_tokens')
+
     @classmethod
     def validate(cls, repository, collection_name, token: str) -> bool:
         """Legacy validate API kept for compatibility.
@@ -176,23 +266,29 @@ class AuthSecurity:
             return False
 
     @classmethod
-    def validate_refresh_token(cls, repository, collection_name, user_key: str, refresh_token: str) -> bool:
+    def validate_refresh_token(cls, repository, collection_name, user_key: str, refresh_token: str,
+                               payload: dict = None) -> bool:
         """Validate a refresh token for a given user_key.
 
-        The repository/collection_name parameters are ignored; we always
-        use the UserRepository singleton under the hood.
+        The token must verify, belong to `user_key` and still be in the
+        refresh token store (a lookup by its hash). Pass `payload` when the
+        caller has already decoded the token. The repository/collection_name
+        parameters are ignored.
         """
         try:
-            payload = cls.decode_token(refresh_token)
+            if payload is None:
+                payload = cls.decode_token(refresh_token)
             if payload.get('type') != 'refresh':
                 return False
-            repo = cls._user_repo()
-            user = repo.find_one({'user_key': user_key})
-            tokens = user.get('refresh_tokens', [])[-5:] if user else []
             token_user_key = payload.get('user_key')
             if not token_user_key or token_user_key != user_key:
                 return False
-            return refresh_token in tokens
+            repo = cls._refresh_token_repo()
+            session = repo.get_active(refresh_token) if repo is not None else None
+            if session is None or session.get('user_key') != user_key:
+                return False
+            repo.touch(session['_id'])
+            return True
         except Exception:
             return False
 
@@ -262,35 +358,6 @@ class AuthSecurity:
         except Exception:
             return False
 
-    @classmethod
-    def validate_and_cleanup_refresh_tokens(cls, user_dto, create_new=True):
-        now = int(time.time())
-        valid_tokens = []
-        for token in user_dto.refresh_tokens:
-            try:
-                payload = cls.decode_token(token)
-                exp = int(payload.get('exp', 0))
-                if exp > now:
-                    valid_tokens.append(token)
-            except Exception:
-                continue
-        user_dto._refresh_tokens = valid_tokens
-        user_dto._refresh_token_cache = set(valid_tokens)
-        if not valid_tokens:
-            return False, None  # Force re-login
-        new_refresh_token = None
-        if create_new:
-            refresh_payload = {
-                'user_key': user_dto.user_key,
-                'account_key': user_dto.account_key,
-                'role': user_dto.role,
-                'authorities': user_dto.authorities,
-                'type': 'refresh'
-            }
-            new_refresh_token = cls.create_refresh_token(refresh_payload)
-            user_dto.add_refresh_token(new_refresh_token)
-        return True, new_refresh_token
-
     @classmethod
     def decode_any_token(cls, token: str) -> dict:
         """
@@ -299,7 +366,7 @@ class AuthSecurity:
         if not token or token.count('.') != 2:
             raise UnauthorizedError("Malformed or missing token. Please provide a valid JWT token in the Authorization header.")
         try:
-            payload = jwt.decode(token, AuthSecurity.secret_key, algorithms=[AuthSecurity.algorithm])
+            payload = AuthSecurity._decode(token)
             exp = payload.get('exp')
             if exp is not None:
                 now = int(time.time())
@@ -340,4 +407,4 @@ def get_auth_payload(request):
     if not auth_header or not auth_header.startswith('Bearer '):
         raise UnauthorizedError('Missing or invalid token')
     token = auth_header.split(' ', 1)[1]
-    return AuthSecurity.decode_token(token)
+    return AuthSecurity.verify_token(token)
@@ -3,7 +3,13 @@ from functools import wraps
 from typing import Union, Callable
 from flask import request, jsonify, g
 
-from fin_server.security.roles import Role, Permission, has_permission
+from fin_server.security.permission_bits import (
+    custom_permission_mask,
+    permission_mask,
+    permission_names,
+    role_mask,
+)
+from fin_server.security.roles import Role, Permission
 
 
 def require_auth(f: Callable) -> Callable:
@@ -73,12 +79,7 @@ def require_permission(*permissions: Union[str, Permission]) -> Callable:
         def create_and_approve_expense():
             pass
     """
-    required_perms = set()
-    for perm in permissions:
-        if isinstance(perm, Permission):
-            required_perms.add(perm.value)
-        else:
-            required_perms.add(perm)
+    required_mask = permission_mask(permissions)
 
     def decorator(f: Callable) -> Callable:
         @wraps(f)
@@ -87,19 +88,15 @@ def require_permission(*permissions: Union[str, Permission]) -> Callable:
                 return jsonify({'error': 'Authentication required', 'code': 'AUTH_REQUIRED'}), 401
 
             user_role = g.current_user.get('role', 'worker')
-            custom_perms = set(g.current_user.get('permissions', []))
-
-            # Check each required permission
-            missing_perms = []
-            for perm in required_perms:
-                if not has_permission(user_role, perm, custom_perms):
-                    missing_perms.append(perm)
+            granted = role_mask(user_role) | custom_permission_mask(g.current_user.get('permissions'))
 
-            if missing_perms:
+            # Check all required permissions at once
+            missing_mask = required_mask & ~granted
+            if missing_mask:
                 return jsonify({
                     'error': 'Insufficient permissions',
                     'code': 'FORBIDDEN',
-                    'missing_permissions': missing_perms,
+                    'missing_permissions': permission_names(missing_mask),
                     'your_role': user_role
                 }), 403
 
@@ -119,12 +116,8 @@ def require_any_permission(*permissions: Union[str, Permission]) -> Callable:
         def view_financial_data():
             pass
     """
-    required_perms = set()
-    for perm in permissions:
-        if isinstance(perm, Permission):
-            required_perms.add(perm.value)
-        else:
-            required_perms.add(perm)
+    required_mask = permission_mask(permissions)
+    required_names = permission_names(required_mask)
 
     def decorator(f: Callable) -> Callable:
         @wraps(f)
@@ -133,17 +126,16 @@ def require_any_permission(*permissions: Union[str, Permission]) -> Callable:
                 return jsonify({'error': 'Authentication required', 'code': 'AUTH_REQUIRED'}), 401
 
             user_role = g.current_user.get('role', 'worker')
-            custom_perms = set(g.current_user.get('permissions', []))
+            granted = role_mask(user_role) | custom_permission_mask(g.current_user.get('permissions'))
 
             # Check if user has ANY of the required permissions
-            for perm in required_perms:
-                if has_permission(user_role, perm, custom_perms):
-                    return f(*args, **kwargs)
+            if required_mask & granted:
+                return f(*args, **kwargs)
 
             return jsonify({
                 'error': 'Insufficient permissions',
                 'code': 'FORBIDDEN',
-                'required_any': list(required_perms),
+                'required_any': required_names,
                 'your_role': user_role
             }), 403
         return decorated
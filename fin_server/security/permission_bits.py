@@ -0,0 +1,135 @@
+"""Permissions compiled to integer bitmasks.
+
+Both permission models are interned to bit positions once, at import:
+
+- RBAC permissions (`roles.Permission`, e.g. 'pond:create'): one bit each, and
+  `ROLE_MASKS` holds every role of `roles.ROLE_PERMISSIONS` as a mask. The
+  permission decorators compile their required permissions when the route is
+  decorated, so a check is `required & ~granted`;
+- feature flags (`permission_template.PERMISSION_TEMPLATE`): one bit per
+  (feature, flag), and `ROLE_FEATURE_MASKS` holds the role templates.
+  `PermissionService` merges a user's stored flags into the role mask with two
+  bitwise operations instead of deep-copying the template.
+
+Permission names outside the enum (custom grants, routes passing plain
+strings) are interned on first use by a decorator; a user's custom grants only
+map to bits that exist, since a grant nothing requires cannot change a check.
+
+API:
+- permission_mask(permissions) -> int
+- custom_permission_mask(permissions) -> int
+- permission_names(mask) -> list of names
+- role_mask(role) -> int
+- feature_bit(feature, flag) -> int (0 for unknown features / flags)
+- compile_feature_flags(permissions) -> (specified mask, granted mask)
+- expand_feature_mask(mask) -> {feature: {flag: bool}}
+"""
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fin_server.security.permission_template import PERMISSION_TEMPLATE, ROLE_PERMISSION_TEMPLATES
+from fin_server.security.roles import Permission, ROLE_PERMISSIONS
+
+# --- RBAC permissions --------------------------------------------------------
+
+_permission_bits: Dict[str, int] = {}
+_permission_names: List[str] = []
+_intern_lock = Lock()
+
+
+def _intern(name: str) -> int:
+    bit = _permission_bits.get(name)
+    if bit is not None:
+        return bit
+    with _intern_lock:
+        bit = _permission_bits.get(name)
+        if bit is None:
+            bit = 1 << len(_permission_names)
+            _permission_names.append(name)
+            _permission_bits[name] = bit
+    return bit
+
+
+for _permission in Permission:
+    _intern(_permission.value)
+
+
+def permission_mask(permissions: Iterable[Any]) -> int:
+    """Mask of `permissions` (Permission members or names), interning unknown names."""
+    mask = 0
+    for permission in permissions:
+        mask |= _intern(permission.value if isinstance(permission, Permission) else permission)
+    return mask
+
+
+def custom_permission_mask(permissions: Optional[Iterable[str]]) -> int:
+    """Mask of a user's custom grants; names never interned are skipped."""
+    if not permissions:
+        return 0
+    mask = 0
+    for permission in permissions:
+        mask |= _permission_bits.get(permission, 0)
+    return mask
+
+
+def permission_names(mask: int) -> List[str]:
+    """Names of the bits set in `mask`, in interning order."""
+    return [name for index, name in enumerate(_permission_names) if mask >> index & 1]
+
+
+ROLE_MASKS: Dict[str, int] = {role: permission_mask(perms) for role, perms in ROLE_PERMISSIONS.items()}
+
+
+def role_mask(role: str) -> int:
+    return ROLE_MASKS.get(role, 0)
+
+
+# --- feature flags -----------------------------------------------------------
+
+FEATURE_FLAGS = ('enabled', 'entitled', 'edit', 'view')
+
+_FEATURES = list(PERMISSION_TEMPLATE)
+_feature_bits: Dict[Tuple[str, str], int] = {
+    (feature, flag): 1 << (index * len(FEATURE_FLAGS) + offset)
+    for index, feature in enumerate(_FEATURES)
+    for offset, flag in enumerate(FEATURE_FLAGS)
+}
+
+
+def feature_bit(feature: str, flag: str) -> int:
+    return _feature_bits.get((feature, flag), 0)
+
+
+def compile_feature_flags(permissions: Optional[Dict[str, Dict[str, Any]]]) -> Tuple[int, int]:
+    """Compile {feature: {flag: value}} into (flags present, flags truthy).
+
+    A merge onto `base` is `(base & ~specified) | granted`, which matches
+    `dict.update` of the flags onto the template.
+    """
+    specified = granted = 0
+    for feature, flags in (permissions or {}).items():
+        if not isinstance(flags, dict):
+            continue
+        for flag, value in flags.items():
+            bit = _feature_bits.get((feature, flag), 0)
+            specified |= bit
+            if value:
+                granted |= bit
+    return specified, granted
+
+
+def expand_feature_mask(mask: int) -> Dict[str, Dict[str, bool]]:
+    """Full permissions dict, every feature and flag, from a mask."""
+    return {
+        feature: {flag: bool(mask & _feature_bits[(feature, flag)]) for flag in FEATURE_FLAGS}
+        for feature in _FEATURES
+    }
+
+
+ROLE_FEATURE_MASKS: Dict[str, int] = {
+    role: compile_feature_flags(flags)[1] for role, flags in ROLE_PERMISSION_TEMPLATES.items()
+}
+
+
+def role_feature_mask(role: str) -> int:
+    return ROLE_FEATURE_MASKS.get(role, 0)
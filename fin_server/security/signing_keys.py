@@ -0,0 +1,291 @@
+"""Key ring for asymmetric JWT signing (RS256/384/512, ES256/384/512).
+
+With `security.jwt.algorithm` set to one of `ASYMMETRIC_ALGORITHMS`, tokens are
+signed with a private key and carry its `kid` header; verification picks the
+public key by `kid` and only accepts that key's algorithm. Processes that only
+verify (WebSocket nodes, the MCP server) hold public keys and no secret.
+
+Key sources:
+- `security.jwt.keys_dir` (JWT_KEYS_DIR): PEM files named `<kid>.pem` (private
+  key; its public half verifies too) or `<kid>.pub.pem` (public key only). The
+  signing key is `security.jwt.active_kid` (JWT_ACTIVE_KID) or, when unset, the
+  greatest kid that has a private key; `scripts/rotate_jwt_keys.py` names keys
+  by UTC timestamp, so the newest key signs;
+- `security.jwt.jwks_url` (JWT_JWKS_URL): a JWKS document (the issuer serves
+  its public keys at GET /.well-known/jwks.json) for verifier processes.
+
+Rotation: every key in the ring verifies, so adding a key and letting it
+become active keeps outstanding tokens valid; remove an old key only after
+the tokens it signed have expired (refresh tokens live
+`security.jwt.refresh_token_expire_days`). The directory is re-read every
+`keys_reload_seconds` and the JWKS refetched every `jwks_cache_seconds`;
+either is refreshed early (at most every `MIN_REFRESH_SECONDS`) when a token
+names an unknown kid, so verifiers pick up a new key with its first token.
+Parsed keys are kept between refreshes, so verification never re-parses PEM
+or JWK data.
+
+Key counts, refreshes and unknown-kid lookups are exposed on GET /metrics
+under `jwt_keys`.
+
+API:
+- KeyRing.from_config() -> KeyRing
+- KeyRing.signing_key() -> JwtKey
+- KeyRing.verification_key(kid) -> JwtKey or None
+- KeyRing.jwks() -> {'keys': [...]}
+- generate_private_key(algorithm) -> PEM bytes
+"""
+import logging
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'ES256', 'ES384', 'ES512')
+# A token with an unknown kid triggers a refresh at most this often
+MIN_REFRESH_SECONDS = 30
+PRIVATE_SUFFIX = '.pem'
+PUBLIC_SUFFIX = '.pub.pem'
+
+_EC_CURVES = {'ES256': ec.SECP256R1, 'ES384': ec.SECP384R1, 'ES512': ec.SECP521R1}
+
+
+def is_asymmetric(algorithm: Optional[str]) -> bool:
+    return algorithm in ASYMMETRIC_ALGORITHMS
+
+
+def generate_private_key(algorithm: str, rsa_key_size: int = 2048) -> bytes:
+    """New PKCS8 PEM private key for `algorithm`."""
+    if algorithm.startswith('RS'):
+        from fin_server.security.authentication import AuthSecurity
+        private_pem, _ = AuthSecurity.generate_rsa_key_pair(key_size=rsa_key_size)
+        return private_pem
+    if algorithm in _EC_CURVES:
+        private_key = ec.generate_private_key(_EC_CURVES[algorithm]())
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+    raise ValueError(f"Unsupported asymmetric JWT algorithm: {algorithm}")
+
+
+class JwtKey:
+    """One parsed key: `signing` is None for public-only keys."""
+
+    __slots__ = ('kid', 'algorithm', 'signing', 'verifying')
+
+    def __init__(self, kid: str, algorithm: str, signing=None, verifying=None):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.signing = signing
+        self.verifying = verifying
+
+    @classmethod
+    def from_pem(cls, kid: str, algorithm: str, pem: bytes, private: bool) -> 'JwtKey':
+        key = jwk.construct(pem, algorithm)
+        if private:
+            return cls(kid, algorithm, signing=key, verifying=key.public_key())
+        return cls(kid, algorithm, verifying=key)
+
+    @classmethod
+    def from_jwk(cls, data: Dict[str, Any], default_algorithm: str) -> 'JwtKey':
+        algorithm = data.get('alg') or default_algorithm
+        if not is_asymmetric(algorithm):
+            raise ValueError(f"Unsupported JWK algorithm: {algorithm}")
+        return cls(data['kid'], algorithm, verifying=jwk.construct(data, algorithm))
+
+    def public_jwk(self) -> Dict[str, Any]:
+        data = self.verifying.to_dict()
+        data.update({'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'})
+        return data
+
+
+class KeyRing:
+    """Signing key and verification keys by kid."""
+
+    def __init__(self, algorithm: str, keys_dir: Optional[str] = None, active_kid: Optional[str] = None,
+                 jwks_url: Optional[str] = None, reload_seconds: float = 60, jwks_cache_seconds: float = 300):
+        if not is_asymmetric(algorithm):
+            raise ValueError(f"KeyRing needs one of {', '.join(ASYMMETRIC_ALGORITHMS)}, got {algorithm}")
+        if not keys_dir and not jwks_url:
+            raise ValueError('Asymmetric JWT signing needs security.jwt.keys_dir or security.jwt.jwks_url')
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid
+        self.jwks_url = jwks_url
+        self.reload_seconds = reload_seconds
+        self.jwks_cache_seconds = jwks_cache_seconds
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+        self._keys: Dict[str, JwtKey] = {}
+        self._active: Optional[JwtKey] = None
+        # path -> (mtime, JwtKey), so unchanged files are not parsed again
+        self._files: Dict[str, tuple] = {}
+        self._remote: Dict[str, JwtKey] = {}
+        self._loaded_at = None
+        self._fetched_at = None
+        self._forced_at = None
+        self._stats = {'refreshes': 0, 'unknown_kid': 0, 'errors': 0}
+        self.refresh()
+
+    @classmethod
+    def from_config(cls) -> 'KeyRing':
+        return cls(config.JWT_ALGORITHM, keys_dir=config.JWT_KEYS_DIR, active_kid=config.JWT_ACTIVE_KID,
+                   jwks_url=config.JWT_JWKS_URL, reload_seconds=config.JWT_KEYS_RELOAD_SECONDS,
+                   jwks_cache_seconds=config.JWT_JWKS_CACHE_SECONDS)
+
+    # --- lookups -------------------------------------------------------------
+
+    def signing_key(self) -> JwtKey:
+        self._refresh_if_stale()
+        active = self._active
+        if active is None:
+            raise RuntimeError('No private JWT signing key is configured (security.jwt.keys_dir)')
+        return active
+
+    def verification_key(self, kid: Optional[str]) -> Optional[JwtKey]:
+        if not kid:
+            return None
+        self._refresh_if_stale()
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        with self._lock:
+            self._stats['unknown_kid'] += 1
+            now = time.monotonic()
+            if self._forced_at is not None and now - self._forced_at < MIN_REFRESH_SECONDS:
+                return None
+            self._forced_at = now
+        self.refresh(force_fetch=True)
+        return self._keys.get(kid)
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Public keys of the ring as a JWKS document."""
+        self._refresh_if_stale()
+        return {'keys': [key.public_jwk() for _, key in sorted(self._keys.items())]}
+
+    # --- loading -------------------------------------------------------------
+
+    def _refresh_if_stale(self):
+        now = time.monotonic()
+        stale = (self.keys_dir and (self._loaded_at is None or now - self._loaded_at >= self.reload_seconds)) or \
+                (self.jwks_url and (self._fetched_at is None or now - self._fetched_at >= self.jwks_cache_seconds))
+        # one thread refreshes; the others keep verifying with the current keys
+        if stale and self._refresh_lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def refresh(self, force_fetch: bool = False):
+        """Re-read the keys directory and, when due (or forced), the JWKS URL."""
+        with self._refresh_lock:
+            self._refresh(force_fetch)
+
+    def _refresh(self, force_fetch: bool = False):
+        now = time.monotonic()
+        local = self._read_dir() if self.keys_dir else {}
+        self._loaded_at = now
+        if self.jwks_url and (force_fetch or self._fetched_at is None
+                              or now - self._fetched_at >= self.jwks_cache_seconds):
+            self._remote = self._fetch_jwks(self._remote)
+            self._fetched_at = now
+        keys = dict(self._remote)
+        keys.update(local)
+        with self._lock:
+            removed = set(self._keys) - set(keys)
+            self._keys = keys
+            self._active = self._pick_active(local)
+            self._stats['refreshes'] += 1
+        if removed:
+            logger.info(f"JWT keys removed from the ring: {', '.join(sorted(removed))}")
+            # tokens verified with a removed key must not be served from the cache
+            from fin_server.security.token_cache import token_cache
+            token_cache.clear()
+
+    def _read_dir(self) -> Dict[str, JwtKey]:
+        keys: Dict[str, JwtKey] = {}
+        try:
+            names = sorted(os.listdir(self.keys_dir))
+        except OSError as e:
+            logger.error(f"Cannot read JWT keys from {self.keys_dir}: {e}")
+            self._stats['errors'] += 1
+            return {kid: key for kid, key in self._keys.items() if kid not in self._remote}
+        files = {}
+        for name in names:
+            if name.endswith(PUBLIC_SUFFIX):
+                kid, private = name[:-len(PUBLIC_SUFFIX)], False
+            elif name.endswith(PRIVATE_SUFFIX):
+                kid, private = name[:-len(PRIVATE_SUFFIX)], True
+            else:
+                continue
+            path = os.path.join(self.keys_dir, name)
+            try:
+                mtime = os.stat(path).st_mtime
+                cached = self._files.get(path)
+                if cached is not None and cached[0] == mtime:
+                    key = cached[1]
+                else:
+                    with open(path, 'rb') as f:
+                        key = JwtKey.from_pem(kid, self.algorithm, f.read(), private)
+                files[path] = (mtime, key)
+            except Exception as e:
+                logger.error(f"Skipping JWT key {path}: {e}")
+                self._stats['errors'] += 1
+                continue
+            # a private key wins over a public file with the same kid
+            if private or kid not in keys:
+                keys[kid] = key
+        self._files = files
+        return keys
+
+    def _fetch_jwks(self, previous: Dict[str, JwtKey]) -> Dict[str, JwtKey]:
+        import requests
+        try:
+            response = requests.get(self.jwks_url, timeout=5)
+            response.raise_for_status()
+            documents = response.json().get('keys', [])
+        except Exception as e:
+            logger.warning(f"Could not fetch JWKS from {self.jwks_url}: {e}")
+            self._stats['errors'] += 1
+            return previous
+        keys = {}
+        for data in documents:
+            try:
+                key = JwtKey.from_jwk(data, self.algorithm)
+                keys[key.kid] = key
+            except Exception as e:
+                logger.warning(f"Skipping JWK {data.get('kid')}: {e}")
+                self._stats['errors'] += 1
+        return keys
+
+    def _pick_active(self, local: Dict[str, JwtKey]) -> Optional[JwtKey]:
+        if self.active_kid:
+            key = local.get(self.active_kid)
+            if key is None or key.signing is None:
+                logger.error(f"Active JWT kid '{self.active_kid}' has no private key in {self.keys_dir}")
+                return None
+            return key
+        private = [kid for kid, key in local.items() if key.signing is not None]
+        return local[max(private)] if private else None
+
+    # --- metrics -------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'algorithm': self.algorithm,
+                'active_kid': self._active.kid if self._active else None,
+                'kids': sorted(self._keys),
+                'source': 'jwks' if self.jwks_url and not self.keys_dir else 'keys_dir',
+            })
+        return stats
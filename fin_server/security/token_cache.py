@@ -0,0 +1,170 @@
+"""Per-process cache of verified access tokens.
+
+Every authenticated request (and Socket.IO connect) presents the same bearer
+token many times over its lifetime; `AuthSecurity.verify_token` looks it up
+here before running the JWT signature check again.
+
+- entries are keyed by the SHA-256 of the token, so raw tokens are not kept
+  in memory, and hold a copy of the verified payload and its `exp`;
+- a lookup at or past `exp` drops the entry and falls through to full
+  verification, so a cached token is never accepted longer than the token
+  itself allows;
+- the cache is a bounded LRU (`security.token_cache.max_entries`) and is
+  cleared when the signing key or algorithm changes;
+- logout evicts the presented token, and updates / deletes of a user (logout,
+  deactivation, password or role changes) arriving from the change-event bus
+  evict every token of that user in each worker process.
+
+Hit/miss counters are exposed on GET /metrics under `token_cache`.
+
+API:
+- token_cache.get(token) -> payload copy or None
+- token_cache.put(token, payload)
+- token_cache.evict(token) / token_cache.evict_user(user_key) / token_cache.clear()
+- register_token_revocation()
+"""
+import copy
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Optional, Set
+
+from config import config
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _expiry(payload: Dict[str, Any]) -> Optional[float]:
+    """`exp` of a verified payload as epoch seconds (None when absent)."""
+    exp = payload.get('exp')
+    if exp is None:
+        return None
+    if isinstance(exp, datetime):
+        return exp.timestamp()
+    return float(exp)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of token hash -> (verified payload, exp, user_key)."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._lock = Lock()
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        # user_key -> token hashes, for evicting a user's tokens
+        self._by_user: Dict[str, Set[str]] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'revocations': 0}
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached payload, or None when `token` must be verified."""
+        if not config.TOKEN_CACHE_ENABLED:
+            return None
+        key = _token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            payload, exp, _ = entry
+            if exp is not None and exp <= time.time():
+                self._remove(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return copy.deepcopy(payload)
+
+    def put(self, token: str, payload: Dict[str, Any]):
+        """Remember a payload that has just passed verification."""
+        if not config.TOKEN_CACHE_ENABLED:
+            return
+        try:
+            exp = _expiry(payload)
+        except (TypeError, ValueError):
+            return
+        if exp is not None and exp <= time.time():
+            return
+        key = _token_key(token)
+        user_key = payload.get('user_key')
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (copy.deepcopy(payload), exp, user_key)
+            if user_key:
+                self._by_user.setdefault(user_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def evict(self, token: str):
+        """Drop one token (logout)."""
+        with self._lock:
+            if self._remove(_token_key(token)):
+                self._stats['revocations'] += 1
+
+    def evict_user(self, user_key: str):
+        """Drop every cached token of `user_key`."""
+        with self._lock:
+            for key in list(self._by_user.get(user_key, ())):
+                if self._remove(key):
+                    self._stats['revocations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        user_key = entry[2]
+        keys = self._by_user.get(user_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_key]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['enabled'] = config.TOKEN_CACHE_ENABLED
+        stats['max_entries'] = self.max_entries
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _on_user_change(event):
+    document = event.document
+    if document is None:
+        # deletes carry no document; the user may hold any cached token
+        token_cache.clear()
+        return
+    user_key = document.get('user_key')
+    if user_key:
+        token_cache.evict_user(user_key)
+
+
+def register_token_revocation():
+    """Evict a user's cached tokens when the user document changes."""
+    from fin_server.repository.change_events import get_event_bus
+    get_event_bus().subscribe('users', _on_user_change, operations=('update', 'replace', 'delete'))
+
+
+token_cache = VerifiedTokenCache(config.TOKEN_CACHE_MAX_ENTRIES)
+
+metrics_collector.register_provider('token_cache', token_cache.stats)
@@ -176,6 +176,27 @@ def build_refresh_payload(user_dto: UserDTO) -> Dict[str, Any]:
     }
 
 
+def request_device_info() -> Dict[str, Any]:
+    """Device metadata stored with a refresh token; empty outside a request.
+
+    Clients identify a device with the X-Device-Id header (or `device_id` in
+    the JSON body) and may name it with `device_name`. The IP is the peer
+    address; X-Forwarded-For is client-controlled and is not read here (a
+    deployment behind a proxy should apply werkzeug's ProxyFix, which sets
+    remote_addr from it).
+    """
+    from flask import has_request_context, request
+    if not has_request_context():
+        return {}
+    data = request.get_json(silent=True) or {}
+    return {
+        'device_id': request.headers.get('X-Device-Id') or data.get('device_id'),
+        'device_name': data.get('device_name'),
+        'user_agent': request.headers.get('User-Agent'),
+        'ip': request.remote_addr,
+    }
+
+
 # =============================================================================
 # Response Builders
 # =============================================================================
@@ -285,19 +306,16 @@ def _handle_refresh_token_login(
     user_key = payload.get('user_key')
     account_key = payload.get('account_key')
 
+    # Validate the refresh token (a lookup by its hash, before loading the user)
+    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token, payload=payload):
+        logger.warning("Invalid or expired refresh token")
+        return {'success': False, 'error': 'Invalid or expired refresh token'}, 401
+
     user_dto = load_user_by_user_key(user_key, account_key)
     if not user_dto:
         logger.warning("User not found for user_key: %s", user_key)
         return {'success': False, 'error': 'User not found'}, 404
 
-    # Cleanup expired tokens
-    AuthSecurity.validate_and_cleanup_refresh_tokens(user_dto, create_new=False)
-
-    # Validate the refresh token
-    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token):
-        logger.warning("Invalid or expired refresh token")
-        return {'success': False, 'error': 'Invalid or expired refresh token'}, 401
-
     # Generate new access token
     expires_delta = datetime.timedelta(seconds=int(expires_in)) if expires_in else None
     access_token = AuthSecurity.encode_token(build_access_payload(user_dto), expires_delta=expires_delta)
@@ -333,23 +351,21 @@ def _handle_credential_login(
 
     # Update last active
     user_dto.touch()
+    changes = {'last_update': user_dto.last_active, 'last_active': user_dto.last_active}
 
     # Migrate password to bcrypt if needed
     if new_hash:
         user_dto.password = new_hash
-
-    # Cleanup expired refresh tokens
-    AuthSecurity.validate_and_cleanup_refresh_tokens(user_dto, create_new=False)
+        changes['password'] = new_hash
 
     # Generate tokens
     expires_delta = datetime.timedelta(seconds=int(expires_in)) if expires_in else None
     access_token = AuthSecurity.encode_token(build_access_payload(user_dto), expires_delta=expires_delta)
 
-    new_refresh_token = AuthSecurity.create_refresh_token(build_refresh_payload(user_dto))
-    user_dto.add_refresh_token(new_refresh_token)
+    new_refresh_token = AuthSecurity.issue_refresh_token(build_refresh_payload(user_dto), request_device_info())
 
-    # Persist changes
-    user_repo.update({"user_key": user_dto.user_key}, user_dto.to_dict())
+    # Persist changes (refresh tokens live in their own collection)
+    user_repo.update({"user_key": user_dto.user_key}, changes)
 
     logger.info("Login successful for user: %s", user_dto.user_key)
     return build_user_response(user_dto, access_token=access_token, refresh_token=new_refresh_token), 200
@@ -375,13 +391,13 @@ def generate_access_from_refresh(
     user_key = payload.get('user_key')
     account_key = payload.get('account_key')
 
+    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token, payload=payload):
+        return {'success': False, 'error': 'Invalid or expired refresh token'}, 401
+
     user_dto = load_user_by_user_key(user_key, account_key)
     if not user_dto:
         return {'success': False, 'error': 'User not found'}, 404
 
-    if not AuthSecurity.validate_refresh_token(user_repo, 'users', user_key, refresh_token):
-        return {'success': False, 'error': 'Invalid or expired refresh token'}, 401
-
     expires_delta = datetime.timedelta(seconds=int(expires_in)) if expires_in else None
     access_token = AuthSecurity.encode_token(build_access_payload(user_dto), expires_delta=expires_delta)
 
@@ -402,7 +418,6 @@ def generate_new_refresh_token(
     if not password or not (username or phone or email):
         return {'success': False, 'error': 'Password and user identifier required'}, 400
 
-    user_repo = _get_user_repo()
     user_doc, user_dto = load_user_by_identifier(username=username, phone=phone, email=email)
 
     if not user_doc or not user_dto:
@@ -416,9 +431,7 @@ def generate_new_refresh_token(
 
     user_dto.touch()
 
-    new_refresh_token = AuthSecurity.create_refresh_token(build_refresh_payload(user_dto))
-    user_dto.add_refresh_token(new_refresh_token)
-    user_repo.update({"user_key": user_dto.user_key}, user_dto.to_dict())
+    new_refresh_token = AuthSecurity.issue_refresh_token(build_refresh_payload(user_dto), request_device_info())
 
     expiry = int(time.time()) + int(expires_in) if expires_in else None
     return build_token_response(refresh_token=new_refresh_token, expires_in=expiry), 200
@@ -0,0 +1,291 @@
+"""Dashboard summary service.
+
+GET /api/dashboard is served from a per-account snapshot document
+(`dashboard_snapshot`, `_id` = account_key) so the common case costs a single
+primary-key read instead of six collection scans.
+
+The snapshot is kept current by the write paths:
+- counters that change by a known amount (pond created, task created, stock
+  moved) are `$inc`-ed in place via `record_dashboard_change(inc=...)`;
+- anything else (deletes, status changes, alerts, new samplings/feedings whose
+  cards are 30-day windows) flags the affected part as stale via
+  `record_dashboard_change(stale=...)` and only that part is recomputed on the
+  next read.
+
+Snapshots older than `config.DASHBOARD_SNAPSHOT_MAX_AGE` seconds, and accounts
+without a snapshot, get a full recompute. The age bound also absorbs drift from
+writes that bypass the repositories and lets the 30-day windows roll forward.
+
+Recomputes fan the card queries out on the shared query pool
+(`ConcurrentQueries`), each bounded by `config.DASHBOARD_QUERY_TIMEOUT`; a card
+that fails or times out is served as its default and listed under `errors`.
+Card queries and snapshot reads use the `dashboard` read profile, so they can be
+served by secondaries.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from config import config
+from fin_server.repository.fish.pond_aggregations import total_stock
+from fin_server.repository.media.task_repository import INACTIVE_TASK_STATUSES
+from fin_server.repository.mongo_helper import get_collection
+from fin_server.repository.projection import projection
+from fin_server.repository.read_profiles import apply_read_profile
+from fin_server.utils.helpers import normalize_doc
+from fin_server.utils.threading_util import ConcurrentQueries
+
+logger = logging.getLogger(__name__)
+
+ALERT_LIMIT = 10
+# Card queries tolerate replication lag; see config database.read_profiles
+DASHBOARD_READ_PROFILE = 'dashboard'
+
+
+def _coll(name):
+    """Return the raw collection behind a repository (or None), bound to the dashboard read profile."""
+    repo = get_collection(name)
+    return apply_read_profile(getattr(repo, 'collection', None), DASHBOARD_READ_PROFILE) if repo is not None else None
+
+
+# =============================================================================
+# Card computations (full recompute path)
+#
+# These raise on query failure; the fan-out in `_compute_parts` turns a failed
+# or slow card into its default plus an entry in `errors`.
+# =============================================================================
+
+def _get_pond_count(account_key):
+    """Get total number of ponds for account."""
+    coll = _coll('pond')
+    return coll.count_documents({'account_key': account_key}) if coll is not None else 0
+
+
+def _get_active_tasks_count(account_key):
+    """Get count of active (non-completed) tasks."""
+    coll = _coll('task')
+    if coll is None:
+        return 0
+    return coll.count_documents({
+        'account_key': account_key,
+        'status': {'$nin': list(INACTIVE_TASK_STATUSES)}
+    })
+
+
+def _get_critical_alerts_count(account_key):
+    """Get count of unacknowledged critical alerts."""
+    coll = _coll('alerts')
+    if coll is None:
+        return 0
+    return coll.count_documents({
+        'account_key': account_key,
+        'severity': {'$in': ['critical', 'high', 'warning']},
+        'acknowledged': {'$ne': True}
+    })
+
+
+def _get_total_stock(account_key):
+    """Get total fish stock count from ponds."""
+    coll = _coll('pond')
+    return total_stock(coll, account_key) if coll is not None else 0
+
+
+def _get_average_growth_rate(account_key):
+    """Calculate average growth rate from recent sampling records."""
+    coll = _coll('sampling')
+    if coll is None:
+        return 0.0
+    # Get samples from last 30 days
+    thirty_days_ago = datetime.now() - timedelta(days=30)
+    samples = list(coll.find({
+        'account_key': account_key,
+        'created_at': {'$gte': thirty_days_ago}
+    }, projection(('extra.growth_rate', 'extra.growthRate', 'growth_rate'))).limit(100))
+
+    growth_rates = []
+    for s in samples:
+        extra = s.get('extra', {})
+        gr = extra.get('growth_rate') or extra.get('growthRate') or s.get('growth_rate')
+        if gr is not None:
+            try:
+                growth_rates.append(float(gr))
+            except (TypeError, ValueError):
+                pass
+
+    return round(sum(growth_rates) / len(growth_rates), 2) if growth_rates else 0.0
+
+
+def _get_feed_efficiency(account_key):
+    """Calculate feed conversion ratio from recent feeding records."""
+    coll = _coll('feeding')
+    if coll is None:
+        return 0.0
+    # Get feeding records from last 30 days
+    thirty_days_ago = datetime.now() - timedelta(days=30)
+    feeds = list(coll.find({
+        'account_key': account_key,
+        'created_at': {'$gte': thirty_days_ago}
+    }, projection(('quantity', 'feed_quantity'))).limit(100))
+
+    total_feed = sum(f.get('quantity', 0) or f.get('feed_quantity', 0) for f in feeds)
+    # Simple efficiency calculation (can be enhanced)
+    return round(total_feed / len(feeds), 2) if feeds else 0.0
+
+
+def _recent_alerts(account_key, limit=ALERT_LIMIT):
+    coll = _coll('alerts')
+    if coll is None:
+        return []
+    cursor = coll.find({'account_key': account_key}).sort('timestamp', -1).limit(limit)
+    return [normalize_doc(a) for a in cursor]
+
+
+def get_alerts(account_key, limit=ALERT_LIMIT):
+    """Get recent alerts for account."""
+    try:
+        return _recent_alerts(account_key, limit=limit)
+    except Exception:
+        return []
+
+
+# Snapshot part -> [(snapshot field, compute, default on failure)]
+_PARTS = {
+    'ponds': [('cards.totalPonds', _get_pond_count, 0)],
+    'tasks': [('cards.activeTasks', _get_active_tasks_count, 0)],
+    'alerts': [('cards.criticalAlerts', _get_critical_alerts_count, 0), ('alerts', _recent_alerts, [])],
+    'growth': [('cards.averageGrowthRate', _get_average_growth_rate, 0.0)],
+    'stock': [('cards.totalStock', _get_total_stock, 0)],
+    'feed': [('cards.feedEfficiency', _get_feed_efficiency, 0.0)],
+}
+
+
+def _compute_parts(account_key, parts):
+    """Compute the fields of `parts` concurrently.
+
+    Returns:
+        (values, errors, failed_parts): values maps snapshot fields to results
+        (defaults for failed calls), errors maps failed fields to 'error' or
+        'timeout', failed_parts lists the parts with at least one failure.
+    """
+    queries = ConcurrentQueries(timeout=config.DASHBOARD_QUERY_TIMEOUT)
+    for part in parts:
+        for field, compute, default in _PARTS[part]:
+            queries.submit(field, compute, account_key, default=default)
+    values, errors = queries.gather()
+    failed_parts = [part for part in parts if any(field in errors for field, _, _ in _PARTS[part])]
+    return values, errors, failed_parts
+
+
+def _apply_fields(data, values):
+    for field, value in values.items():
+        if field.startswith('cards.'):
+            data['cards'][field[len('cards.'):]] = value
+        else:
+            data[field] = value
+    return data
+
+
+def _card_errors(errors):
+    """Error flags keyed like the response (`totalPonds`, `alerts`)."""
+    return {field.split('.', 1)[-1]: flag for field, flag in errors.items()}
+
+
+def build_dashboard_data(account_key):
+    """Build complete dashboard data (full recompute, cards fetched concurrently).
+
+    Cards that fail or time out are returned with their default value and
+    listed under `errors`.
+    """
+    values, errors, _ = _compute_parts(account_key, list(_PARTS))
+    data = _apply_fields({'cards': {}, 'alerts': []}, values)
+    data['generated_at'] = datetime.now().isoformat()
+    if errors:
+        data['errors'] = _card_errors(errors)
+    return data
+
+
+# =============================================================================
+# Snapshot read / maintenance
+# =============================================================================
+
+def _public(snapshot):
+    return {
+        'cards': snapshot.get('cards') or {},
+        'alerts': snapshot.get('alerts') or [],
+        'generated_at': snapshot.get('generated_at'),
+    }
+
+
+def _recompute(snapshot_repo, account_key, snapshot=None):
+    # version read before the card queries: a change recorded after it makes the store a no-op
+    version = snapshot.get('version', 0) if snapshot else None
+    values, errors, failed_parts = _compute_parts(account_key, list(_PARTS))
+    data = _apply_fields({'cards': {}, 'alerts': []}, values)
+    data['generated_at'] = datetime.now().isoformat()
+    try:
+        # failed parts are stored with their defaults but stay stale so the next read retries them
+        snapshot_repo.store_recompute(account_key, dict(data, computed_at=time.time(),
+                                                        stale={part: True for part in failed_parts}),
+                                      version=version)
+    except Exception:
+        logger.exception('Failed to store dashboard snapshot for account %s', account_key)
+    if errors:
+        data['errors'] = _card_errors(errors)
+    return data
+
+
+def get_dashboard_snapshot(account_key: str) -> Dict[str, Any]:
+    """Return dashboard data for an account from its snapshot.
+
+    Falls back to a full recompute when there is no snapshot or it is older than
+    `config.DASHBOARD_SNAPSHOT_MAX_AGE`; parts flagged stale by write paths are
+    recomputed individually.
+    """
+    snapshot_repo = get_collection('dashboard_snapshot')
+    if snapshot_repo is None:
+        return build_dashboard_data(account_key)
+
+    snapshot = snapshot_repo.get(account_key)
+    max_age = config.DASHBOARD_SNAPSHOT_MAX_AGE
+    if not snapshot or time.time() - (snapshot.get('computed_at') or 0) > max_age:
+        return _recompute(snapshot_repo, account_key, snapshot)
+
+    stale = [part for part, flagged in (snapshot.get('stale') or {}).items() if flagged and part in _PARTS]
+    if not stale:
+        return _public(snapshot)
+
+    values, errors, failed_parts = _compute_parts(account_key, stale)
+    refreshed = [part for part in stale if part not in failed_parts]
+    set_fields = {field: value for field, value in values.items() if field not in errors}
+    if refreshed:
+        set_fields['generated_at'] = datetime.now().isoformat()
+        try:
+            snapshot_repo.refresh_parts(account_key, snapshot.get('version', 0), set_fields, refreshed)
+        except Exception:
+            logger.exception('Failed to refresh dashboard snapshot for account %s', account_key)
+
+    data = _apply_fields(_public(snapshot), values)
+    if errors:
+        data['errors'] = _card_errors(errors)
+    return data
+
+
+def record_dashboard_change(account_key: Optional[str], inc: Optional[Dict[str, Any]] = None,
+                            stale: Iterable[str] = ()):
+    """Apply a write to the account's dashboard snapshot (best effort).
+
+    Args:
+        account_key: Account whose dashboard changed; ignored when falsy
+        inc: Card counter deltas, e.g. {'totalPonds': 1}
+        stale: Snapshot parts to recompute on next read
+            (ponds, tasks, alerts, growth, stock, feed)
+    """
+    if not account_key or not (inc or stale):
+        return
+    try:
+        snapshot_repo = get_collection('dashboard_snapshot')
+        if snapshot_repo is not None:
+            snapshot_repo.apply_change(account_key, inc=inc, stale=stale)
+    except Exception:
+        logger.exception('Failed to record dashboard change for account %s', account_key)
@@ -686,11 +686,11 @@ def handle_sampling_deletion(sampling_id: str):
 
     # 4) Remove analytics batches referencing sampling/stock
     try:
-        analytics_coll = fish_analytics_repo.collection if hasattr(fish_analytics_repo, 'collection') else fish_analytics_repo
         # event_id convention used in sampling_service: f"{account_key}-{species}-{pond_id}-{sampling_id}"
         # We search by sampling id or stock_id in metadata or event id
         q = {'$or': [{'metadata.sampling_id': sampling_id}, {'metadata.stock_id': stock_id}, {'event_id': {'$regex': sampling_id}}]}
-        res = analytics_coll.delete_many(q)
+        # delete through the repository so the per-species rollups are decremented
+        res = fish_analytics_repo.delete_many(q)
         summary['analytics_deleted'] = getattr(res, 'deleted_count', None)
     except Exception:
         logger.exception('Failed to delete analytics for sampling %s', sampling_id)
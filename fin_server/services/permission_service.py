@@ -5,16 +5,26 @@ Design:
 - Database stores ONLY True values (sparse)
 - On read: merge template with stored values
 - Simple structure: feature -> {enabled, entitled, edit, view}
+
+Effective permissions are merged as bitmasks (see security.permission_bits):
+the role template is precompiled, a user's stored flags compile to two masks,
+and a check is one bitwise AND.
 """
 import logging
 from typing import Optional, Dict, Any, List
 import copy
 
 from fin_server.repository.mongo_helper import get_collection
+from fin_server.repository.user.permission_repository import invalidate_effective_permissions
+from fin_server.security.permission_bits import (
+    compile_feature_flags,
+    expand_feature_mask,
+    feature_bit,
+    role_feature_mask,
+)
 from fin_server.security.permission_template import (
     PERMISSION_TEMPLATE,
     ROLE_PERMISSION_TEMPLATES,
-    get_default_permissions,
     get_role_permissions,
     get_all_features,
 )
@@ -56,16 +66,16 @@ class PermissionService:
         Returns:
             Full permissions dict with all features
         """
-        # Step 1: Start with template
-        permissions = get_default_permissions()
+        return expand_feature_mask(self.get_user_permission_mask(user_key, account_key, role))
 
-        # Step 2: Apply role defaults
-        role_perms = ROLE_PERMISSION_TEMPLATES.get(role, {})
-        for feature, flags in role_perms.items():
-            if feature in permissions:
-                permissions[feature].update(flags)
+    def get_user_permission_mask(self, user_key: str, account_key: str, role: str) -> int:
+        """Get user's effective permissions as a feature-flag bitmask.
+
+        Same merge as `get_user_permissions`: role template (precompiled), then
+        the user's stored flags replace the role's for the flags they set.
+        """
+        mask = role_feature_mask(role)
 
-        # Step 3: Apply user-specific overrides from DB
         if self.user_permissions_collection is not None:
             try:
                 user_doc = self.user_permissions_collection.find_one({
@@ -75,13 +85,12 @@ class PermissionService:
 
                 if user_doc and 'permissions' in user_doc:
                     # DB stores only True values, merge them
-                    for feature, flags in user_doc['permissions'].items():
-                        if feature in permissions:
-                            permissions[feature].update(flags)
+                    specified, granted = compile_feature_flags(user_doc['permissions'])
+                    mask = (mask & ~specified) | granted
             except Exception as e:
                 logger.exception(f"Error getting user permissions: {e}")
 
-        return permissions
+        return mask
 
     def get_user_permission_overrides(self, user_key: str, account_key: str) -> Dict[str, Any]:
         """Get only the user's overrides (what's stored in DB).
@@ -134,12 +143,11 @@ class PermissionService:
         Returns:
             True if permission is granted
         """
-        permissions = self.get_user_permissions(user_key, account_key, role)
-
-        if feature not in permissions:
+        bit = feature_bit(feature, flag)
+        if not bit:
             return False
 
-        return permissions[feature].get(flag, False)
+        return bool(self.get_user_permission_mask(user_key, account_key, role) & bit)
 
     def can_view(self, user_key: str, account_key: str, role: str, feature: str) -> bool:
         """Check if user can view a feature."""
@@ -391,6 +399,8 @@ class PermissionService:
                 },
                 upsert=True
             )
+            # assigned_ponds is part of PermissionRepository's effective permissions
+            invalidate_effective_permissions()
 
             return True
         except Exception as e:
@@ -448,8 +458,8 @@ class PermissionService:
         if  self.is_admin(role):
             return True
         else:
-            permissions = self.get_user_permissions(user_key, account_key, role="user")
-            return permissions.get(permission, {}).get('enabled', False)
+            bit = feature_bit(permission, 'enabled')
+            return bool(bit) and bool(self.get_user_permission_mask(user_key, account_key, role="user") & bit)
 
     def is_dynamic_valid_permission(self, user_key: str, account_key: str, permission: str, role: str = None) -> bool:
         """Dynamically validate if a user has a specific permission."""
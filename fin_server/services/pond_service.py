@@ -1,5 +1,7 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure
 
 from fin_server.repository.mongo_helper import get_collection
 
@@ -76,7 +78,11 @@ def delete_pond_and_related(
 
     def _delete_many(repo_name: str, query: Dict[str, Any]) -> Optional[int]:
         repo_obj = _get_repo(repo_name)
-        coll = _coll_from(repo_obj, repo_name)
+        # go through the repository when it has its own delete_many (e.g. analytics rollups)
+        if hasattr(repo_obj, 'delete_many') and getattr(repo_obj, 'collection', None) is not None:
+            coll = repo_obj
+        else:
+            coll = _coll_from(repo_obj, repo_name)
         res = coll.delete_many(query)
         return getattr(res, 'deleted_count', None)
 
@@ -87,6 +93,7 @@ def delete_pond_and_related(
         return getattr(res, 'deleted_count', None)
 
     # Step 0: Load pond to get fish counts by species
+    pond = None
     try:
         pond_repo = _get_repo(pond_collection_name)
         pond_coll = _coll_from(pond_repo, pond_collection_name)
@@ -132,4 +139,108 @@ def delete_pond_and_related(
         deleted = _delete_one(pond_collection_name, {'_id': pond_id})
     summary['pond_deleted'] = deleted
 
+    if deleted and pond:
+        from fin_server.services.dashboard_service import record_dashboard_change
+        record_dashboard_change(pond.get('account_key'), stale=('ponds', 'stock', 'growth'))
+
     return summary
+
+
+def _history_branch(match: Dict[str, Any], ts_field: str, source: str, bound: int) -> List[Dict[str, Any]]:
+    """Pipeline for one pond_history source: filter, keep the newest `bound` rows, tag them."""
+    return [
+        {'$match': match},
+        {'$sort': {ts_field: -1, '_id': -1}},
+        {'$limit': bound},
+        {'$addFields': {'_history_source': source, '_history_ts': f'${ts_field}'}},
+    ]
+
+
+def get_pond_history(
+    pond_event_repo: Any,
+    fish_activity_repo: Any,
+    fish_analytics_repo: Any,
+    pond_id: str,
+    account_key: Optional[str] = None,
+    start: Any = None,
+    end: Any = None,
+    species_code: Optional[str] = None,
+    include_events: bool = True,
+    include_activities: bool = True,
+    include_analytics: bool = True,
+    limit: int = 100,
+    skip: int = 0,
+) -> Dict[str, Any]:
+    """Return one page of a pond's combined history, newest first.
+
+    Pond events and fish activity (by created_at) and analytics batches (by
+    date_added) are merged into a single timeline with one `$unionWith`
+    aggregation on pond_event. Date, species and skip/limit are applied by the
+    database; each branch is capped at skip+limit+1 rows before the merge.
+    Servers without `$unionWith` (< 4.4) run the branch pipelines separately
+    and merge the bounded results here.
+
+    Analytics batches are those of the requested species, or of the species
+    seen in this pond's events within the window.
+
+    Returns {'events': [...], 'activities': [...], 'analytics': [...], 'has_more': bool}.
+    """
+    events_coll = pond_event_repo.collection
+    activity_coll = fish_activity_repo.collection
+    analytics_coll = fish_analytics_repo.collection
+
+    def _window(field: str) -> Dict[str, Any]:
+        rng = {}
+        if start:
+            rng['$gte'] = start
+        if end:
+            rng['$lte'] = end
+        return {field: rng} if rng else {}
+
+    event_match = {'pond_id': pond_id, **_window('created_at')}
+    if species_code:
+        event_match['fish_id'] = species_code
+
+    bound = skip + limit + 1
+    branches = []  # (collection, pipeline)
+    if include_events:
+        branches.append((events_coll, _history_branch(event_match, 'created_at', 'events', bound)))
+    if include_activities:
+        branches.append((activity_coll, _history_branch(dict(event_match), 'created_at', 'activities', bound)))
+    if include_analytics:
+        species = [species_code] if species_code else [
+            s for s in events_coll.distinct('fish_id', event_match) if s
+        ]
+        if species:
+            analytics_match = {'species_id': {'$in': species}, **_window('date_added')}
+            if account_key:
+                analytics_match['account_key'] = account_key
+            branches.append((analytics_coll, _history_branch(analytics_match, 'date_added', 'analytics', bound)))
+
+    rows: List[Dict[str, Any]] = []
+    if branches:
+        base_coll, pipeline = branches[0]
+        pipeline = list(pipeline)
+        for coll, branch in branches[1:]:
+            pipeline.append({'$unionWith': {'coll': coll.name, 'pipeline': branch}})
+        pipeline += [
+            {'$sort': {'_history_ts': -1, '_id': -1}},
+            {'$skip': skip},
+            {'$limit': limit + 1},
+        ]
+        try:
+            rows = list(base_coll.aggregate(pipeline))
+        except OperationFailure:
+            logger.info('pond_history: $unionWith unavailable, merging bounded queries')
+            for coll, branch in branches:
+                rows.extend(coll.aggregate(branch))
+            rows.sort(key=lambda r: (r.get('_history_ts') is not None, r.get('_history_ts') or 0, str(r.get('_id'))),
+                      reverse=True)
+            rows = rows[skip:skip + limit + 1]
+
+    out: Dict[str, Any] = {'events': [], 'activities': [], 'analytics': [], 'has_more': len(rows) > limit}
+    for row in rows[:limit]:
+        source = row.pop('_history_source')
+        row.pop('_history_ts', None)
+        out[source].append(row)
+    return out
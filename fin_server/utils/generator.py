@@ -401,7 +401,6 @@ def create_admin(user_data):
     user_data['permission'] = {}
     user_data['joined_date'] = get_current_timestamp()
     user_data['subscription'] = default_subscription()
-    user_data['refresh_tokens'] = []
     return user_data
 
 def create_user(user_data, account_key):
@@ -412,28 +411,17 @@ def create_user(user_data, account_key):
     user_data['permission'] = {}
     user_data['joined_date'] = get_current_timestamp()
     user_data['subscription'] = get_user_subscription_from_admin(account_key)
-    user_data['refresh_tokens'] = []
     return user_data
 
 def build_user(data, account_key=None):
     user_data = create_admin(data.copy()) if not account_key else create_user(data.copy(), account_key)
     password = user_data['password'] if 'password' in user_data else '123'
     user_data['password'] = base64.b64encode(password.encode('utf-8')).decode('utf-8')
-
-    refresh_payload = {
-        'user_key': user_data['user_key'],
-        'account_key': user_data['account_key'],
-        'permission': user_data['permission'],
-        'role': user_data['role'],
-        'authorities': user_data['authorities'],
-        'type': 'refresh'
-    }
-    refresh_token = AuthSecurity.create_refresh_token(refresh_payload)
-    user_data['refresh_tokens'] = [refresh_token]
+    # Refresh tokens are issued at login (AuthSecurity.issue_refresh_token), not stored on the user
     return user_data
 
 
-def build_refresh(user_data):
+def build_refresh(user_data, device=None):
     refresh_payload = {
         'user_key': user_data['user_key'],
         'account_key': user_data['account_key'],
@@ -442,7 +430,7 @@ def build_refresh(user_data):
         'authorities': user_data.get('authorities', []),
         'type': 'refresh'
     }
-    refresh_token = AuthSecurity.create_refresh_token(refresh_payload)
+    refresh_token = AuthSecurity.issue_refresh_token(refresh_payload, device)
     return refresh_token
 
 
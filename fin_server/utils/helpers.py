@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 import zoneinfo
 from werkzeug.exceptions import Forbidden, Unauthorized
 
+from fin_server.utils.metrics import collector as metrics_collector
 from config import config
 
 # Default timezone - loaded once from config
@@ -413,6 +414,115 @@ def normalize_for_ui(obj):
     return transformed
 
 
+# default sensitive fragments (checked against normalized underscored key)
+DEFAULT_SENSITIVE_FRAGMENTS = (
+    'password', 'pass', 'pwd', 'token', 'access_token', 'refresh_token', 'secret',
+    'api_key', 'apikey', 'ssn', 'card_number', 'cardnumber', 'cvv',
+    'otp', 'salt', 'private_key', 'privatekey', 'signature'
+)
+
+
+_DEFAULT_FRAGMENTS = frozenset(f.lower() for f in DEFAULT_SENSITIVE_FRAGMENTS)
+
+
+def _sensitive_fragments(remove_fields=None) -> frozenset:
+    """Return the lower-cased sensitive fragments, extended with `remove_fields`."""
+    if not remove_fields:
+        return _DEFAULT_FRAGMENTS
+    sens = set(_DEFAULT_FRAGMENTS)
+    for f in remove_fields:
+        if f:
+            sens.add(str(f).lower())
+    return frozenset(sens)
+
+
+def _is_sensitive_key(k, fragments) -> bool:
+    """Return True if key `k` matches or contains any of the sensitive `fragments`."""
+    if not k:
+        return False
+    s = str(k)
+    # normalize: lower & replace hyphens with underscore
+    norm = s.replace('-', '_').lower()
+    # check direct match or containment of any sensitive fragment
+    for frag in fragments:
+        if norm == frag or frag in norm:
+            return True
+    return False
+
+
+class KeyDecisionCache:
+    """Process-wide bounded memo of key -> (camelKey, isSensitive).
+
+    The set of keys in our collections is small and stable, so `sanitize` and
+    the response serializer look each key up here instead of recomputing
+    `_snake_to_camel` and scanning every sensitive fragment (twice) per key.
+
+    Decisions depend on the active sensitive fragments; passing a different
+    fragment set (i.e. a different `remove_fields`) invalidates the table. When
+    the table reaches `max_size` it is cleared rather than growing unbounded.
+    Only str keys are cached (1 and True hash alike but camelize differently).
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        # (fragments, entries) swapped as one tuple so readers never see a mix
+        self._state = (_DEFAULT_FRAGMENTS, {})
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def lookup(self, key, fragments=_DEFAULT_FRAGMENTS):
+        """Return (camelKey, isSensitive) for `key` under `fragments`."""
+        state = self._state
+        if state[0] is not fragments and state[0] != fragments:
+            state = self._state = (fragments, {})
+            self.invalidations += 1
+        entries = state[1]
+        entry = entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = self._decide(key, fragments)
+        if key.__class__ is str:
+            if len(entries) >= self.max_size:
+                entries.clear()
+                self.evictions += 1
+            entries[key] = entry
+        return entry
+
+    @staticmethod
+    def _decide(key, fragments):
+        try:
+            # compute camelCase key using existing helper
+            newk = _snake_to_camel(key)
+        except Exception:
+            newk = key
+        # Decide sensitivity based on original key and the camel key
+        return newk, _is_sensitive_key(key, fragments) or _is_sensitive_key(newk, fragments)
+
+    def clear(self):
+        self._state = (self._state[0], {})
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._state[1]),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
+
+
+# Shared key decision table used by sanitize() and fin_server.utils.serializer
+key_cache = KeyDecisionCache()
+metrics_collector.register_provider('key_cache', key_cache.stats)
+
+
 def sanitize(obj, remove_fields=None):
     """Recursively sanitize an object by:
     - removing keys that look sensitive (passwords, tokens, secrets, keys, card numbers, etc.)
@@ -421,29 +531,8 @@ def sanitize(obj, remove_fields=None):
 
     remove_fields: optional iterable of additional field name fragments to treat as sensitive.
     """
-    # default sensitive fragments (checked against normalized underscored key)
-    default_sensitive = (
-        'password', 'pass', 'pwd', 'token', 'access_token', 'refresh_token', 'secret',
-        'api_key', 'apikey', 'ssn', 'card_number', 'cardnumber', 'cvv',
-        'otp', 'salt', 'private_key', 'privatekey', 'signature'
-    )
-    sens = set(f.lower() for f in default_sensitive)
-    if remove_fields:
-        for f in remove_fields:
-            if f:
-                sens.add(str(f).lower())
-
-    def _is_sensitive_key(k: str) -> bool:
-        if not k:
-            return False
-        s = str(k)
-        # normalize: lower & replace hyphens with underscore
-        norm = s.replace('-', '_').lower()
-        # check direct match or containment of any sensitive fragment
-        for frag in sens:
-            if norm == frag or frag in norm:
-                return True
-        return False
+    sens = _sensitive_fragments(remove_fields)
+    lookup = key_cache.lookup
 
     def _sanitize_inner(o):
         # None and primitives
@@ -456,13 +545,8 @@ def sanitize(obj, remove_fields=None):
         if isinstance(o, dict):
             out = {}
             for k, v in o.items():
-                try:
-                    # compute camelCase key using existing helper
-                    newk = _snake_to_camel(k)
-                except Exception:
-                    newk = k
-                # Decide sensitivity based on original key and the camel key
-                if _is_sensitive_key(k) or _is_sensitive_key(newk):
+                newk, sensitive = lookup(k, sens)
+                if sensitive:
                     # skip adding this key entirely (filter out sensitive fields)
                     continue
                 # recurse
@@ -474,13 +558,13 @@ def sanitize(obj, remove_fields=None):
     return _sanitize_inner(obj)
 
 
-def respond_success(payload=None, status=200, do_sanitize=True):
-    """Return a standardized success response compatible with frontend's ApiResponse.
+def _legacy_success_body(payload=None, do_sanitize=True):
+    """Build the success envelope with the original multi-pass pipeline.
 
-    - If payload is None -> { success: True, data: {} }
-    - If payload is a dict and already contains 'data' key, return as-is (with timestamp)
-    - Otherwise wrap payload into 'data' key: { success: True, data: payload }
-    Also attach a timestamp. Before returning, normalize the `data` to UI shape.
+    Runs sanitize -> normalize_doc -> _transform_keys_and_types -> _post_normalize
+    -> _prune_none. Kept as the reference implementation for the fused serializer
+    in `fin_server.utils.serializer`, which falls back to it for payload shapes it
+    cannot reproduce exactly in a single pass.
     """
     if payload is None:
         data = {}
@@ -499,21 +583,126 @@ def respond_success(payload=None, status=200, do_sanitize=True):
     else:
         body['data'] = data
 
-    # Normalize the data payload for UI (convert keys/types) and remove None values
+    body['data'] = _legacy_normalize_data(body['data'])
+    return body
+
+
+def _legacy_normalize_data(data):
+    """Normalize an already-sanitized payload for UI and remove None values."""
     try:
         # normalize_for_ui may throw; wrap
-        body['data'] = normalize_for_ui(body['data'])
+        data = normalize_for_ui(data)
     except Exception:
         current_app.logger.exception('Failed to normalize response payload for UI')
     try:
-        body['data'] = _prune_none(body['data'])
+        data = _prune_none(data)
     except Exception:
         current_app.logger.exception('Failed to prune None in respond_success')
+    return data
+
+
+def respond_success(payload=None, status=200, do_sanitize=True, meta=None):
+    """Return a standardized success response compatible with frontend's ApiResponse.
+
+    - If payload is None -> { success: True, data: {} }
+    - If payload is a dict and already contains 'data' key, return as-is (with timestamp)
+    - Otherwise wrap payload into 'data' key: { success: True, data: payload }
+    Also attach a timestamp. Before returning, normalize the `data` to UI shape.
+    `meta` adds top-level envelope keys next to `data` (None values are
+    omitted), as in respond_stream.
+
+    Normalization runs through the single-pass serializer, which produces the
+    same output as `_legacy_success_body`.
+    """
+    from fin_server.utils.serializer import build_success_body
+
+    body = build_success_body(payload, do_sanitize=do_sanitize)
+    for mk, mv in (meta or {}).items():
+        if mv is not None:
+            body[mk] = mv
     # IST timestamp for success responses
     body['timestamp'] = datetime.now(IST_TZ).isoformat()
     return jsonify(body), status
 
 
+# Flush streamed output once this many characters are buffered
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def respond_stream(items, status=200, key=None, extra=None, transform=None, do_sanitize=True, meta=None):
+    """Stream a pymongo cursor (or any iterable) as a success response.
+
+    Each document is transformed (optional `transform(doc)`), sanitized and
+    normalized as it is read from the cursor and written as part of a chunked
+    JSON array, so peak memory stays flat regardless of the number of rows.
+
+    - key=None -> {"data": [...], "success": true, "timestamp": ...}
+    - key='expenses', extra={'pondId': ...}
+        -> {"data": {"pondId": ..., "id": ..., "expenses": [...]}, "success": true, ...}
+      `extra` is normalized the same way respond_success normalizes a dict payload.
+    - meta={'nextCursor': ...} adds top-level envelope keys next to `data`
+      (None values are omitted).
+
+    Documents are normalized exactly as respond_success would normalize them
+    inside a list. If the cursor fails mid-stream the array is closed and the
+    envelope reports `success: false` (the status code has already been sent).
+    """
+    from flask import Response, stream_with_context
+    from fin_server.utils.serializer import serialize
+
+    json_provider = current_app.json
+
+    def _dumps(obj):
+        return json_provider.dumps(obj, separators=(',', ':'))
+
+    def _generate():
+        if key is None:
+            yield '{"data":['
+        else:
+            head = serialize(extra or {}, do_sanitize=do_sanitize)
+            parts = [f'{_dumps(k)}:{_dumps(v)},' for k, v in head.items()]
+            yield '{"data":{' + ''.join(parts) + f'{_dumps(key)}:['
+
+        buf = []
+        size = 0
+        first = True
+        success = True
+        try:
+            for doc in items:
+                if transform is not None:
+                    doc = transform(doc)
+                item = serialize(doc, do_sanitize=do_sanitize)
+                if item is None:
+                    continue
+                chunk = _dumps(item)
+                if not first:
+                    chunk = ',' + chunk
+                first = False
+                buf.append(chunk)
+                size += len(chunk)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield ''.join(buf)
+                    buf = []
+                    size = 0
+        except Exception:
+            current_app.logger.exception('Failed while streaming response')
+            success = False
+        if buf:
+            yield ''.join(buf)
+
+        tail = ']' if key is None else ']}'
+        for mk, mv in (meta or {}).items():
+            if mv is not None:
+                tail += f',{_dumps(mk)}:{_dumps(mv)}'
+        tail += ',"success":' + ('true' if success else 'false')
+        if not success:
+            tail += ',"message":"Failed to read all results"'
+        tail += ',"timestamp":' + _dumps(datetime.now(IST_TZ).isoformat()) + '}\n'
+        yield tail
+
+    return Response(stream_with_context(_generate()), status=status, mimetype=json_provider.mimetype)
+
+
 def get_request_payload(req=None, required_role: str = None, account_key: str = None):
     """Decode auth token from request and optionally enforce authorization.
 
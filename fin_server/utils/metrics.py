@@ -12,10 +12,12 @@ API:
 - collector.record(method, route, status_code, duration_ms)
 - collector.get_metrics() -> dict snapshot
 - collector.reset()
+- collector.register_provider(name, fn) -> include fn() under `name` in snapshots
+  (used by in-process caches to expose hit rates)
 """
 from collections import defaultdict
 from threading import Lock
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
 
 class MetricsCollector:
@@ -23,6 +25,13 @@ class MetricsCollector:
         # key -> {hits: int, total_time_ms: float, status: {code: count}}
         self._data: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'hits': 0, 'total_time_ms': 0.0, 'status': defaultdict(int)})
         self._lock = Lock()
+        # name -> zero-arg callable returning a JSON-serializable stats dict
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register_provider(self, name: str, fn: Callable[[], Dict[str, Any]]):
+        """Include `fn()` under `name` in every metrics snapshot."""
+        with self._lock:
+            self._providers[name] = fn
 
     def record(self, method: str, route: str, status_code: int, duration_ms: float):
         key = f"{method} {route}"
@@ -47,7 +56,13 @@ class MetricsCollector:
                     'avg_time_ms': round(avg_ms, 2),
                     'status_counts': status_map,
                 }
-            return snapshot
+            providers = list(self._providers.items())
+        for name, fn in providers:
+            try:
+                snapshot[name] = fn()
+            except Exception:
+                snapshot[name] = {'error': 'stats unavailable'}
+        return snapshot
 
     def reset(self):
         with self._lock:
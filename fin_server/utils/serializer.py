@@ -0,0 +1,352 @@
+"""Single-pass response serializer used by `respond_success`.
+
+The original response pipeline in `fin_server.utils.helpers` walks every payload
+five times (sanitize -> normalize_doc -> _transform_keys_and_types ->
+_post_normalize -> _prune_none) and allocates a new dict/list per node on each
+pass. This module fuses those steps into one recursive traversal that:
+
+- drops sensitive keys (same fragments as `sanitize`)
+- converts ObjectId/datetime values to strings
+- converts keys to camelCase and adds `id` aliases
+- applies the frontend field mappings from `_post_normalize`
+- prunes None values
+
+Key translation and sensitivity decisions come from the process-wide
+`helpers.key_cache` table. Output is identical to `_legacy_success_body`;
+payload shapes that the fused traversal cannot reproduce exactly (e.g. date
+fields holding sub-documents) raise `_Fallback` internally and are re-run
+through the legacy pipeline.
+
+API:
+- build_success_body(payload, do_sanitize=True) -> dict envelope without timestamp
+- serialize(obj, do_sanitize=True) -> normalized `data` value
+"""
+from datetime import datetime
+
+from fin_server.utils.helpers import (
+    _ensure_id_aliases,
+    _legacy_normalize_data,
+    _legacy_success_body,
+    _sensitive_fragments,
+    _to_iso_if_epoch,
+    key_cache,
+    sanitize,
+)
+
+try:
+    from bson import ObjectId
+except Exception:
+    ObjectId = None
+
+# Marker stored in the key memo for keys that must be dropped
+_SKIP = object()
+
+# Child modes: transforms `_post_normalize` applies from the parent onto a child
+_MODE_NONE = 0
+_MODE_DIMENSIONS = 1
+_MODE_LOCATION = 2
+_MODE_PARAMETERS = 3
+_MODE_STOCK_LIST = 4
+_MODE_STOCK_ITEM = 5
+
+# camelKey -> (required container type, mode)
+_CHILD_MODES = {
+    'dimensions': (dict, _MODE_DIMENSIONS),
+    'location': (dict, _MODE_LOCATION),
+    'parameters': (dict, _MODE_PARAMETERS),
+    'currentStock': (list, _MODE_STOCK_LIST),
+}
+
+
+class _Fallback(Exception):
+    """Raised when a payload cannot be serialized identically in one pass."""
+
+
+def _iso(val):
+    """_to_iso_if_epoch for already-serialized values.
+
+    The legacy pipeline stringifies containers before they are post-normalized;
+    the fused traversal has already processed them, so defer to the legacy path.
+    """
+    if isinstance(val, (dict, list)):
+        raise _Fallback()
+    return _to_iso_if_epoch(val)
+
+
+def _check_pruned(*vals):
+    """Fall back when a truthiness check would see an already-pruned container.
+
+    `{'lat': None}` is truthy to the legacy rules but has been pruned to `{}` here.
+    """
+    for val in vals:
+        if isinstance(val, (dict, list)) and not val:
+            raise _Fallback()
+
+
+class _Serializer:
+    def __init__(self, do_sanitize=True):
+        self._do_sanitize = do_sanitize
+        self._fragments = _sensitive_fragments()
+
+    # --- keys ---
+    def _key(self, k):
+        """Return the camelCase key, or _SKIP when sanitizing and `k` is sensitive."""
+        newk, sensitive = key_cache.lookup(k, self._fragments)
+        if sensitive and self._do_sanitize:
+            return _SKIP
+        return newk
+
+    # --- values ---
+    def value(self, v, mode=_MODE_NONE):
+        if v is None:
+            return None
+        cls = v.__class__
+        if cls is str or cls is int or cls is float or cls is bool:
+            return v
+        if isinstance(v, dict):
+            return self._dict(v, mode)
+        if isinstance(v, list):
+            return self._list(v, mode)
+        if ObjectId is not None and isinstance(v, ObjectId):
+            return str(v)
+        if isinstance(v, datetime):
+            try:
+                return v.isoformat()
+            except Exception:
+                return str(v)
+        return v
+
+    def _list(self, items, mode):
+        if mode == _MODE_STOCK_LIST:
+            out = []
+            for item in items:
+                if not isinstance(item, dict):
+                    raise _Fallback()
+                out.append(self._dict(item, _MODE_STOCK_ITEM))
+            return out
+        out = []
+        for item in items:
+            pv = self.value(item)
+            if pv is not None:
+                out.append(pv)
+        return out
+
+    def _dict(self, doc, mode):
+        out = {}
+        for k, v in doc.items():
+            newk = self._key(k)
+            if newk is _SKIP:
+                continue
+            child_mode = _MODE_NONE
+            spec = _CHILD_MODES.get(newk)
+            if spec is not None and isinstance(v, spec[0]):
+                child_mode = spec[1]
+            out[newk] = self.value(v, child_mode)
+
+        _check_pruned(out.get('id'))
+        _ensure_id_aliases(out)
+        if isinstance(out.get('id'), (dict, list)):
+            # legacy rules would visit the aliased sub-document twice
+            raise _Fallback()
+        if mode == _MODE_DIMENSIONS:
+            _apply_dimensions(out)
+        elif mode == _MODE_LOCATION:
+            _apply_location(out)
+        elif mode == _MODE_PARAMETERS:
+            _apply_parameters(out)
+        elif mode == _MODE_STOCK_ITEM:
+            _apply_stock_item(out)
+        _apply_rules(out)
+
+        for k in [k for k, v in out.items() if v is None]:
+            del out[k]
+        return out
+
+    # --- envelope ---
+    def body(self, payload):
+        if payload is None:
+            return {'success': True, 'data': {}}
+        if isinstance(payload, dict):
+            if self._do_sanitize:
+                top = {}
+                for k, v in payload.items():
+                    newk = self._key(k)
+                    if newk is not _SKIP:
+                        top[newk] = v
+            else:
+                top = payload
+            if 'data' in top:
+                # caller already provided envelope-like object: only `data` is
+                # normalized, the other keys are sanitized as before
+                body = {'success': True}
+                for k, v in top.items():
+                    if k == 'data':
+                        body[k] = self.value(v)
+                    elif self._do_sanitize:
+                        body[k] = sanitize(v)
+                    else:
+                        body[k] = v
+                return body
+        return {'success': True, 'data': self.value(payload)}
+
+
+# --- parent -> child transforms (run before the child's own rules) ---
+
+def _apply_dimensions(dims):
+    for k in ('length', 'width', 'depth'):
+        if k in dims:
+            try:
+                dims[k] = float(dims[k]) if dims[k] is not None and dims[k] != '' else None
+            except Exception:
+                dims[k] = None
+
+
+def _apply_location(loc):
+    # Normalize nested keys to latitude/longitude
+    if 'lat' in loc and 'latitude' not in loc:
+        loc['latitude'] = loc.pop('lat')
+    if 'lon' in loc and 'longitude' not in loc:
+        loc['longitude'] = loc.pop('lon')
+    # coerce to numbers
+    try:
+        if 'latitude' in loc and loc['latitude'] is not None:
+            loc['latitude'] = float(loc['latitude'])
+        if 'longitude' in loc and loc['longitude'] is not None:
+            loc['longitude'] = float(loc['longitude'])
+    except Exception:
+        pass
+
+
+def _apply_parameters(params):
+    for pk, pv in list(params.items()):
+        try:
+            params[pk] = float(pv) if pv is not None and pv != '' else None
+        except Exception:
+            params[pk] = None
+
+
+def _apply_stock_item(s):
+    for numk in ('quantity', 'averageWeight', 'sampleSize'):
+        if numk in s:
+            try:
+                s[numk] = float(s[numk]) if s[numk] is not None and s[numk] != '' else None
+            except Exception:
+                s[numk] = None
+    for dk in ('stockingDate', 'expectedHarvestDate', 'samplingDate'):
+        if dk in s and s[dk] is not None and not isinstance(s[dk], str):
+            if isinstance(s[dk], (dict, list)):
+                raise _Fallback()
+            try:
+                s[dk] = _to_iso_if_epoch(s[dk])
+            except Exception:
+                s[dk] = str(s[dk])
+    # Ensure id alias for stock record
+    if 'id' not in s and '_id' in s:
+        s['id'] = str(s.get('_id'))
+
+
+def _apply_rules(obj):
+    """Per-node frontend mappings from `_post_normalize`.
+
+    Keys are already camelCase here, so the snake_case variants handled by
+    `_post_normalize` can never match and are omitted.
+    """
+    # Users: joinedDate -> createdAt
+    if 'joinedDate' in obj and 'createdAt' not in obj:
+        obj['createdAt'] = _iso(obj.pop('joinedDate'))
+
+    # Combine firstName/lastName into name for frontend if present
+    if 'name' not in obj:
+        fn = obj.get('firstName')
+        ln = obj.get('lastName')
+        _check_pruned(fn, ln)
+        if fn or ln:
+            full = ((fn or '') + ' ' + (ln or '')).strip()
+            if full:
+                obj['name'] = full
+
+    # Pond: pondName -> name, waterType -> type
+    if 'pondName' in obj and 'name' not in obj:
+        obj['name'] = obj.pop('pondName')
+    if 'type' not in obj and 'waterType' in obj:
+        obj['type'] = obj.pop('waterType')
+
+    # Location: if location is string but latitude/longitude present, prefer structured object
+    loc = obj.get('location')
+    if isinstance(loc, str):
+        _check_pruned(obj.get('latitude'), obj.get('lat'), obj.get('longitude'), obj.get('lon'))
+        lat = obj.pop('latitude', None) or obj.pop('lat', None)
+        lon = obj.pop('longitude', None) or obj.pop('lon', None)
+        if lat is not None or lon is not None:
+            try:
+                loc = {'latitude': float(lat) if lat is not None else None, 'longitude': float(lon) if lon is not None else None}
+            except Exception:
+                loc = {'latitude': lat, 'longitude': lon}
+            obj['location'] = {k: v for k, v in loc.items() if v is not None}
+
+    # Feeding record: normalize naming and numeric quantity
+    if 'feedQuantity' in obj and 'quantity' not in obj:
+        try:
+            obj['quantity'] = float(obj.pop('feedQuantity')) if obj.get('feedQuantity') is not None else None
+        except Exception:
+            obj['quantity'] = None
+    if 'feedingTime' in obj and obj.get('feedingTime') is not None:
+        obj['feedingTime'] = _iso(obj['feedingTime'])
+
+    # Sampling/Growth: ensure numeric averages
+    if 'averageWeight' in obj:
+        try:
+            obj['averageWeight'] = float(obj['averageWeight']) if obj.get('averageWeight') is not None else None
+        except Exception:
+            obj['averageWeight'] = None
+    if 'averageLength' in obj:
+        try:
+            obj['averageLength'] = float(obj['averageLength']) if obj.get('averageLength') is not None else None
+        except Exception:
+            obj['averageLength'] = None
+
+    # Alerts: ensure boolean acknowledged
+    if 'acknowledged' in obj and isinstance(obj['acknowledged'], str):
+        obj['acknowledged'] = obj['acknowledged'].lower() in ('true', '1', 'yes')
+
+    # Tasks: normalize scheduledDate/startTime/endTime/completedDate
+    for dk in ('scheduledDate', 'startTime', 'endTime', 'completedDate'):
+        if dk in obj:
+            obj[dk] = _iso(obj[dk])
+    if 'taskDate' in obj and 'scheduledDate' not in obj:
+        obj['scheduledDate'] = _iso(obj.pop('taskDate'))
+    if 'endDate' in obj and 'endTime' not in obj:
+        obj['endTime'] = _iso(obj.pop('endDate'))
+    if 'startTime' in obj:
+        obj['startTime'] = _iso(obj['startTime'])
+    # assignee -> assignedTo for UI (assignee is the canonical DB field)
+    if 'assignee' in obj and 'assignedTo' not in obj:
+        if isinstance(obj['assignee'], (dict, list)):
+            raise _Fallback()
+        obj['assignedTo'] = obj.get('assignee')
+
+    # WaterQuality records: timestamp normalization
+    if 'timestamp' in obj and isinstance(obj.get('timestamp'), (int, float, str)):
+        obj['timestamp'] = _to_iso_if_epoch(obj['timestamp'])
+
+
+def serialize(obj, do_sanitize=True):
+    """Return `obj` sanitized and normalized for the UI in a single traversal.
+
+    Falls back to the legacy multi-pass pipeline if the fused traversal fails.
+    """
+    try:
+        return _Serializer(do_sanitize).value(obj)
+    except Exception:
+        return _legacy_normalize_data(sanitize(obj) if do_sanitize else obj)
+
+
+def build_success_body(payload=None, do_sanitize=True):
+    """Return the `{success, data}` envelope used by `respond_success`.
+
+    Falls back to the legacy multi-pass pipeline if the fused traversal fails.
+    """
+    try:
+        return _Serializer(do_sanitize).body(payload)
+    except Exception:
+        return _legacy_success_body(payload, do_sanitize=do_sanitize)
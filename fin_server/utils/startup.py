@@ -0,0 +1,91 @@
+"""Startup-time budget.
+
+server.py marks the boot phases (imports, app creation, ...) and components add
+their own timings (Mongo client creation, repositories created during boot). At
+the end of boot the report is logged and compared with
+`config.STARTUP_BUDGET_SECONDS`; exceeding the budget logs a warning naming the
+slowest phase. The last report is exposed on GET /metrics under `startup`.
+
+API:
+- startup_budget.begin(started_at=None)
+- startup_budget.mark(phase)          -> time since the previous mark
+- startup_budget.add(component, secs) -> accumulate a component timing
+- startup_budget.finish(budget)       -> report dict (also logged)
+- startup_budget.stats()
+"""
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from fin_server.utils.metrics import collector as metrics_collector
+
+logger = logging.getLogger(__name__)
+
+
+class StartupBudget:
+    """Collects boot phase and component timings."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._started = time.perf_counter()
+        self._last = self._started
+        self._phases: Dict[str, float] = {}
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._report: Optional[Dict[str, Any]] = None
+
+    def begin(self, started_at: Optional[float] = None):
+        """Start measuring (pass a `time.perf_counter()` taken earlier to include it)."""
+        with self._lock:
+            self._started = self._last = started_at if started_at is not None else time.perf_counter()
+            self._phases.clear()
+            self._report = None
+
+    def mark(self, phase: str) -> float:
+        """Record `phase` as the time since the previous mark (or begin)."""
+        now = time.perf_counter()
+        with self._lock:
+            elapsed = now - self._last
+            self._phases[phase] = round(self._phases.get(phase, 0.0) + elapsed, 4)
+            self._last = now
+        return elapsed
+
+    def add(self, component: str, seconds: float):
+        """Accumulate a component timing (counted within whichever phase it ran in)."""
+        with self._lock:
+            entry = self._components.setdefault(component, {'count': 0, 'seconds': 0.0})
+            entry['count'] += 1
+            entry['seconds'] = round(entry['seconds'] + seconds, 4)
+
+    def finish(self, budget: Optional[float] = None) -> Dict[str, Any]:
+        """Build, store and log the boot report."""
+        with self._lock:
+            total = time.perf_counter() - self._started
+            report = {
+                'total_seconds': round(total, 3),
+                'budget_seconds': budget,
+                'within_budget': budget is None or total <= budget,
+                'phases': dict(self._phases),
+                'components': {name: dict(entry) for name, entry in self._components.items()},
+            }
+            self._report = report
+
+        phases = ', '.join(f'{name} {secs:.2f}s' for name, secs in report['phases'].items())
+        if report['within_budget']:
+            logger.info(f"Startup took {total:.2f}s (budget {budget}s): {phases}")
+        else:
+            slowest = max(report['phases'].items(), key=lambda item: item[1], default=('-', 0))
+            logger.warning(f"Startup took {total:.2f}s, over the {budget}s budget; "
+                           f"slowest phase {slowest[0]} ({slowest[1]:.2f}s): {phases}")
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._report is not None:
+                return dict(self._report)
+            return {'phases': dict(self._phases),
+                    'components': {name: dict(entry) for name, entry in self._components.items()}}
+
+
+startup_budget = StartupBudget()
+metrics_collector.register_provider('startup', startup_budget.stats)
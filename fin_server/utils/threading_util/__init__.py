@@ -1,4 +1,4 @@
-from .pool import get_executor, submit_task, shutdown_executor
-
-__all__ = ['get_executor', 'submit_task', 'shutdown_executor']
+from .pool import get_executor, get_query_executor, submit_task, shutdown_executor
+from .fanout import ConcurrentQueries
 
+__all__ = ['get_executor', 'get_query_executor', 'submit_task', 'shutdown_executor', 'ConcurrentQueries']
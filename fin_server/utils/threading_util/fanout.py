@@ -0,0 +1,92 @@
+"""Concurrent fan-out for independent request-time queries.
+
+Routes that assemble a response from several unrelated repository calls (dashboard
+cards, summaries) can submit them here and gather the results, so the response
+costs the slowest query rather than the sum of all of them.
+
+Partial-result policy: a call that raises or misses its timeout resolves to the
+`default` given at submit time and is reported in `errors` as 'error' or
+'timeout'; the other results are unaffected.
+
+Usage:
+    queries = ConcurrentQueries(timeout=5)
+    queries.submit('totalPonds', count_ponds, account_key, default=0)
+    queries.submit('alerts', recent_alerts, account_key, default=[])
+    results, errors = queries.gather()
+
+API:
+- ConcurrentQueries(timeout=None, executor=None)
+- ConcurrentQueries.submit(name, fn, *args, default=None, timeout=None, **kwargs)
+- ConcurrentQueries.gather() -> (results, errors)
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from .pool import get_query_executor
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class ConcurrentQueries:
+    """Submit named calls to the query pool and gather them with per-call timeouts."""
+
+    def __init__(self, timeout=None, executor=None):
+        """
+        Args:
+            timeout: Default per-call timeout in seconds (None waits indefinitely)
+            executor: Executor to use instead of the shared query pool
+        """
+        self._timeout = timeout
+        self._executor = executor
+        self._calls = {}
+
+    def submit(self, name, fn, *args, default=None, timeout=None, **kwargs):
+        """Start `fn(*args, **kwargs)` under `name`.
+
+        `timeout` (seconds) overrides the instance default and is measured from
+        submission, so calls submitted together share one wall-clock budget.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # copy the caller's context so per-request state (query route attribution) follows the call
+            future = (self._executor or get_query_executor()).submit(
+                contextvars.copy_context().run, fn, *args, **kwargs)
+        except RuntimeError:
+            # executor shut down (interpreter exit): run inline instead
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        self._calls[name] = (future, default, deadline)
+        return future
+
+    def gather(self):
+        """Wait for all submitted calls.
+
+        Returns:
+            (results, errors): results maps every name to its value (or default);
+            errors maps the names that failed to TIMEOUT or ERROR.
+        """
+        results, errors = {}, {}
+        for name, (future, default, deadline) in self._calls.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeout:
+                future.cancel()
+                logger.warning('Concurrent query %s timed out', name)
+                results[name] = default
+                errors[name] = TIMEOUT
+            except Exception:
+                logger.exception('Concurrent query %s failed', name)
+                results[name] = default
+                errors[name] = ERROR
+        self._calls = {}
+        return results, errors
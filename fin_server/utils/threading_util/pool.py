@@ -3,12 +3,21 @@
 This module exposes a singleton ThreadPoolExecutor and convenience helpers to submit
 background work from different parts of the app without repeating executor setup logic.
 
+A second, separate pool serves short request-time queries fanned out by
+`ConcurrentQueries` (see fanout.py) so they never queue behind background work.
+
+Both pools are per process: a worker forked from a process that already had one
+(gunicorn --preload) gets fresh pools, since the parent's threads do not exist
+in the child.
+
 Configuration:
 - SAMPLING_WORKER_THREADS environment variable controls the default max_workers when the
   executor is first created (defaults to 8).
+- QUERY_WORKER_THREADS controls the query pool size (defaults to 16).
 
 API:
 - get_executor(max_workers=None) -> ThreadPoolExecutor
+- get_query_executor(max_workers=None) -> ThreadPoolExecutor
 - submit_task(fn, *args, **kwargs) -> concurrent.futures.Future
 - shutdown_executor(wait=False)
 """
@@ -19,16 +28,29 @@ import threading
 import logging
 
 _executor = None
+_query_executor = None
 _executor_lock = threading.Lock()
 
 
-def _create_executor(max_workers=None):
+def _reset_after_fork():
+    # the parent's worker threads are not copied into the child; start over
+    global _executor, _query_executor, _executor_lock
+    _executor = None
+    _query_executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _create_executor(max_workers=None, env_var='SAMPLING_WORKER_THREADS', default=8, prefix=''):
     if max_workers is None:
         try:
-            max_workers = int(os.environ.get('SAMPLING_WORKER_THREADS', '8'))
+            max_workers = int(os.environ.get(env_var, str(default)))
         except Exception:
-            max_workers = 8
-    return ThreadPoolExecutor(max_workers=max_workers)
+            max_workers = default
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=prefix)
 
 
 def get_executor(max_workers=None):
@@ -46,6 +68,21 @@ def get_executor(max_workers=None):
     return _executor
 
 
+def get_query_executor(max_workers=None):
+    """Return the singleton pool used for request-time query fan-out (create lazily)."""
+    global _query_executor
+    if _query_executor is None:
+        with _executor_lock:
+            if _query_executor is None:
+                _query_executor = _create_executor(max_workers=max_workers, env_var='QUERY_WORKER_THREADS',
+                                                   default=16, prefix='query')
+                try:
+                    _atexit_register(lambda: shutdown_executor(wait=False))
+                except Exception:
+                    logging.exception('Failed to register executor shutdown')
+    return _query_executor
+
+
 def submit_task(fn, *args, **kwargs):
     """Submit a callable to the shared executor and return a Future.
 
@@ -61,14 +98,14 @@ def submit_task(fn, *args, **kwargs):
 
 
 def shutdown_executor(wait=False):
-    """Shutdown the shared executor if created."""
-    global _executor
-    try:
-        exec_local = _executor
-        if exec_local is not None:
-            exec_local.shutdown(wait=wait)
-    except Exception:
-        logging.exception('Error while shutting down executor')
-    finally:
-        _executor = None
+    """Shutdown the shared executors if created."""
+    global _executor, _query_executor
+    for exec_local in (_executor, _query_executor):
+        try:
+            if exec_local is not None:
+                exec_local.shutdown(wait=wait)
+        except Exception:
+            logging.exception('Error while shutting down executor')
+    _executor = None
+    _query_executor = None
 
@@ -0,0 +1,82 @@
+"""Push database changes to connected WebSocket clients.
+
+Subscribes to the change-event bus (fin_server.repository.change_events):
+- pond, task and sampling inserts/updates are streamed to the owning account as
+  stream:pond_update / stream:task_update / stream:sampling_update;
+- writes to the collections behind the dashboard cards push the account's
+  refreshed dashboard snapshot as stream:dashboard_update, at most once per
+  `DASHBOARD_PUSH_DELAY` seconds per account and only while a user of that
+  account is connected, so clients no longer poll GET /api/dashboard.
+
+Deletes carry no document (hence no account) and are not streamed; the write
+paths already flag the dashboard snapshot for those.
+"""
+import logging
+import threading
+from typing import Set
+
+from fin_server.repository.change_events import get_event_bus
+from fin_server.utils.helpers import normalize_doc
+from fin_server.websocket.event_emitter import EventEmitter
+
+logger = logging.getLogger(__name__)
+
+# Collection -> stream event for per-document updates
+STREAMED = {
+    'pond': EventEmitter.STREAM_POND_UPDATE,
+    'task': EventEmitter.STREAM_TASK_UPDATE,
+    'sampling': EventEmitter.STREAM_SAMPLING_UPDATE,
+}
+# Collections whose writes change dashboard cards
+DASHBOARD_SOURCES = ('pond', 'task', 'sampling', 'feeding')
+# Coalesces bursts of writes and lets the write path update the snapshot first
+DASHBOARD_PUSH_DELAY = 1.0
+
+_pending_accounts: Set[str] = set()
+_pending_lock = threading.Lock()
+
+
+def _stream_document(event):
+    account_key = event.get('account_key')
+    if not account_key:
+        return
+    EventEmitter.emit_to_account(account_key, STREAMED[event.collection], {
+        'operation': event.operation,
+        'id': str(event.id),
+        'data': normalize_doc(event.document),
+        'updated_fields': sorted(event.updated_fields),
+    })
+
+
+def _push_dashboard(account_key: str):
+    with _pending_lock:
+        _pending_accounts.discard(account_key)
+    if not EventEmitter.get_online_users(account_key):
+        return
+    try:
+        from fin_server.services.dashboard_service import get_dashboard_snapshot
+        EventEmitter.stream_dashboard_update(account_key, get_dashboard_snapshot(account_key))
+    except Exception:
+        logger.exception('Failed to push dashboard update for account %s', account_key)
+
+
+def _schedule_dashboard_push(event):
+    account_key = event.get('account_key')
+    if not account_key or not EventEmitter.get_online_users(account_key):
+        return
+    with _pending_lock:
+        if account_key in _pending_accounts:
+            return
+        _pending_accounts.add(account_key)
+    timer = threading.Timer(DASHBOARD_PUSH_DELAY, _push_dashboard, args=(account_key,))
+    timer.daemon = True
+    timer.start()
+
+
+def register_change_feed():
+    """Subscribe the WebSocket emitters to the change-event bus."""
+    bus = get_event_bus()
+    for name in STREAMED:
+        bus.subscribe(name, _stream_document, operations=('insert', 'update', 'replace'))
+    for name in DASHBOARD_SOURCES:
+        bus.subscribe(name, _schedule_dashboard_push, operations=('insert', 'update', 'replace'))
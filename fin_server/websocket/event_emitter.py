@@ -83,6 +83,7 @@ class EventEmitter:
     STREAM_POND_UPDATE = 'stream:pond_update'
     STREAM_EXPENSE_UPDATE = 'stream:expense_update'
     STREAM_SAMPLING_UPDATE = 'stream:sampling_update'
+    STREAM_DASHBOARD_UPDATE = 'stream:dashboard_update'
 
     # =========================================================================
     # Emit Methods
@@ -313,6 +314,11 @@ class EventEmitter:
             **update
         })
 
+    @classmethod
+    def stream_dashboard_update(cls, account_key: str, dashboard: Dict[str, Any]) -> int:
+        """Stream refreshed dashboard data to all users in account."""
+        return cls.emit_to_account(account_key, cls.STREAM_DASHBOARD_UPDATE, dashboard)
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
@@ -9,6 +9,7 @@ from datetime import datetime
 
 from fin_server.websocket.event_emitter import EventEmitter
 from fin_server.repository.mongo_helper import get_collection
+from fin_server.services.dashboard_service import record_dashboard_change
 from fin_server.utils.generator import generate_uuid_hex
 from fin_server.utils.time_utils import get_time_date_dt
 
@@ -80,6 +81,7 @@ class AlertHandler:
         try:
             # Save to database
             alerts_repo.create(alert_doc)
+            record_dashboard_change(account_key, stale=('alerts',))
 
             # Emit via WebSocket to all account users
             EventEmitter.notify_account_alert(account_key, {
@@ -138,6 +140,8 @@ class AlertHandler:
             )
 
             if result.modified_count > 0:
+                record_dashboard_change(account_key, stale=('alerts',))
+
                 # Emit via WebSocket to all account users
                 EventEmitter.emit_to_account(account_key, EventEmitter.ALERT_ACKNOWLEDGED, {
                     'alert_id': alert_id,
@@ -183,6 +187,8 @@ class AlertHandler:
             })
 
             if result.deleted_count > 0:
+                record_dashboard_change(account_key, stale=('alerts',))
+
                 # Emit via WebSocket to all account users
                 EventEmitter.emit_to_account(account_key, EventEmitter.ALERT_DELETED, {
                     'alert_id': alert_id
@@ -263,30 +263,72 @@ class NotificationHandler:
             Number of notifications created
         """
         user_repo = get_collection('users')
-        if not user_repo:
+        notification_repo = get_collection('notification')
+        if not user_repo or not notification_repo:
             return 0
 
         try:
-            users = list(user_repo.find({'account_key': account_key}))
-            count = 0
-
+            users = list(user_repo.find({'account_key': account_key}, {'user_key': 1}))
+            now = get_time_date_dt(include_time=True)
+            docs = []
             for user in users:
                 target_user_key = user.get('user_key')
-                if target_user_key:
-                    result = NotificationHandler.create_and_emit(
-                        account_key=account_key,
-                        target_user_key=target_user_key,
-                        title=title,
-                        message=message,
-                        notification_type=notification_type,
-                        priority=priority,
-                        data={'broadcast': True, **(data or {})},
-                        created_by=created_by
-                    )
-                    if result:
-                        count += 1
-
-            return count
+                if not target_user_key:
+                    continue
+                notification_id = generate_uuid_hex(24)
+                docs.append({
+                    '_id': notification_id,
+                    'notification_id': notification_id,
+                    'account_key': account_key,
+                    'user_key': target_user_key,
+                    'title': title,
+                    'message': message,
+                    'type': notification_type,
+                    'priority': priority,
+                    'data': {'broadcast': True, **(data or {})},
+                    'link': None,
+                    'read': False,
+                    'delivered': False,
+                    'created_by': created_by,
+                    'created_at': now,
+                    'updated_at': now
+                })
+
+            # One batched insert instead of an insert per user
+            with notification_repo.bulk_writer() as writer:
+                for doc in docs:
+                    writer.insert_one(doc)
+            failed = {error['index'] for error in writer.result.errors}
+            created = [doc for i, doc in enumerate(docs) if i not in failed]
+
+            # Unread counts for every recipient in one aggregation
+            unread_counts = {}
+            try:
+                for row in notification_repo.collection.aggregate([
+                    {'$match': {'user_key': {'$in': [doc['user_key'] for doc in created]}, 'read': False}},
+                    {'$group': {'_id': '$user_key', 'count': {'$sum': 1}}}
+                ]):
+                    unread_counts[row['_id']] = row['count']
+            except Exception:
+                pass
+
+            for doc in created:
+                EventEmitter.notify_user(doc['user_key'], {
+                    'notification_id': doc['notification_id'],
+                    'title': title,
+                    'message': message,
+                    'type': notification_type,
+                    'priority': priority,
+                    'data': doc['data'],
+                    'link': None,
+                    'created_at': now.isoformat() if hasattr(now, 'isoformat') else str(now)
+                })
+                if doc['user_key'] in unread_counts:
+                    EventEmitter.update_notification_count(doc['user_key'], unread_counts[doc['user_key']])
+
+            if failed:
+                logger.warning(f"Broadcast to {account_key}: {len(failed)} of {len(docs)} notifications failed")
+            return len(created)
 
         except Exception as e:
             logger.error(f"Error broadcasting notification: {e}")
@@ -13,6 +13,7 @@ from fin_server.websocket.event_emitter import (
     EventEmitter, set_socketio, set_user_tracking
 )
 from fin_server.repository.mongo_helper import get_collection
+from fin_server.services.dashboard_service import record_dashboard_change
 from fin_server.security.authentication import AuthSecurity
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,7 @@ class WebSocketHub:
 
         self._register_handlers()
         self._init_chat_handler()
+        self._init_change_feed()
 
         self._initialized = True
         logger.debug("WS_HUB: initialized")
@@ -56,6 +58,14 @@ class WebSocketHub:
         except Exception as e:
             logger.error(f"WS_HUB: chat_handler init failed: {e}")
 
+    def _init_change_feed(self):
+        """Push database changes to connected clients (see change_feed)."""
+        try:
+            from fin_server.websocket.change_feed import register_change_feed
+            register_change_feed()
+        except Exception as e:
+            logger.error(f"WS_HUB: change feed init failed: {e}")
+
     def _register_handlers(self):
         """Register WebSocket event handlers."""
 
@@ -251,6 +261,7 @@ class WebSocketHub:
                 )
 
                 if result and getattr(result, 'modified_count', 0) > 0:
+                    record_dashboard_change(account_key, stale=('alerts',))
                     EventEmitter.emit_to_account(
                         account_key,
                         EventEmitter.ALERT_ACKNOWLEDGED,
@@ -299,6 +310,8 @@ class WebSocketHub:
                 )
 
                 count = result.modified_count if result else 0
+                if count:
+                    record_dashboard_change(account_key, stale=('alerts',))
 
                 EventEmitter.emit_to_account(
                     account_key,
@@ -338,6 +351,7 @@ class WebSocketHub:
                 })
 
                 if result and getattr(result, 'deleted_count', 0) > 0:
+                    record_dashboard_change(account_key, stale=('alerts',))
                     EventEmitter.emit_to_account(
                         account_key,
                         EventEmitter.ALERT_DELETED,
@@ -447,7 +461,7 @@ class WebSocketHub:
         if not token:
             return None
         try:
-            return AuthSecurity.decode_token(token)
+            return AuthSecurity.verify_token(token)
         except Exception as e:
             logger.debug(f"WS auth error: {e}")
             return None
@@ -483,6 +497,10 @@ class WebSocketHub:
                 except:
                     pass
 
+            # Notifications queued while the user was offline
+            from fin_server.messaging.socket_server import deliver_pending_notifications
+            deliver_pending_notifications(user_key)
+
         except Exception as e:
             logger.error(f"send_pending_events error: {e}")
 
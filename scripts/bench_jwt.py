@@ -0,0 +1,94 @@
+"""Benchmark: JWT signing and verification, HS256 vs RS256 / ES256.
+
+Signs and verifies access-token-shaped payloads through AuthSecurity, with a
+shared secret (HS256) and with key rings in a temporary keys directory
+(RS256, ES256). For the asymmetric algorithms it also times verification with
+the PEM passed on each call, which is what parsing the key per token costs
+without the key ring's cached key objects. The verified-token cache is
+disabled so every call runs the signature check.
+
+Usage:
+    python scripts/bench_jwt.py [--tokens 2000] [--rounds 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['TOKEN_CACHE_ENABLED'] = 'false'
+
+from jose import jwt
+
+from fin_server.security.authentication import AuthSecurity
+from fin_server.security.signing_keys import KeyRing, PRIVATE_SUFFIX, generate_private_key
+
+ALGORITHMS = ('HS256', 'RS256', 'ES256')
+
+
+def _payload(i):
+    return {
+        'user_key': f'USR{i:06d}',
+        'account_key': 'ACC001',
+        'role': 'manager',
+        'roles': ['manager'],
+        'authorities': ['pond:read', 'pond:update', 'task:read'],
+        'type': 'access',
+    }
+
+
+def _configure(algorithm, keys_dir):
+    if algorithm.startswith('HS'):
+        AuthSecurity.configure('bench-secret-' + 'x' * 32, algorithm=algorithm)
+        return None
+    algorithm_dir = os.path.join(keys_dir, algorithm)
+    os.makedirs(algorithm_dir)
+    pem = generate_private_key(algorithm)
+    with open(os.path.join(algorithm_dir, 'bench' + PRIVATE_SUFFIX), 'wb') as f:
+        f.write(pem)
+    key_ring = KeyRing(algorithm, keys_dir=algorithm_dir)
+    AuthSecurity.configure(None, algorithm=algorithm, key_ring=key_ring)
+    return key_ring
+
+
+def _time(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JWT signing and verification')
+    parser.add_argument('--tokens', type=int, default=2000, help='Tokens per round')
+    parser.add_argument('--rounds', type=int, default=3, help='Timing rounds (best is reported)')
+    args = parser.parse_args()
+
+    payloads = [_payload(i) for i in range(args.tokens)]
+    with tempfile.TemporaryDirectory() as keys_dir:
+        print(f'{"algorithm":<10} {"sign/s":>10} {"verify/s":>10} {"verify/s (PEM per call)":>24}')
+        for algorithm in ALGORITHMS:
+            key_ring = _configure(algorithm, keys_dir)
+            tokens = [AuthSecurity.encode_token(p) for p in payloads]
+            for token, payload in zip(tokens, payloads):
+                if AuthSecurity.decode_token(token)['user_key'] != payload['user_key']:
+                    raise SystemExit(f'{algorithm}: token did not round-trip')
+
+            sign_s = _time(lambda: [AuthSecurity.encode_token(p) for p in payloads], args.rounds)
+            verify_s = _time(lambda: [AuthSecurity.decode_token(t) for t in tokens], args.rounds)
+            uncached = ''
+            if key_ring is not None:
+                key = key_ring.signing_key()
+                pem = key.verifying.to_pem()
+                uncached_s = _time(lambda: [jwt.decode(t, pem, algorithms=[algorithm]) for t in tokens], args.rounds)
+                uncached = f'{args.tokens / uncached_s:,.0f}'
+            print(f'{algorithm:<10} {args.tokens / sign_s:>10,.0f} {args.tokens / verify_s:>10,.0f} {uncached:>24}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark: set/template permission checks vs the precompiled bitmasks.
+
+Runs both implementations over every role with synthetic custom grants and
+stored feature overrides, checks they agree, and prints timings for:
+- require_permission / require_any_permission checks (roles.Permission);
+- the effective feature-flag merge and a single flag check (PermissionService).
+
+Usage:
+    python scripts/bench_permissions.py [--checks 200000] [--rounds 5]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fin_server.security.permission_bits import (
+    compile_feature_flags,
+    custom_permission_mask,
+    expand_feature_mask,
+    feature_bit,
+    permission_mask,
+    role_feature_mask,
+    role_mask,
+)
+from fin_server.security.permission_template import PERMISSION_TEMPLATE, ROLE_PERMISSION_TEMPLATES
+from fin_server.security.roles import Permission, ROLE_PERMISSIONS, has_permission
+
+FLAGS = ('enabled', 'entitled', 'edit', 'view')
+
+
+# --- previous implementations ---------------------------------------------------
+
+def _legacy_require_all(role, custom, required):
+    custom_perms = set(custom)
+    return [perm for perm in required if not has_permission(role, perm, custom_perms)]
+
+
+def _legacy_require_any(role, custom, required):
+    custom_perms = set(custom)
+    return any(has_permission(role, perm, custom_perms) for perm in required)
+
+
+def _legacy_user_permissions(role, overrides):
+    permissions = copy.deepcopy(PERMISSION_TEMPLATE)
+    for feature, flags in ROLE_PERMISSION_TEMPLATES.get(role, {}).items():
+        if feature in permissions:
+            permissions[feature].update(flags)
+    for feature, flags in overrides.items():
+        if feature in permissions:
+            permissions[feature].update(flags)
+    return permissions
+
+
+# --- bitmask implementations ----------------------------------------------------
+
+def _bits_require_all(role, custom, required_mask):
+    return required_mask & ~(role_mask(role) | custom_permission_mask(custom))
+
+
+def _bits_require_any(role, custom, required_mask):
+    return bool(required_mask & (role_mask(role) | custom_permission_mask(custom)))
+
+
+def _bits_user_mask(role, overrides):
+    specified, granted = compile_feature_flags(overrides)
+    return (role_feature_mask(role) & ~specified) | granted
+
+
+def _cases(count):
+    names = [p.value for p in Permission]
+    features = list(PERMISSION_TEMPLATE)
+    roles = list(ROLE_PERMISSIONS) + ['unknown']
+    cases = []
+    for _ in range(count):
+        custom = random.sample(names, random.choice([0, 0, 0, 1, 3]))
+        required = random.sample(names, random.choice([1, 1, 2, 3]))
+        overrides = {
+            feature: {flag: 'True' for flag in random.sample(FLAGS, random.randint(1, 4))}
+            for feature in random.sample(features, random.choice([0, 1, 4]))
+        }
+        cases.append((random.choice(roles), custom, required, overrides,
+                      random.choice(features), random.choice(FLAGS)))
+    return cases
+
+
+def _time(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark permission checks')
+    parser.add_argument('--checks', type=int, default=200000, help='Checks per round')
+    parser.add_argument('--rounds', type=int, default=5, help='Timing rounds (best is reported)')
+    args = parser.parse_args()
+
+    random.seed(42)
+    cases = _cases(args.checks)
+    compiled = [(role, custom, permission_mask(required), overrides, feature, flag)
+                for role, custom, required, overrides, feature, flag in cases]
+
+    for (role, custom, required, overrides, feature, flag), (_, _, required_mask, _, _, _) in zip(cases, compiled):
+        if sorted(_legacy_require_all(role, custom, required)) != sorted(
+                p for p in required if _bits_require_all(role, custom, required_mask) & permission_mask([p])):
+            raise SystemExit(f'require_permission differs for role={role} required={required} custom={custom}')
+        if _legacy_require_any(role, custom, required) != _bits_require_any(role, custom, required_mask):
+            raise SystemExit(f'require_any_permission differs for role={role} required={required} custom={custom}')
+        legacy = _legacy_user_permissions(role, overrides)
+        mask = _bits_user_mask(role, overrides)
+        expanded = expand_feature_mask(mask)
+        for name, flags in legacy.items():
+            if {f: bool(v) for f, v in flags.items()} != expanded[name]:
+                raise SystemExit(f'feature flags differ for role={role} feature={name}')
+        if bool(legacy[feature].get(flag, False)) != bool(mask & feature_bit(feature, flag)):
+            raise SystemExit(f'flag check differs for role={role} {feature}.{flag}')
+
+    timings = [
+        ('require_permission',
+         lambda: [_legacy_require_all(r, c, req) for r, c, req, _, _, _ in cases],
+         lambda: [_bits_require_all(r, c, req) for r, c, req, _, _, _ in compiled]),
+        ('require_any_permission',
+         lambda: [_legacy_require_any(r, c, req) for r, c, req, _, _, _ in cases],
+         lambda: [_bits_require_any(r, c, req) for r, c, req, _, _, _ in compiled]),
+        ('feature flag check',
+         lambda: [_legacy_user_permissions(r, o)[f].get(fl, False) for r, _, _, o, f, fl in cases],
+         lambda: [_bits_user_mask(r, o) & feature_bit(f, fl) for r, _, _, o, f, fl in cases]),
+    ]
+
+    print(f'{"check":<24} {"checks":>8} {"legacy ms":>11} {"bitmask ms":>11} {"speedup":>8}')
+    for name, legacy_fn, bits_fn in timings:
+        legacy_s = _time(legacy_fn, args.rounds)
+        bits_s = _time(bits_fn, args.rounds)
+        print(f'{name:<24} {args.checks:>8} {legacy_s * 1000:>11.1f} {bits_s * 1000:>11.1f} {legacy_s / bits_s:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
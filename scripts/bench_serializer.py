@@ -0,0 +1,142 @@
+"""Benchmark: legacy five-pass respond_success pipeline vs the fused serializer.
+
+Builds synthetic payloads shaped like our larger list endpoints (expenses, tasks,
+ponds with current_stock, sampling history), serializes them with both
+implementations, checks the JSON output is byte-identical and prints timings.
+
+Usage:
+    python scripts/bench_serializer.py [--docs 10000] [--rounds 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+from flask import Flask
+
+from fin_server.utils.helpers import _legacy_success_body
+from fin_server.utils.serializer import build_success_body
+
+
+def _expense(i, now):
+    return {
+        '_id': ObjectId(),
+        'expense_id': f'EXP-{i:06d}',
+        'account_key': 'ACC001',
+        'pond_id': f'POND-{i % 40:03d}',
+        'category': random.choice(['feed', 'labour', 'power', 'medicine']),
+        'amount': round(random.uniform(10, 5000), 2),
+        'currency': 'INR',
+        'payment_method': 'upi',
+        'notes': None,
+        'created_by': 'USR001',
+        'created_at': now - timedelta(minutes=i),
+        'updated_at': now,
+        'metadata': {'source': 'app', 'receipt_url': None, 'api_key_ref': 'hidden'},
+    }
+
+
+def _task(i, now):
+    return {
+        '_id': ObjectId(),
+        'task_id': f'TSK-{i:06d}',
+        'title': f'Task {i}',
+        'assignee': 'USR002',
+        'reporter': 'USR001',
+        'status': random.choice(['pending', 'in_progress', 'completed']),
+        'task_date': int((now - timedelta(days=i % 30)).timestamp()),
+        'end_date': (now + timedelta(days=1)).isoformat(),
+        'reminder': True,
+        'recurring': {'frequency': 'daily', 'end_date': None},
+        'created_at': now,
+    }
+
+
+def _pond(i, now):
+    return {
+        '_id': ObjectId(),
+        'pond_id': f'POND-{i:06d}',
+        'pond_name': f'Pond {i}',
+        'water_type': 'freshwater',
+        'dimensions': {'length': '40', 'width': 20, 'depth': ''},
+        'location': {'lat': '12.97', 'lon': 77.59},
+        'current_stock': [
+            {
+                'stock_id': f'STK-{i}-{j}',
+                'species': 'rohu',
+                'quantity': '1500',
+                'average_weight': 120,
+                'stocking_date': int((now - timedelta(days=60)).timestamp()),
+            }
+            for j in range(3)
+        ],
+        'metadata': {'total_fish': 4500, 'last_activity': now},
+        'created_at': now,
+    }
+
+
+def _sampling(i, now):
+    return {
+        '_id': ObjectId(),
+        'sampling_id': f'SMP-{i:06d}',
+        'pond_id': f'POND-{i % 40:03d}',
+        'sampling_date': now - timedelta(days=i % 90),
+        'sample_size': 25,
+        'average_weight': '132.5',
+        'average_length': None,
+        'parameters': {'ph': '7.2', 'temperature': 28, 'dissolved_oxygen': ''},
+        'recorded_by': 'USR003',
+    }
+
+
+BUILDERS = {
+    'expenses': _expense,
+    'tasks': _task,
+    'ponds': _pond,
+    'sampling': _sampling,
+}
+
+
+def _time(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark respond_success serialization')
+    parser.add_argument('--docs', type=int, default=10000, help='Documents per payload')
+    parser.add_argument('--rounds', type=int, default=5, help='Timing rounds (best is reported)')
+    args = parser.parse_args()
+
+    random.seed(42)
+    now = datetime.now(timezone.utc)
+    app = Flask(__name__)
+
+    with app.app_context():
+        print(f'{"payload":<10} {"docs":>7} {"legacy ms":>11} {"fused ms":>10} {"speedup":>8}')
+        for name, builder in BUILDERS.items():
+            payload = [builder(i, now) for i in range(args.docs)]
+
+            legacy = app.json.dumps(_legacy_success_body(payload))
+            fused = app.json.dumps(build_success_body(payload))
+            if legacy != fused:
+                raise SystemExit(f'{name}: fused output differs from legacy output')
+
+            legacy_s = _time(lambda: _legacy_success_body(payload), args.rounds)
+            fused_s = _time(lambda: build_success_body(payload), args.rounds)
+            print(f'{name:<10} {args.docs:>7} {legacy_s * 1000:>11.1f} {fused_s * 1000:>10.1f} {legacy_s / fused_s:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
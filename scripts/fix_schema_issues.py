@@ -17,6 +17,7 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from fin_server.repository.bulk import BulkWriter
 from fin_server.repository.mongo_helper import get_collection
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -126,19 +127,23 @@ def add_sender_info_to_messages():
                 }
 
     # Update messages in batches
-    updated = 0
+    writer = BulkWriter(messages_coll)
     for msg in messages_coll.find(query, {'_id': 1, 'sender_key': 1}):
         sender_key = msg.get('sender_key')
         sender_info = user_cache.get(sender_key, {'user_key': sender_key, 'username': None, 'avatar_url': None})
 
-        messages_coll.update_one(
+        writer.update_one(
             {'_id': msg['_id']},
             {'$set': {'sender_info': sender_info}}
         )
-        updated += 1
 
-        if updated % 100 == 0:
-            logger.info(f'  messages: Updated {updated} documents...')
+        if len(writer) % writer.batch_size == 0:
+            logger.info(f'  messages: Updated {writer.result.modified_count} documents...')
+
+    report = writer.close()
+    updated = report.modified_count
+    if report.errors:
+        logger.warning(f'  messages: {len(report.errors)} updates failed')
 
     logger.info(f'  messages: Added sender_info to {updated} documents')
     return updated
@@ -0,0 +1,50 @@
+"""Migration script: Provision MongoDB collections and declared indexes.
+
+The server no longer creates collections or indexes while booting; run this as
+a deploy step instead. It:
+1. Creates the required collections that are missing
+2. Reconciles the declared index registry (see fin_server/repository/indexes.py):
+   missing indexes are created, undeclared ones and option conflicts are reported
+3. Optionally explains the declared query shapes and flags collection scans
+
+Usage:
+    python scripts/migrate.py [--dry-run] [--explain]
+
+Ensure MONGO_URI and MONGO_DB environment variables are set.
+"""
+import argparse
+import logging
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# This script migrates in the foreground; skip MongoRepo's background pass
+os.environ.setdefault('INDEX_RECONCILE_ON_STARTUP', 'false')
+
+from fin_server.repository.mongo_helper import MongoRepo
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Provision MongoDB collections and indexes')
+    parser.add_argument('--dry-run', action='store_true', help='report what is missing without creating it')
+    parser.add_argument('--explain', action='store_true', help='explain declared query shapes and flag COLLSCANs')
+    args = parser.parse_args()
+
+    repo = MongoRepo.get_instance()
+    if not repo.ping(timeout=10):
+        logger.error('MongoDB is not reachable; aborting migration')
+        sys.exit(1)
+
+    logger.info('Starting migration%s...', ' (dry run)' if args.dry_run else '')
+    logger.info('=' * 50)
+    repo.migrate(create=not args.dry_run, explain=args.explain)
+    logger.info('=' * 50)
+    logger.info('Migration complete.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Migration script: Move refresh tokens off user documents.
+
+Refresh tokens used to be kept as a `refresh_tokens` array on each user
+document; they now live in user_db.refresh_tokens, one document per token
+keyed by its SHA-256 hash (see fin_server/repository/user/refresh_token_repository.py).
+This script copies every unexpired token into that collection and removes the
+arrays. It is idempotent; run it after scripts/migrate.py (which creates the
+TTL index) so signed-in users keep their sessions.
+
+Tokens are not verified here (their signatures are checked on use); `exp` is
+read from the claims to set the TTL.
+
+Usage:
+    python scripts/migrate_refresh_tokens.py [--dry-run] [--keep-arrays]
+
+Ensure MONGO_URI and MONGO_DB environment variables are set.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import jwt
+
+from fin_server.repository.mongo_helper import get_collection
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _session_document(token, user, repo, now):
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except Exception:
+        return None
+    exp = claims.get('exp')
+    if claims.get('type') != 'refresh' or not exp or claims.get('user_key') != user.get('user_key'):
+        return None
+    expires_at = datetime.fromtimestamp(int(exp), timezone.utc)
+    if expires_at <= now:
+        return None
+    return {
+        '_id': repo.hash_token(token),
+        'user_key': user.get('user_key'),
+        'account_key': user.get('account_key'),
+        'created_at': now,
+        'last_used_at': now,
+        'expires_at': expires_at,
+        'device': {},
+    }
+
+
+def migrate_refresh_tokens(dry_run=False, keep_arrays=False):
+    users_repo = get_collection('users')
+    repo = get_collection('refresh_tokens')
+    if users_repo is None or repo is None:
+        logger.error('Failed to get users or refresh_tokens collection')
+        return 0
+
+    users = getattr(users_repo, 'collection', users_repo)
+    query = {'refresh_tokens': {'$exists': True}}
+    now = datetime.now(timezone.utc)
+    moved = skipped = 0
+    for user in users.find(query, {'user_key': 1, 'account_key': 1, 'refresh_tokens': 1}):
+        for token in user.get('refresh_tokens') or []:
+            doc = _session_document(token, user, repo, now)
+            if doc is None:
+                skipped += 1
+                continue
+            moved += 1
+            if not dry_run:
+                repo.collection.update_one({'_id': doc['_id']}, {'$setOnInsert': doc}, upsert=True)
+
+    logger.info(f"refresh_tokens: {moved} live tokens {'to move' if dry_run else 'moved'}, "
+                f"{skipped} expired or invalid skipped")
+    if not dry_run and not keep_arrays:
+        result = users.update_many(query, {'$unset': {'refresh_tokens': ''}})
+        logger.info(f'users: removed refresh_tokens from {result.modified_count} documents')
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move refresh tokens from user documents to their collection')
+    parser.add_argument('--dry-run', action='store_true', help='count the tokens without writing')
+    parser.add_argument('--keep-arrays', action='store_true', help='copy tokens but leave the user arrays in place')
+    args = parser.parse_args()
+
+    logger.info('Starting refresh token migration%s...', ' (dry run)' if args.dry_run else '')
+    migrate_refresh_tokens(dry_run=args.dry_run, keep_arrays=args.keep_arrays)
+    logger.info('Migration complete.')
+
+
+if __name__ == '__main__':
+    main()
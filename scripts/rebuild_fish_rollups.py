@@ -0,0 +1,43 @@
+"""Rebuild fish analytics rollups from the raw fish_analytics batches.
+
+The rollups (one document per account/species/pond in `fish_analytics_rollup`)
+are maintained incrementally by FishAnalyticsRepository on every batch insert
+and delete. Run this once to build them for existing data (reads keep using the
+raw batches until a full rebuild has completed) and again to repair drift, e.g.
+after batches were edited directly in the database.
+
+Usage:
+    python scripts/rebuild_fish_rollups.py [--account ACCOUNT_KEY]
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fin_server.repository.mongo_helper import get_collection
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild fish analytics rollups')
+    parser.add_argument('--account', help='Only rebuild this account_key (repair)')
+    args = parser.parse_args()
+
+    repo = get_collection('fish_analytics')
+    if repo is None:
+        logger.error('fish_analytics repository unavailable (is MongoDB reachable?)')
+        sys.exit(1)
+
+    scope = f'account {args.account}' if args.account else 'all accounts'
+    logger.info(f'Rebuilding fish analytics rollups for {scope}...')
+    written = repo.rebuild_rollups(account_key=args.account)
+    logger.info(f'Wrote {written} rollup documents.')
+
+
+if __name__ == '__main__':
+    main()
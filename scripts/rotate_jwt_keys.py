@@ -0,0 +1,110 @@
+"""Rotation script: add a JWT signing key to the keys directory.
+
+Writes `<kid>.pem` (private key, mode 0600) and `<kid>.pub.pem` to the keys
+directory, with the kid taken from the current UTC time. Servers re-read the
+directory every `security.jwt.keys_reload_seconds`; unless
+`security.jwt.active_kid` pins a key, the new one signs from then on while the
+older keys keep verifying the tokens they signed. Copy only the `.pub.pem`
+files to verifier-only hosts, or point them at GET /.well-known/jwks.json.
+
+With --retire, private keys other than the new one are replaced by their
+public halves (they verify but can no longer sign); with --prune-days N, keys
+older than N days are deleted. Keep a key at least as long as the longest
+token lifetime (refresh tokens: `security.jwt.refresh_token_expire_days`).
+
+Usage:
+    python scripts/rotate_jwt_keys.py [--keys-dir DIR] [--algorithm RS256] [--retire] [--prune-days N]
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives import serialization
+
+from config import config
+from fin_server.security.signing_keys import (
+    ASYMMETRIC_ALGORITHMS,
+    PRIVATE_SUFFIX,
+    PUBLIC_SUFFIX,
+    generate_private_key,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+KID_FORMAT = '%Y%m%dT%H%M%SZ'
+
+
+def _public_pem(private_pem: bytes) -> bytes:
+    private_key = serialization.load_pem_private_key(private_pem, password=None)
+    return private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
+def _write(path: str, data: bytes, mode: int):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+
+
+def _kids(keys_dir: str):
+    kids = set()
+    for name in os.listdir(keys_dir):
+        if name.endswith(PUBLIC_SUFFIX):
+            kids.add(name[:-len(PUBLIC_SUFFIX)])
+        elif name.endswith(PRIVATE_SUFFIX):
+            kids.add(name[:-len(PRIVATE_SUFFIX)])
+    return kids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add a JWT signing key and optionally retire old ones')
+    parser.add_argument('--keys-dir', default=config.JWT_KEYS_DIR, help='keys directory (default: JWT_KEYS_DIR)')
+    parser.add_argument('--algorithm', default=config.JWT_ALGORITHM, choices=ASYMMETRIC_ALGORITHMS,
+                        help='signing algorithm (default: JWT_ALGORITHM)')
+    parser.add_argument('--rsa-key-size', type=int, default=2048, help='RSA modulus size in bits')
+    parser.add_argument('--retire', action='store_true', help='keep only public halves of the older keys')
+    parser.add_argument('--prune-days', type=int, default=None, help='delete keys older than this many days')
+    args = parser.parse_args()
+
+    if not args.keys_dir:
+        logger.error('No keys directory: pass --keys-dir or set JWT_KEYS_DIR')
+        sys.exit(1)
+    os.makedirs(args.keys_dir, mode=0o700, exist_ok=True)
+
+    now = datetime.now(timezone.utc)
+    kid = now.strftime(KID_FORMAT)
+    private_pem = generate_private_key(args.algorithm, rsa_key_size=args.rsa_key_size)
+    _write(os.path.join(args.keys_dir, kid + PRIVATE_SUFFIX), private_pem, 0o600)
+    _write(os.path.join(args.keys_dir, kid + PUBLIC_SUFFIX), _public_pem(private_pem), 0o644)
+    logger.info(f"Added {args.algorithm} key '{kid}' to {args.keys_dir}")
+
+    for old_kid in sorted(_kids(args.keys_dir) - {kid}):
+        private_path = os.path.join(args.keys_dir, old_kid + PRIVATE_SUFFIX)
+        public_path = os.path.join(args.keys_dir, old_kid + PUBLIC_SUFFIX)
+        try:
+            created = datetime.strptime(old_kid, KID_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            created = None
+        if args.prune_days is not None and created is not None and now - created > timedelta(days=args.prune_days):
+            for path in (private_path, public_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            logger.info(f"Pruned key '{old_kid}'")
+        elif args.retire and os.path.exists(private_path):
+            if not os.path.exists(public_path):
+                with open(private_path, 'rb') as f:
+                    _write(public_path, _public_pem(f.read()), 0o644)
+            os.remove(private_path)
+            logger.info(f"Retired key '{old_kid}' (verification only)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,12 @@ This is the main entry point for the Flask application.
 """
 
 import argparse
+import time
 import warnings
 import logging
 
+_BOOT_STARTED = time.perf_counter()
+
 # Import config first to get logging settings
 from config import config
 
@@ -55,11 +58,16 @@ from fin_server.routes.notification import notification_bp
 from fin_server.routes.chat import chat_bp
 from fin_server.routes.ai import openai_bp
 from fin_server.security.authentication import AuthSecurity
+from fin_server.security.signing_keys import KeyRing, is_asymmetric
+from fin_server.security.token_cache import register_token_revocation
 from fin_server.notification.scheduler import TaskScheduler
+from fin_server.repository.change_events import get_event_bus
 from fin_server.messaging.socket_server import socketio, start_notification_worker
 from fin_server.websocket.hub import init_websocket_hub
 from fin_server.utils.metrics import collector as metrics_collector
+from fin_server.repository.query_profiler import set_query_route, reset_query_route
 from fin_server.utils.helpers import respond_error
+from fin_server.utils.startup import startup_budget
 from werkzeug.exceptions import Unauthorized, Forbidden
 
 # Suppress urllib3 warnings
@@ -72,7 +80,10 @@ except Exception:
 
 def configure_auth_from_env():
     """Configure AuthSecurity from centralized config."""
-    if not config.JWT_SECRET:
+    key_ring = None
+    if is_asymmetric(config.JWT_ALGORITHM):
+        key_ring = KeyRing.from_config()
+    elif not config.JWT_SECRET:
         raise RuntimeError('JWT_SECRET environment variable is required')
 
     AuthSecurity.configure(
@@ -80,7 +91,10 @@ def configure_auth_from_env():
         algorithm=config.JWT_ALGORITHM,
         access_token_expire_minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES,
         refresh_token_expire_days=config.REFRESH_TOKEN_EXPIRE_DAYS,
+        key_ring=key_ring,
+        accept_hs256=config.JWT_ACCEPT_HS256,
     )
+    register_token_revocation()
 
 
 def create_app() -> Flask:
@@ -145,6 +159,14 @@ def create_app() -> Flask:
     def _metrics_before_request():
         from time import perf_counter
         request._metrics_start = perf_counter()
+        # attribute Mongo query shapes to the route that issued them
+        request._query_route_token = set_query_route(f"{request.method} {request.endpoint or request.path}")
+
+    @app.teardown_request
+    def _metrics_teardown_request(exc):
+        token = getattr(request, '_query_route_token', None)
+        if token is not None:
+            reset_query_route(token)
 
     @app.after_request
     def _metrics_after_request(response):
@@ -159,6 +181,14 @@ def create_app() -> Flask:
         return response
 
 
+    @app.route('/.well-known/jwks.json', methods=['GET'])
+    def _jwks_endpoint():
+        """Public keys that verify our tokens (empty for HMAC signing)."""
+        key_ring = AuthSecurity.key_ring
+        response = jsonify(key_ring.jwks() if key_ring is not None else {'keys': []})
+        response.headers['Cache-Control'] = f'public, max-age={config.JWT_JWKS_CACHE_SECONDS}'
+        return response
+
     @app.route('/metrics', methods=['GET'])
     def _metrics_endpoint():
         logger.info("Metrics endpoint called")
@@ -200,8 +230,12 @@ def parse_args():
 
 
 # Initialize at import time
+startup_budget.begin(started_at=_BOOT_STARTED)
+startup_budget.mark('imports')
 configure_auth_from_env()
 app = create_app()
+startup_budget.mark('create_app')
+startup_budget.finish(budget=config.STARTUP_BUDGET_SECONDS)
 
 
 if __name__ == "__main__":
@@ -214,6 +248,9 @@ if __name__ == "__main__":
     if not args.no_worker:
         start_notification_worker()
 
+    # Feeds the scheduler, the notification worker and the WebSocket change feed
+    get_event_bus().start()
+
     try:
         logger.info("=" * 70)
         logger.info("SERVER: Starting AquaFarm Pro Backend...")